@@ -24,6 +24,49 @@ class Settings(BaseSettings):
     DB_SSL_MODE: str | None = None
     DB_SSL_ROOT_CERT: str | None = None
 
+    # psycopg connection pool, per worker process; sized for the worker's threads
+    # plus background tasks. Without the pool, connections persist for
+    # DB_CONN_MAX_AGE seconds instead; keep it under ASGI, where each request runs
+    # its queries in a thread of its own.
+    DB_POOL_ENABLED: bool = True
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 8
+    DB_POOL_TIMEOUT: float = 10
+    DB_POOL_MAX_LIFETIME: float = 30 * 60
+    DB_POOL_MAX_IDLE: float = 5 * 60
+    # Connections all gunicorn workers together may hold on the primary, that is
+    # workers x DB_POOL_MAX_SIZE; gunicorn.conf.py starts no more workers than fit.
+    # Keep it under the server's max_connections (100 by default) with room left for
+    # migrations, management commands and superuser_reserved_connections.
+    DB_MAX_CONNECTIONS: int = 90
+    DB_CONN_MAX_AGE: int = 60
+    DB_CONN_HEALTH_CHECKS: bool = True
+
+    # Optional read replica for safe-method requests; unset fields fall back to the
+    # primary's. Clients that wrote read from the primary for DB_REPLICA_PIN_SECONDS,
+    # and a failing replica is skipped for DB_REPLICA_RETRY_SECONDS.
+    DB_REPLICA_HOST: str | None = None
+    DB_REPLICA_PORT: int | None = None
+    DB_REPLICA_NAME: str | None = None
+    DB_REPLICA_USER: str | None = None
+    DB_REPLICA_PASSWORD: str | None = None
+    DB_REPLICA_PIN_SECONDS: int = 10
+    DB_REPLICA_RETRY_SECONDS: int = 30
+
+    # Requests slower than REQUEST_SLOW_MS or running more than REQUEST_SLOW_QUERIES
+    # statements are logged as warnings with their REQUEST_SLOW_STATEMENTS slowest
+    # statements; every other request is logged at REQUEST_TIMING_LOG_LEVEL.
+    REQUEST_SLOW_MS: int = 1000
+    REQUEST_SLOW_QUERIES: int = 50
+    REQUEST_SLOW_STATEMENTS: int = 5
+    REQUEST_TIMING_LOG_LEVEL: str = "INFO"
+
+    # Opt-in debugging aid: statements slower than SLOW_QUERY_CAPTURE_MS are stored
+    # with their EXPLAIN plan, view and stack, keeping the newest
+    # SLOW_QUERY_BUFFER_SIZE for the admin. Unset to disable.
+    SLOW_QUERY_CAPTURE_MS: float | None = None
+    SLOW_QUERY_BUFFER_SIZE: int = 200
+
     DJANGO_DEBUG: bool = True
     DJANGO_SEED_DATA: bool = True
     DJANGO_SECRET_KEY: str
@@ -37,6 +80,21 @@ class Settings(BaseSettings):
     CLAMAV_HOST: str = "clamav"
     CLAMAV_PORT: int = 3310
     CLAMAV_TIMEOUT: int = 10
+    CLAMAV_POOL_SIZE: int = 4
+    CLAMAV_POOL_IDLE_TIMEOUT: int = 20
+    CLAMAV_VERSION_TTL: int = 60
+
+    BACKGROUND_WORKERS: int = 2
+
+    # Seconds a readiness check result is reused before the dependency is checked
+    # again.
+    HEALTH_CHECK_CACHE_SECONDS: float = 5
+
+    DOCUMENTATION_BUNDLE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # "x-accel" hands file downloads to nginx; empty streams them from Django.
+    FILE_OFFLOAD_MODE: str = ""
+    FILE_OFFLOAD_ACCEL_LOCATION: str = "/protected-media/"
 
     VITE_API_URL: str = "/api"
 
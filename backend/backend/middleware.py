@@ -1,20 +1,196 @@
-from typing import Callable
+import abc
+import time
+from typing import Awaitable, Callable, cast
 
-from django.db import close_old_connections
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import close_old_connections, connections
 from django.db.utils import OperationalError
 from django.http import HttpRequest, HttpResponse
+from rest_framework.permissions import SAFE_METHODS
 
+from core.db.replica import (
+    REPLICA_DB_ALIAS,
+    ReplicaReads,
+    mark_replica_unavailable,
+    pin_primary,
+    primary_pinned,
+    replica_configured,
+    replica_reads,
+)
+from core.services.metrics import observe_request
+from core.services.request_timing import (
+    RequestTimings,
+    async_request_timings,
+    log_request_timings,
+    request_timings,
+    resource_name,
+    server_timing_header,
+)
+from core.services.slow_queries import store_slow_queries
 
-class RetryOnceOnDbEofMiddleware:
-    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
-        self.get_response = get_response
+SyncGetResponse = Callable[[HttpRequest], HttpResponse]
+AsyncGetResponse = Callable[[HttpRequest], Awaitable[HttpResponse]]
 
-    def __call__(self, request: HttpRequest) -> HttpResponse:
+
+class AsyncCapableMiddleware(abc.ABC):
+    """
+    Base for middleware that runs under both WSGI and ASGI. Under ASGI
+    ``get_response`` is a coroutine function and ``__acall__`` is used, so the
+    middleware chain stays on the event loop and async views are not pushed into a
+    thread of their own. ``call`` uses ``sync_get_response`` and ``__acall__``
+    ``async_get_response``; only the one matching the mode is set.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    sync_get_response: SyncGetResponse
+    async_get_response: AsyncGetResponse
+
+    def __init__(self, get_response: SyncGetResponse | AsyncGetResponse) -> None:
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            self.async_get_response = cast(AsyncGetResponse, get_response)
+            markcoroutinefunction(self)
+        else:
+            self.sync_get_response = cast(SyncGetResponse, get_response)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable[HttpResponse]:
+        if self.is_async:
+            return self.__acall__(request)
+        return self.call(request)
+
+    @abc.abstractmethod
+    def call(self, request: HttpRequest) -> HttpResponse:
+        """Handles a request under WSGI."""
+
+    @abc.abstractmethod
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Handles a request under ASGI."""
+
+
+def _is_db_eof(error: OperationalError) -> bool:
+    msg = str(error).lower()
+    return "ssl syscall error" in msg or "eof detected" in msg
+
+
+class RetryOnceOnDbEofMiddleware(AsyncCapableMiddleware):
+    def call(self, request: HttpRequest) -> HttpResponse:
         try:
-            return self.get_response(request)
+            return self.sync_get_response(request)
         except OperationalError as e:
-            msg = str(e).lower()
-            if "ssl syscall error" in msg or "eof detected" in msg:
+            if _is_db_eof(e):
                 close_old_connections()
-                return self.get_response(request)
-            raise
\ No newline at end of file
+                return self.sync_get_response(request)
+            raise
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        try:
+            return await self.async_get_response(request)
+        except OperationalError as e:
+            if _is_db_eof(e):
+                await sync_to_async(close_old_connections)()
+                return await self.async_get_response(request)
+            raise
+
+
+class ReplicaRoutingMiddleware(AsyncCapableMiddleware):
+    """
+    Lets safe-method requests read from the database replica, except for clients
+    pinned to the primary after a write (see ``core.db.replica``). A request that
+    hit a database error on the replica is run again on the primary.
+    """
+
+    def _enabled(self, request: HttpRequest) -> bool:
+        enabled = (
+            request.method in SAFE_METHODS
+            and replica_configured()
+            and not primary_pinned(request)
+        )
+
+        if enabled:
+            # As on request_started: forgets errors of earlier requests that left
+            # the connection usable.
+            connections[REPLICA_DB_ALIAS].close_if_unusable_or_obsolete()
+
+        return enabled
+
+    def _replica_failed(self, state: ReplicaReads) -> bool:
+        # API views turn database errors into 503 responses, so the failure is read
+        # from the connection rather than caught.
+        if state.used and connections[REPLICA_DB_ALIAS].errors_occurred:
+            mark_replica_unavailable()
+            state.enabled = False
+            state.used = False
+            return True
+
+        return False
+
+    def call(self, request: HttpRequest) -> HttpResponse:
+        with replica_reads(enabled=self._enabled(request)) as state:
+            response = self.sync_get_response(request)
+            if self._replica_failed(state):
+                response = self.sync_get_response(request)
+
+        if state.wrote:
+            pin_primary(response)
+
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        # Connections belong to the request's sync_to_async thread.
+        enabled = await sync_to_async(self._enabled)(request)
+
+        with replica_reads(enabled=enabled) as state:
+            response = await self.async_get_response(request)
+            if await sync_to_async(self._replica_failed)(state):
+                response = await self.async_get_response(request)
+
+        if state.wrote:
+            pin_primary(response)
+
+        return response
+
+
+class RequestTimingMiddleware(AsyncCapableMiddleware):
+    """
+    Measures SQL and the named phases of each request (see
+    ``core.services.request_timing``), logs them, records them for ``/metrics`` and,
+    for staff users, returns them in a ``Server-Timing`` header. Statements captured
+    as slow are stored for the admin.
+    """
+
+    def call(self, request: HttpRequest) -> HttpResponse:
+        with request_timings() as timings:
+            response = self.sync_get_response(request)
+
+        return self._report(request, response, timings)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        async with async_request_timings() as timings:
+            response = await self.async_get_response(request)
+
+        # Stores slow statements and may load the session user.
+        return await sync_to_async(self._report)(request, response, timings)
+
+    def _report(
+        self, request: HttpRequest, response: HttpResponse, timings: RequestTimings
+    ) -> HttpResponse:
+        total = time.perf_counter() - timings.started
+        log_request_timings(request, response, timings, total)
+        observe_request(request, response, timings, total)
+
+        if timings.captured:
+            store_slow_queries(
+                timings.captured,
+                resource=resource_name(request),
+                method=request.method or "",
+                path=request.path,
+            )
+
+        # API views authenticate inside the view; DRF copies the user back here.
+        user = getattr(request, "user", None)
+        if user is not None and user.is_staff:
+            response["Server-Timing"] = server_timing_header(timings, total)
+
+        return response
@@ -77,6 +77,10 @@ REST_FRAMEWORK = {
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "EXCEPTION_HANDLER": "core.api.exceptions.custom_exception_handler",
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.api.renderers.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     "DEFAULT_THROTTLE_RATES": {
         "login_burst": "5/min",
         "login_sustained": "20/hour",
@@ -113,8 +117,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "backend.middleware.RequestTimingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "backend.middleware.RetryOnceOnDbEofMiddleware",
+    "backend.middleware.ReplicaRoutingMiddleware",
     'django.middleware.locale.LocaleMiddleware',
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -177,7 +183,8 @@ else:
         }
     }
 
-DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+# Health checks also make the pool test connections before handing them out.
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = project_settings.DB_CONN_HEALTH_CHECKS
 DATABASES["default"]["CONN_MAX_AGE"] = 0
 
 if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
@@ -190,6 +197,44 @@ if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
         "application_name": "django-dev",
     })
 
+    if project_settings.DB_POOL_ENABLED:
+        # Pooled connections are returned to the pool at the end of each request,
+        # so CONN_MAX_AGE must stay 0.
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": project_settings.DB_POOL_MIN_SIZE,
+            "max_size": project_settings.DB_POOL_MAX_SIZE,
+            "timeout": project_settings.DB_POOL_TIMEOUT,
+            "max_lifetime": project_settings.DB_POOL_MAX_LIFETIME,
+            "max_idle": project_settings.DB_POOL_MAX_IDLE,
+        }
+    else:
+        DATABASES["default"]["CONN_MAX_AGE"] = project_settings.DB_CONN_MAX_AGE
+
+if IS_TESTING:
+    # Separate in-memory database for the replica routing tests; routing itself
+    # stays off unless a test enables DATABASE_REPLICA_READS.
+    DATABASES["replica"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": ":memory:",
+        "OPTIONS": {},
+    }
+elif project_settings.DB_REPLICA_HOST:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "OPTIONS": dict(DATABASES["default"].get("OPTIONS", {})),
+        "HOST": project_settings.DB_REPLICA_HOST,
+        "PORT": project_settings.DB_REPLICA_PORT or project_settings.DB_PORT,
+        "NAME": project_settings.DB_REPLICA_NAME or project_settings.DB_NAME,
+        "USER": project_settings.DB_REPLICA_USER or project_settings.DB_USER,
+        "PASSWORD": (
+            project_settings.DB_REPLICA_PASSWORD or project_settings.DB_PASSWORD
+        ),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_REPLICA_READS = "replica" in DATABASES and not IS_TESTING
+DATABASE_ROUTERS = ["core.db.replica.ReplicaRouter"]
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -283,6 +328,13 @@ LOGGING = {
             "level": "INFO" if DEBUG else "WARNING",
             "propagate": False,
         },
+
+        # One JSON line per request from RequestTimingMiddleware.
+        "core.services.request_timing": {
+            "handlers": ["console"],
+            "level": project_settings.REQUEST_TIMING_LOG_LEVEL,
+            "propagate": False,
+        },
     },
 }
 
@@ -290,6 +342,12 @@ MEDIA_URL = '/media/'
 
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Background tasks run on a per-process thread pool after the transaction commits.
+# Tests run them inline so assertions can see their results.
+BACKGROUND_TASKS_EAGER = IS_TESTING
+
 SPECTACULAR_SETTINGS = {
     "COMPONENT_SPLIT_REQUEST": True,
+    # Views built on core.openapi.base_views are decorated for the schema only here.
+    "PREPROCESSING_HOOKS": ["core.openapi.hooks.decorate_schema_views"],
 }
\ No newline at end of file
@@ -3,19 +3,22 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import RedirectView
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework.permissions import AllowAny
 from rest_framework_simplejwt.views import TokenRefreshView
 
 from common.views import doc_page, UserMeView
 from core.api.auth import LoginTokenObtainPairView
-from core.api.health import health_check
+from core.api.health import liveness_check, readiness_check
+from core.api.metrics import metrics
 
 urlpatterns = [
     path("admin/", admin.site.urls),
 
     # Health
-    path("api/health/", health_check, name="health-check"),
+    path("api/health/live/", liveness_check, name="health-live"),
+    path("api/health/ready/", readiness_check, name="health-ready"),
+    path("api/health/", readiness_check, name="health-check"),
+    path("metrics", metrics, name="metrics"),
 
     # Authentication
     path(
@@ -43,6 +46,9 @@ urlpatterns = [
 
 
 if settings.DEBUG:
+    # Schema generation is only imported when its views are mounted.
+    from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+
     urlpatterns += [
         path(
             "",
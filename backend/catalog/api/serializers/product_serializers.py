@@ -1,10 +1,14 @@
 from rest_framework import serializers
 
 from catalog.models import Product
+from core.api.fields import ImageVariantsField
 
 
 class ProductListCreateAPISerializer(serializers.ModelSerializer):
     productImage = serializers.ImageField(source="product_image")
+    productImageVariants = ImageVariantsField(
+        source="product_image_variants", image_field="product_image"
+    )
     forWeb = serializers.BooleanField(source="for_web")
     isPieceBased = serializers.BooleanField(source="is_piece_based")
 
@@ -15,6 +19,7 @@ class ProductListCreateAPISerializer(serializers.ModelSerializer):
             "name",
             "title",
             "productImage",
+            "productImageVariants",
             "forWeb",
             "isPieceBased",
         ]
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "catalog"
+
+    def ready(self) -> None:
+        from catalog.services.public_catalog import register_public_catalog_hooks
+        from core.services.image_variants import register_image_variants
+
+        register_image_variants(
+            self.get_model("Product"),
+            image_field="product_image",
+            variants_field="product_image_variants",
+        )
+        register_public_catalog_hooks()
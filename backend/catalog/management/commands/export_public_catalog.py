@@ -0,0 +1,22 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from catalog.services.public_catalog import public_catalog_root, rebuild_public_catalog
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the public catalog (products marked for web) into static JSON and "
+        "HTML files under MEDIA_ROOT. Unchanged files are left untouched."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        written = rebuild_public_catalog()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Public catalog exported to {public_catalog_root()} "
+                f"({written} files updated)."
+            )
+        )
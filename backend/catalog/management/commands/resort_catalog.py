@@ -0,0 +1,25 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from catalog.services.sort_keys import resort_descriptions, resort_specifications
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored sort keys of product specifications and "
+        "descriptions from the current group, name and item order."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with transaction.atomic():
+            specifications = resort_specifications()
+            descriptions = resort_descriptions()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Resorted {specifications} specifications "
+                f"and {descriptions} descriptions."
+            )
+        )
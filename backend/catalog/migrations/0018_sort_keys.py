@@ -0,0 +1,64 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:38
+
+from django.db import migrations, models
+from django.db.models import F, OuterRef, Subquery
+
+SPEC_GROUP_ORDER_MULTIPLIER = 2**31
+
+
+def populate_sort_keys(apps, schema_editor):
+    DescriptionItem = apps.get_model('catalog', 'DescriptionItem')
+    ProductDescription = apps.get_model('catalog', 'ProductDescription')
+    ProductSpecName = apps.get_model('catalog', 'ProductSpecName')
+    ProductSpecification = apps.get_model('catalog', 'ProductSpecification')
+
+    spec_key = (
+        ProductSpecName.objects.filter(pk=OuterRef('name_id'))
+        .annotate(key=F('group__order') * SPEC_GROUP_ORDER_MULTIPLIER + F('order'))
+        .values('key')[:1]
+    )
+    ProductSpecification.objects.update(sort_key=Subquery(spec_key))
+
+    item_order = DescriptionItem.objects.filter(pk=OuterRef('item_id')).values('order')[:1]
+    ProductDescription.objects.update(sort_key=Subquery(item_order))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0017_alter_salespricehistory_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='productdescription',
+            options={'ordering': ('sort_key', 'pk'), 'verbose_name': 'Product Description', 'verbose_name_plural': 'Product Descriptions'},
+        ),
+        migrations.AlterModelOptions(
+            name='productspecification',
+            options={'ordering': ('sort_key', 'pk'), 'verbose_name': 'Значение показателя спецификации', 'verbose_name_plural': 'Значения показателей спецификации'},
+        ),
+        migrations.RemoveIndex(
+            model_name='productspecification',
+            name='catalog_spe_product_1e509d_idx',
+        ),
+        migrations.AddField(
+            model_name='productdescription',
+            name='sort_key',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='productspecification',
+            name='sort_key',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='productdescription',
+            index=models.Index(fields=['product', 'sort_key'], name='catalog_pro_product_88ff69_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productspecification',
+            index=models.Index(fields=['product', 'sort_key'], name='catalog_spe_product_1dbb3e_idx'),
+        ),
+        migrations.RunPython(populate_sort_keys, migrations.RunPython.noop),
+    ]
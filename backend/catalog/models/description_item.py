@@ -1,3 +1,5 @@
+from typing import Any
+
 from django.db import models
 
 
@@ -10,6 +12,9 @@ class DescriptionItem(models.Model):
     for specifying singular and plural verbose names. The string representation of
     the model instance returns its title.
 
+    Changing the order refreshes the stored sort key of the product descriptions
+    that use this item.
+
     Attributes:
         title (str): The title of the description item.
         order (int): The order of the description item within its category.
@@ -24,5 +29,21 @@ class DescriptionItem(models.Model):
         verbose_name = "Пункт описания"
         verbose_name_plural = "Пункты описания"
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        from catalog.services.sort_keys import resort_description_item
+
+        previous_order = (
+            None
+            if self._state.adding
+            else DescriptionItem.objects.filter(pk=self.pk)
+            .values_list("order", flat=True)
+            .first()
+        )
+
+        super().save(*args, **kwargs)
+
+        if previous_order is not None and previous_order != self.order:
+            resort_description_item(self)
+
     def __str__(self) -> str:
         return self.title
@@ -27,6 +27,8 @@ class Product(models.Model):
         title (str): The title of the product, limited to 255 characters.
         product_image (Optional[ImageField]): An optional image of the product, stored in the
             "product_images" directory. It can be null or blank.
+        product_image_variants (dict): Storage names of the resized copies of the product
+            image, generated in the background.
         for_web (bool): Indicates whether the product is intended for web display. Defaults to False.
         is_piece_based (bool): Indicates if the product follows piece-based production rules.
             Defaults to False.
@@ -35,6 +37,7 @@ class Product(models.Model):
     name = models.CharField(max_length=100)
     title = models.CharField(max_length=255)
     product_image = models.ImageField(upload_to="product_images", null=True, blank=True)
+    product_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     product_group = models.ForeignKey(
         "catalog.ProductGroup", on_delete=models.PROTECT, related_name="product_groups"
     )
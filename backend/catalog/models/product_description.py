@@ -1,3 +1,5 @@
+from typing import Any
+
 from django.db import models
 
 
@@ -18,6 +20,8 @@ class ProductDescription(models.Model):
             "catalog.DescriptionItem" model. Identifies the description item for
             the product.
         text: A TextField holding the specific description details.
+        sort_key: Denormalized copy of the item order, so the default ordering
+            uses a local index instead of joining the description item table.
 
     Meta:
         constraints: List of unique constraints to ensure uniqueness of the
@@ -35,9 +39,11 @@ class ProductDescription(models.Model):
         related_name="product_descriptions",
     )
     text = models.TextField()
+    sort_key = models.PositiveSmallIntegerField(default=0, editable=False)
 
     class Meta:
-        ordering = ("item__order",)
+        ordering = ("sort_key", "pk")
+        indexes = [models.Index(fields=("product", "sort_key"))]
         constraints = [
             models.UniqueConstraint(
                 fields=["product", "item"],
@@ -48,5 +54,14 @@ class ProductDescription(models.Model):
         verbose_name = "Product Description"
         verbose_name_plural = "Product Descriptions"
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        self.sort_key = self.item.order
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "item" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "sort_key"}
+
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return f"{self.product} - {self.item}"
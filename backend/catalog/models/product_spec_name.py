@@ -1,3 +1,5 @@
+from typing import Any
+
 from django.db import models
 
 
@@ -15,5 +17,21 @@ class ProductSpecName(models.Model):
         verbose_name = "Наименование показателя спецификации"
         verbose_name_plural = "Наименования показателей спецификации"
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        from catalog.services.sort_keys import resort_spec_name
+
+        previous = (
+            None
+            if self._state.adding
+            else ProductSpecName.objects.filter(pk=self.pk)
+            .values_list("group_id", "order")
+            .first()
+        )
+
+        super().save(*args, **kwargs)
+
+        if previous is not None and previous != (self.group_id, self.order):
+            resort_spec_name(self)
+
     def __str__(self) -> str:
         return self.title
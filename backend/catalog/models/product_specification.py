@@ -1,3 +1,5 @@
+from typing import Any
+
 from django.db import models
 
 
@@ -14,6 +16,8 @@ class ProductSpecification(models.Model):
         name: The name of the specification.
         value: The value associated with the specification.
         unit: The unit of measurement for the specification value, if applicable.
+        sort_key: Denormalized copy of the group and name order, so the default
+            ordering uses a local index instead of joining the name and group tables.
 
     Meta:
         constraints: Enforces uniqueness of the combination of product and group.
@@ -36,10 +40,11 @@ class ProductSpecification(models.Model):
         blank=True,
         on_delete=models.PROTECT,
     )
+    sort_key = models.PositiveBigIntegerField(default=0, editable=False)
 
     class Meta:
-        ordering = ("name__group__order", "name__order", "pk")
-        indexes = [models.Index(fields=("product",))]
+        ordering = ("sort_key", "pk")
+        indexes = [models.Index(fields=("product", "sort_key"))]
         constraints = [
             models.UniqueConstraint(
                 fields=("product", "name"),
@@ -50,5 +55,16 @@ class ProductSpecification(models.Model):
         verbose_name = "Значение показателя спецификации"
         verbose_name_plural = "Значения показателей спецификации"
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        from catalog.services.sort_keys import spec_sort_key
+
+        self.sort_key = spec_sort_key(self.name.group.order, self.name.order)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "sort_key"}
+
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return f"{self.name} ({self.product.name})"
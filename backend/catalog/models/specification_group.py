@@ -1,3 +1,5 @@
+from typing import Any
+
 from django.db import models
 
 
@@ -9,6 +11,9 @@ class SpecificationGroup(models.Model):
     of catalog items. Includes a name for the group and metadata for database representation
     and administrative purposes.
 
+    Changing the order refreshes the stored sort key of the product specification
+    rows whose names belong to this group.
+
     Attributes:
         name: CharField
             The name of the specification group.
@@ -24,5 +29,21 @@ class SpecificationGroup(models.Model):
         verbose_name = "Группа показателей спецификации"
         verbose_name_plural = "Группы показателей спецификации"
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        from catalog.services.sort_keys import resort_specification_group
+
+        previous_order = (
+            None
+            if self._state.adding
+            else SpecificationGroup.objects.filter(pk=self.pk)
+            .values_list("order", flat=True)
+            .first()
+        )
+
+        super().save(*args, **kwargs)
+
+        if previous_order is not None and previous_order != self.order:
+            resort_specification_group(self)
+
     def __str__(self) -> str:
         return self.name
@@ -0,0 +1,296 @@
+import json
+import os
+import tempfile
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.db.models import Model, Prefetch, QuerySet
+from django.db.models.signals import post_delete, post_save
+from django.template.loader import render_to_string
+
+from catalog.models import (
+    DescriptionItem,
+    Product,
+    ProductDescription,
+    ProductGroup,
+    ProductSpecification,
+    ProductSpecName,
+    SpecificationGroup,
+)
+from core.services.background import run_in_background
+from core.services.image_variants import image_variants_generated
+
+PUBLIC_CATALOG_DIR = "public_catalog"
+
+
+def public_catalog_root() -> Path:
+    return Path(settings.MEDIA_ROOT) / PUBLIC_CATALOG_DIR
+
+
+def _public_products() -> QuerySet[Product]:
+    return (
+        Product.objects.filter(for_web=True)
+        .select_related("product_group")
+        .prefetch_related(
+            Prefetch(
+                "specs",
+                queryset=ProductSpecification.objects.select_related(
+                    "name__group", "unit"
+                ),
+            ),
+            Prefetch(
+                "descriptions",
+                queryset=ProductDescription.objects.select_related("item"),
+            ),
+        )
+        .order_by("product_group__order", "product_group_id", "title", "pk")
+    )
+
+
+def _image(product: Product) -> dict[str, Any] | None:
+    image = product.product_image
+    if not image:
+        return None
+
+    variants = product.product_image_variants or {}
+    current = variants.get("source") == image.name
+
+    return {
+        "url": image.url,
+        "variants": {
+            variant: {key: image.storage.url(name) for key, name in formats.items()}
+            for variant, formats in variants.items()
+            if current and variant != "source"
+        },
+    }
+
+
+def product_payload(product: Product) -> dict[str, Any]:
+    """
+    Builds the public representation of a product from prefetched relations.
+    """
+    groups: list[dict[str, Any]] = []
+    for spec in product.specs.all():
+        group = spec.name.group
+        if not groups or groups[-1]["id"] != group.pk:
+            groups.append({"id": group.pk, "name": group.name, "specs": []})
+
+        groups[-1]["specs"].append(
+            {
+                "name": spec.name.title,
+                "value": spec.value,
+                "unit": spec.unit.get_title_display() if spec.unit else None,
+            }
+        )
+
+    return {
+        "id": product.pk,
+        "name": product.name,
+        "title": product.title,
+        "group": {
+            "id": product.product_group_id,
+            "name": product.product_group.name,
+        },
+        "image": _image(product),
+        "specifications": groups,
+        "descriptions": [
+            {"title": description.item.title, "text": description.text}
+            for description in product.descriptions.all()
+        ],
+    }
+
+
+def _write(path: Path, content: str) -> bool:
+    """
+    Atomically replaces ``path`` with ``content`` unless it is already up to date.
+    """
+    data = content.encode()
+    if path.exists() and path.read_bytes() == data:
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+    return True
+
+
+def _dumps(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def _product_paths(pk: Any) -> tuple[Path, Path]:
+    products_dir = public_catalog_root() / "products"
+    return products_dir / f"{pk}.json", products_dir / f"{pk}.html"
+
+
+def _render_product(product: Product) -> int:
+    payload = product_payload(product)
+    json_path, html_path = _product_paths(product.pk)
+
+    json_written: bool = _write(json_path, _dumps(payload))
+    html_written: bool = _write(
+        html_path,
+        render_to_string("catalog/public/product.html", {"product": payload}),
+    )
+    return json_written + html_written
+
+
+def _render_index() -> int:
+    groups: list[dict[str, Any]] = []
+
+    for product in (
+        Product.objects.filter(for_web=True)
+        .select_related("product_group")
+        .order_by("product_group__order", "product_group_id", "title", "pk")
+    ):
+        if not groups or groups[-1]["id"] != product.product_group_id:
+            groups.append(
+                {
+                    "id": product.product_group_id,
+                    "name": product.product_group.name,
+                    "products": [],
+                }
+            )
+
+        groups[-1]["products"].append(
+            {
+                "id": product.pk,
+                "name": product.name,
+                "title": product.title,
+                "image": _image(product),
+            }
+        )
+
+    root = public_catalog_root()
+    json_written: bool = _write(root / "index.json", _dumps({"groups": groups}))
+    html_written: bool = _write(
+        root / "index.html",
+        render_to_string("catalog/public/index.html", {"groups": groups}),
+    )
+    return json_written + html_written
+
+
+def rebuild_public_products(product_ids: Iterable[Any]) -> int:
+    """
+    Re-renders the pages of the given products and the catalog index.
+
+    Pages of products that no longer exist or are hidden from the web are removed.
+    Files whose content has not changed are left untouched, so their modification
+    time and HTTP caches stay valid. Returns the number of files written.
+    """
+    product_ids = set(product_ids)
+    written = 0
+
+    products = _public_products().filter(pk__in=product_ids)
+    for product in products:
+        written += _render_product(product)
+        product_ids.discard(product.pk)
+
+    for pk in product_ids:
+        for path in _product_paths(pk):
+            path.unlink(missing_ok=True)
+
+    return written + _render_index()
+
+
+def rebuild_public_catalog() -> int:
+    """
+    Renders every public product page and the index, removing orphaned pages.
+    """
+    written = 0
+    rendered: set[str] = set()
+
+    for product in _public_products().iterator(chunk_size=200):
+        written += _render_product(product)
+        rendered.add(str(product.pk))
+
+    products_dir = public_catalog_root() / "products"
+    if products_dir.is_dir():
+        for path in products_dir.iterdir():
+            if path.stem not in rendered:
+                path.unlink(missing_ok=True)
+
+    return written + _render_index()
+
+
+def schedule_public_catalog_rebuild(product_ids: Iterable[Any]) -> None:
+    """
+    Rebuilds the given product pages in the background once the transaction commits.
+    """
+    product_ids = sorted(set(product_ids))
+    if product_ids:
+        run_in_background(rebuild_public_products, product_ids)
+
+
+def _affected_products(instance: Any) -> list[Any]:
+    if isinstance(instance, Product):
+        return [instance.pk]
+    if isinstance(instance, (ProductSpecification, ProductDescription)):
+        return [instance.product_id]
+
+    lookups = {
+        ProductGroup: "product_group",
+        ProductSpecName: "specs__name",
+        SpecificationGroup: "specs__name__group",
+        DescriptionItem: "descriptions__item",
+    }
+    lookup = lookups[type(instance)]
+    return list(
+        Product.objects.filter(for_web=True, **{lookup: instance})
+        .values_list("pk", flat=True)
+        .distinct()
+    )
+
+
+def _schedule_on_change(sender: Any, instance: Any, **kwargs: Any) -> None:
+    if kwargs.get("raw"):
+        return
+
+    schedule_public_catalog_rebuild(_affected_products(instance))
+
+
+def register_public_catalog_hooks() -> None:
+    """
+    Keeps the exported catalog in sync with the rows its pages are rendered from.
+    """
+    for model in (Product, ProductSpecification, ProductDescription):
+        post_save.connect(
+            _schedule_on_change,
+            sender=model,
+            dispatch_uid=f"public_catalog_save_{model._meta.label}",
+        )
+        post_delete.connect(
+            _schedule_on_change,
+            sender=model,
+            dispatch_uid=f"public_catalog_delete_{model._meta.label}",
+        )
+
+    # Referenced rows are protected from deletion, so only renames and reorders matter.
+    referenced_models: tuple[type[Model], ...] = (
+        ProductGroup,
+        ProductSpecName,
+        SpecificationGroup,
+        DescriptionItem,
+    )
+    for referenced_model in referenced_models:
+        post_save.connect(
+            _schedule_on_change,
+            sender=referenced_model,
+            dispatch_uid=f"public_catalog_save_{referenced_model._meta.label}",
+        )
+
+    image_variants_generated.connect(
+        _schedule_on_change,
+        sender=Product,
+        dispatch_uid="public_catalog_image_variants",
+    )
@@ -0,0 +1,77 @@
+from django.db.models import F, OuterRef, Subquery
+
+from catalog.models import (
+    DescriptionItem,
+    ProductDescription,
+    ProductSpecification,
+    ProductSpecName,
+    SpecificationGroup,
+)
+
+# ProductSpecName.order is a PositiveIntegerField, so it always fits below 2**31
+# and the group order can occupy the high bits of the combined key.
+SPEC_GROUP_ORDER_MULTIPLIER = 2**31
+
+
+def spec_sort_key(group_order: int, name_order: int) -> int:
+    """
+    Builds the stored sort key of a product specification row from the order of
+    its specification group and the order of its specification name.
+    """
+    return group_order * SPEC_GROUP_ORDER_MULTIPLIER + name_order
+
+
+def resort_spec_name(spec_name: ProductSpecName) -> int:
+    """
+    Refreshes the sort key of every specification row that uses the given name.
+    """
+    return ProductSpecification.objects.filter(name=spec_name).update(
+        sort_key=spec_sort_key(spec_name.group.order, spec_name.order)
+    )
+
+
+def resort_specification_group(group: SpecificationGroup) -> int:
+    """
+    Refreshes the sort key of every specification row whose name belongs to the
+    given specification group.
+    """
+    name_order = ProductSpecName.objects.filter(pk=OuterRef("name_id")).values("order")[
+        :1
+    ]
+
+    return ProductSpecification.objects.filter(name__group=group).update(
+        sort_key=group.order * SPEC_GROUP_ORDER_MULTIPLIER + Subquery(name_order)
+    )
+
+
+def resort_description_item(item: DescriptionItem) -> int:
+    """
+    Refreshes the sort key of every product description that uses the given item.
+    """
+    return ProductDescription.objects.filter(item=item).update(sort_key=item.order)
+
+
+def resort_specifications() -> int:
+    """
+    Recomputes the sort key of all specification rows in a single UPDATE.
+    """
+    key = (
+        ProductSpecName.objects.filter(pk=OuterRef("name_id"))
+        .annotate(
+            key=F("group__order") * SPEC_GROUP_ORDER_MULTIPLIER + F("order"),
+        )
+        .values("key")[:1]
+    )
+
+    return ProductSpecification.objects.update(sort_key=Subquery(key))
+
+
+def resort_descriptions() -> int:
+    """
+    Recomputes the sort key of all product descriptions in a single UPDATE.
+    """
+    item_order = DescriptionItem.objects.filter(pk=OuterRef("item_id")).values("order")[
+        :1
+    ]
+
+    return ProductDescription.objects.update(sort_key=Subquery(item_order))
@@ -1,4 +1,7 @@
+from io import StringIO
+
 import pytest
+from django.core.management import call_command
 
 from catalog.models import (
     DescriptionItem,
@@ -12,6 +15,7 @@ from catalog.models import (
     SalesPriceHistory,
     SpecificationGroup,
 )
+from catalog.services.sort_keys import spec_sort_key
 from catalog.tests.api.factories import (
     DescriptionItemFactory,
     ProductDescriptionFactory,
@@ -130,6 +134,41 @@ class TestProductSpecificationModel(BaseModelTestCase):
         expected = f"{self.obj.name} ({self.obj.product.name})"
         self._str_method(expected)
 
+    def test_sort_key_follows_group_and_name_order(self) -> None:
+        self._logger_header("TEST: specification sort key follows group/name order")
+        product = self.obj.product
+        group = SpecificationGroupFactory.create(order=2)
+        first = ProductSpecificationFactory.create(
+            product=product, name=ProductSpecNameFactory.create(group=group, order=5)
+        )
+        second = ProductSpecificationFactory.create(
+            product=product, name=ProductSpecNameFactory.create(group=group, order=1)
+        )
+
+        self.assertEqual(second.sort_key, spec_sort_key(2, 1))
+        self.assertEqual(
+            list(ProductSpecification.objects.filter(name__group=group)),
+            [second, first],
+        )
+
+        first.name.order = 0
+        first.name.save()
+        self.assertEqual(
+            list(ProductSpecification.objects.filter(name__group=group)),
+            [first, second],
+        )
+
+        self.obj.name.group.order = 3
+        self.obj.name.group.save()
+        self.obj.refresh_from_db()
+        self.assertEqual(self.obj.sort_key, spec_sort_key(3, self.obj.name.order))
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Specification sort key kept in sync"
+            f"{self.COLOR['END']}"
+        )
+
 
 class TestProductDescriptionModel(BaseModelTestCase):
     __test__ = True
@@ -140,6 +179,53 @@ class TestProductDescriptionModel(BaseModelTestCase):
         expected = f"{self.obj.product} - {self.obj.item}"
         self._str_method(expected)
 
+    def test_sort_key_follows_item_order(self) -> None:
+        self._logger_header("TEST: description sort key follows item order")
+        other = ProductDescriptionFactory.create(
+            product=self.obj.product,
+            item=DescriptionItemFactory.create(order=1),
+        )
+
+        self.assertEqual(
+            list(ProductDescription.objects.filter(product=self.obj.product)),
+            [self.obj, other],
+        )
+
+        self.obj.item.order = 2
+        self.obj.item.save()
+
+        self.assertEqual(
+            list(ProductDescription.objects.filter(product=self.obj.product)),
+            [other, self.obj],
+        )
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Description sort key kept in sync"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_resort_catalog_command(self) -> None:
+        self._logger_header("TEST: resort_catalog command")
+        spec = ProductSpecificationFactory.create()
+        ProductDescription.objects.filter(pk=self.obj.pk).update(sort_key=99)
+        ProductSpecification.objects.filter(pk=spec.pk).update(sort_key=99)
+
+        call_command("resort_catalog", stdout=StringIO())
+
+        self.obj.refresh_from_db()
+        spec.refresh_from_db()
+        self.assertEqual(self.obj.sort_key, self.obj.item.order)
+        self.assertEqual(
+            spec.sort_key, spec_sort_key(spec.name.group.order, spec.name.order)
+        )
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Sort keys recomputed by resort_catalog"
+            f"{self.COLOR['END']}"
+        )
+
 
 @pytest.mark.django_db
 class TestProductUnitModel(BaseModelTestCase):
@@ -0,0 +1,132 @@
+import json
+import shutil
+from io import StringIO
+from typing import Any
+
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APITestCase
+
+from catalog.services.public_catalog import public_catalog_root
+from catalog.tests.api.factories import (
+    ProductDescriptionFactory,
+    ProductFactory,
+    ProductSpecificationFactory,
+)
+from core.tests.test_image_variants import make_image
+from core.tests.utils import TestLoggerMixin
+
+
+@pytest.mark.django_db
+class TestPublicCatalog(APITestCase, TestLoggerMixin):
+    def setUp(self) -> None:
+        shutil.rmtree(public_catalog_root(), ignore_errors=True)
+
+    def _read_json(self, name: str) -> Any:
+        return json.loads((public_catalog_root() / name).read_text())
+
+    def test_export_command_renders_public_products(self) -> None:
+        self._logger_header("TEST: export renders public products")
+        product = ProductFactory.create(product_image=make_image())
+        hidden = ProductFactory.create(for_web=False)
+        spec = ProductSpecificationFactory.create(product=product)
+        description = ProductDescriptionFactory.create(product=product)
+
+        out = StringIO()
+        call_command("export_public_catalog", stdout=out)
+
+        payload = self._read_json(f"products/{product.pk}.json")
+        self.assertEqual(payload["title"], product.title)
+        self.assertEqual(payload["group"]["name"], product.product_group.name)
+        self.assertEqual(payload["specifications"][0]["specs"][0]["value"], spec.value)
+        self.assertEqual(payload["descriptions"][0]["text"], description.text)
+        self.assertTrue(payload["image"]["url"].endswith(".png"))
+
+        html = (public_catalog_root() / f"products/{product.pk}.html").read_text()
+        self.assertIn(product.title, html)
+        self.assertFalse(
+            (public_catalog_root() / f"products/{hidden.pk}.json").exists()
+        )
+
+        index = self._read_json("index.json")
+        self.assertEqual(
+            [p["id"] for group in index["groups"] for p in group["products"]],
+            [product.pk],
+        )
+        self.assertIn("4 files updated", out.getvalue())
+
+        out = StringIO()
+        call_command("export_public_catalog", stdout=out)
+        self.assertIn("0 files updated", out.getvalue())
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Public products exported, unchanged files left untouched"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_changes_rebuild_only_affected_pages(self) -> None:
+        self._logger_header("TEST: changes rebuild affected pages")
+        first, second = ProductFactory.create_batch(2)
+        call_command("export_public_catalog", stdout=StringIO())
+        second_page = public_catalog_root() / f"products/{second.pk}.html"
+        second_mtime = second_page.stat().st_mtime_ns
+
+        with self.captureOnCommitCallbacks(execute=True):
+            spec = ProductSpecificationFactory.create(product=first)
+
+        self.assertEqual(
+            self._read_json(f"products/{first.pk}.json")["specifications"][0]["specs"][
+                0
+            ]["value"],
+            spec.value,
+        )
+        self.assertEqual(second_page.stat().st_mtime_ns, second_mtime)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            spec.name.title = "Плотность"
+            spec.name.save()
+
+        self.assertEqual(
+            self._read_json(f"products/{first.pk}.json")["specifications"][0]["specs"][
+                0
+            ]["name"],
+            "Плотность",
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.for_web = False
+            first.save()
+
+        self.assertFalse((public_catalog_root() / f"products/{first.pk}.json").exists())
+        self.assertEqual(
+            [
+                p["id"]
+                for group in self._read_json("index.json")["groups"]
+                for p in group["products"]
+            ],
+            [second.pk],
+        )
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Changed and hidden products refreshed, others untouched"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_image_variants_published_once_generated(self) -> None:
+        self._logger_header("TEST: image variants published once generated")
+        product = ProductFactory.create()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product.product_image = make_image()
+            product.save()
+
+        variants = self._read_json(f"products/{product.pk}.json")["image"]["variants"]
+        self.assertTrue(variants["thumbnail"]["webp"].endswith(".thumbnail.webp"))
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Variant URLs written after background generation"
+            f"{self.COLOR['END']}"
+        )
@@ -1,9 +1,15 @@
-from typing import Any, Union
+from typing import Any, Callable, Union
 
 from django.contrib import admin, messages
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
 
 from common.models import Documentation, Organisation
+from core.security.upload_handlers import (
+    UploadRejectedError,
+    install_scanning_upload_handler,
+)
 
 
 class BaseAdmin(admin.ModelAdmin):
@@ -48,8 +54,57 @@ class BaseAdmin(admin.ModelAdmin):
         return super().message_user(request, message, level, extra_tags, fail_silently)
 
 
+class ScanningUploadAdminMixin:
+    """
+    Receives the files of the add and change forms with ``ScanningUploadHandler``,
+    so infected files are refused while they are uploaded.
+
+    The CSRF middleware would read the body before the view could choose the upload
+    handler, so both views are exempt from it; ``changeform_view`` still checks the
+    token itself once the handler is installed.
+    """
+
+    def _scanned_form_view(
+        self, view: Callable[..., HttpResponse], request: HttpRequest, *args: Any
+    ) -> HttpResponse:
+        install_scanning_upload_handler(request, reject_infected=True)
+
+        try:
+            return view(request, *args)
+        except UploadRejectedError as exc:
+            self.message_user(request, exc.message, messages.ERROR)  # type: ignore[attr-defined]
+            return HttpResponseRedirect(request.get_full_path())
+
+    @method_decorator(csrf_exempt)
+    def add_view(
+        self,
+        request: HttpRequest,
+        form_url: str = "",
+        extra_context: dict[str, Any] | None = None,
+    ) -> HttpResponse:
+        return self._scanned_form_view(
+            super().add_view, request, form_url, extra_context  # type: ignore[misc]
+        )
+
+    @method_decorator(csrf_exempt)
+    def change_view(
+        self,
+        request: HttpRequest,
+        object_id: str,
+        form_url: str = "",
+        extra_context: dict[str, Any] | None = None,
+    ) -> HttpResponse:
+        return self._scanned_form_view(
+            super().change_view,  # type: ignore[misc]
+            request,
+            object_id,
+            form_url,
+            extra_context,
+        )
+
+
 @admin.register(Documentation)
-class DocumentationAdmin(BaseAdmin):
+class DocumentationAdmin(ScanningUploadAdminMixin, BaseAdmin):
     list_display = (
         "title",
         "file",
@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "common"
+
+    def ready(self) -> None:
+        from common.services.documentation_bundles import (
+            register_documentation_bundle_hooks,
+        )
+        from core.services.blob_storage import register_blob_sweep_hooks
+
+        register_documentation_bundle_hooks()
+        register_blob_sweep_hooks(self.get_model("Documentation"))
@@ -0,0 +1,28 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from common.services.documentation_bundles import (
+    evict_documentation_bundles,
+    purge_documentation_bundles,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Trim the cache of documentation ZIP bundles to its size limit and remove "
+        "abandoned partial bundles. With --all, empty the cache."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--all", action="store_true")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["all"]:
+            removed = purge_documentation_bundles()
+        else:
+            removed = evict_documentation_bundles()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Documentation bundles removed: {removed}.")
+        )
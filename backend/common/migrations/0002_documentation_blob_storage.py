@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:36
+
+import core.services.blob_storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('common', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='documentation',
+            name='file',
+            field=models.FileField(max_length=255, storage=core.services.blob_storage.get_blob_storage, upload_to='docs'),
+        ),
+    ]
@@ -1,5 +1,8 @@
 from django.core.exceptions import ValidationError
 from django.db import models
+from django_cleanup import cleanup
+
+from core.services.blob_storage import get_blob_storage
 
 
 class Organisation(models.Model):
@@ -22,6 +25,7 @@ class Organisation(models.Model):
         return self.short_name
 
 
+@cleanup.ignore
 class Documentation(models.Model):
     """
     Represents a document associated with an organization.
@@ -30,7 +34,7 @@ class Documentation(models.Model):
     ALLOWED_TAGS = ("МИКСИТИ", "РИКС", "ОБЩИЕ")
 
     title = models.CharField(max_length=255)
-    file = models.FileField(upload_to="docs")
+    file = models.FileField(upload_to="docs", storage=get_blob_storage, max_length=255)
     status = models.CharField(max_length=25, blank=True, null=True)
     tag = models.CharField(
         max_length=255,
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+
+from app_settings import project_settings
+from common.models import Documentation
+from common.services.documentation_files import stream_documents_zip
+from core.services.background import run_in_background
+from core.services.metrics import count_cache_lookup, observe_export
+
+logger = logging.getLogger(__name__)
+
+DOCUMENTATION_BUNDLE_DIR = "cache/documentation_bundles"
+
+# Unfinished bundles older than this were left behind by a killed worker.
+STALE_TEMP_AGE = 60 * 60
+
+
+def documentation_bundle_root() -> Path:
+    return Path(settings.MEDIA_ROOT) / DOCUMENTATION_BUNDLE_DIR
+
+
+def _bundle_paths(key: str) -> tuple[Path, Path]:
+    root = documentation_bundle_root()
+    return root / f"{key}.zip", root / f"{key}.json"
+
+
+def _bundle_order(documents: list[Documentation]) -> list[Documentation]:
+    # Archives are built in id order, so any request order yields the same archive.
+    return sorted(documents, key=lambda doc: doc.pk)
+
+
+def documentation_bundle_key(documents: list[Documentation]) -> str:
+    """
+    Identifies the archive of a document set: the sorted document ids with the name,
+    size and modification time of each file, so a replaced file yields a new key.
+    """
+    sha256 = hashlib.sha256()
+
+    for doc in _bundle_order(documents):
+        name, size, mtime = "", 0, 0.0
+        if doc.file:
+            name = doc.file.name or ""
+            size = doc.file.storage.size(name)
+            mtime = doc.file.storage.get_modified_time(name).timestamp()
+
+        sha256.update(f"{doc.pk}\0{name}\0{size}\0{mtime}\n".encode())
+
+    return sha256.hexdigest()
+
+
+def open_cached_bundle(key: str) -> BinaryIO | None:
+    """
+    Opens the cached archive for ``key`` and marks it as recently used, or returns
+    ``None`` if there is none.
+    """
+    path, _ids_path = _bundle_paths(key)
+
+    try:
+        file = path.open("rb")
+    except FileNotFoundError:
+        count_cache_lookup("documentation_bundle", hit=False)
+        return None
+
+    count_cache_lookup("documentation_bundle", hit=True)
+
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        # Evicted meanwhile; the open file is still readable.
+        pass
+
+    return file
+
+
+def stream_and_cache_bundle(
+    key: str, documents: list[Documentation]
+) -> Iterator[bytes]:
+    """
+    Yields the archive of ``documents`` while writing it to the cache under ``key``.
+    Members are in id order, like the key, whatever the order of ``documents``.
+
+    The archive only becomes visible once it is complete, so an interrupted download
+    leaves nothing behind. Archives larger than
+    ``DOCUMENTATION_BUNDLE_CACHE_MAX_BYTES`` are streamed without being cached.
+    """
+    max_bytes = project_settings.DOCUMENTATION_BUNDLE_CACHE_MAX_BYTES
+    path, ids_path = _bundle_paths(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{key}.")
+    cached = False
+
+    try:
+        with os.fdopen(fd, "wb") as file, observe_export("documentation_bundle"):
+            caching = True
+            for chunk in stream_documents_zip(_bundle_order(documents)):
+                if caching:
+                    file.write(chunk)
+                    caching = file.tell() <= max_bytes
+                yield chunk
+
+        if caching:
+            ids_path.write_text(json.dumps(sorted(doc.pk for doc in documents)))
+            os.replace(tmp_name, path)
+            cached = True
+    finally:
+        if not cached:
+            Path(tmp_name).unlink(missing_ok=True)
+
+    evict_documentation_bundles()
+
+
+def _remove_bundle(path: Path) -> None:
+    path.unlink(missing_ok=True)
+    path.with_suffix(".json").unlink(missing_ok=True)
+
+
+def evict_documentation_bundles(max_bytes: int | None = None) -> int:
+    """
+    Removes the least recently used archives until the cache fits into ``max_bytes``
+    (``DOCUMENTATION_BUNDLE_CACHE_MAX_BYTES`` by default), along with unfinished
+    archives abandoned by killed workers. Returns the number of archives removed.
+    """
+    if max_bytes is None:
+        max_bytes = project_settings.DOCUMENTATION_BUNDLE_CACHE_MAX_BYTES
+
+    root = documentation_bundle_root()
+    if not root.is_dir():
+        return 0
+
+    now = time.time()
+    bundles: list[tuple[float, int, Path]] = []
+
+    for entry in os.scandir(root):
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+
+        if entry.name.startswith("."):
+            if now - stat.st_mtime > STALE_TEMP_AGE:
+                Path(entry.path).unlink(missing_ok=True)
+        elif entry.name.endswith(".zip"):
+            bundles.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+
+    total = sum(size for _mtime, size, _path in bundles)
+    removed = 0
+
+    for _mtime, size, path in sorted(bundles):
+        if total <= max_bytes:
+            break
+
+        _remove_bundle(path)
+        total -= size
+        removed += 1
+
+    return removed
+
+
+def purge_documentation_bundles(document_id: int | None = None) -> int:
+    """
+    Removes the cached archives that contain the given document, or all of them.
+    Returns the number of archives removed.
+    """
+    root = documentation_bundle_root()
+    if not root.is_dir():
+        return 0
+
+    removed = 0
+
+    for ids_path in root.glob("*.json"):
+        try:
+            ids = json.loads(ids_path.read_text())
+        except (OSError, ValueError):
+            ids = None
+
+        if document_id is None or ids is None or document_id in ids:
+            _remove_bundle(ids_path.with_suffix(".zip"))
+            removed += 1
+
+    return removed
+
+
+def _purge_on_change(sender: Any, instance: Documentation, **kwargs: Any) -> None:
+    run_in_background(purge_documentation_bundles, instance.pk)
+
+
+def register_documentation_bundle_hooks() -> None:
+    """
+    Drops cached archives when a document they contain is changed or deleted.
+    """
+    post_save.connect(
+        _purge_on_change,
+        sender=Documentation,
+        dispatch_uid="documentation_bundles_save",
+    )
+    post_delete.connect(
+        _purge_on_change,
+        sender=Documentation,
+        dispatch_uid="documentation_bundles_delete",
+    )
@@ -1,18 +1,45 @@
+import io
 import os
+import time
 import zipfile
-from io import BytesIO
+from collections.abc import Iterator
+from typing import Any
 
 from django.db.models.fields.files import FieldFile
 from django.http import Http404
 
 from common.models import Documentation
 
-
-def get_documentation_file_parts(doc: Documentation) -> tuple[FieldFile, str]:
+ZIP_CHUNK_SIZE = 64 * 1024
+
+# Formats that are compressed already and gain nothing from DEFLATE.
+COMPRESSED_EXTENSIONS = frozenset(
+    {
+        ".pdf",
+        ".zip",
+        ".gz",
+        ".7z",
+        ".rar",
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".webp",
+        ".gif",
+        ".docx",
+        ".xlsx",
+        ".pptx",
+        ".odt",
+        ".ods",
+        ".mp4",
+    }
+)
+
+
+def get_documentation_file(doc: Documentation) -> FieldFile:
     if not doc.file:
         raise Http404("Файл не найден")
 
-    return doc.file.open("rb"), os.path.basename(doc.file.name)
+    return doc.file
 
 
 def get_ordered_documents(ids: list[int]) -> list[Documentation]:
@@ -27,30 +54,88 @@ def get_ordered_documents(ids: list[int]) -> list[Documentation]:
     return ordered_documents
 
 
-def build_documents_zip(ids: list[int]) -> BytesIO:
-    ordered_documents = get_ordered_documents(ids)
-    zip_buffer = BytesIO()
+class _ZipStream(io.RawIOBase):
+    """
+    A non-seekable sink for ``zipfile.ZipFile`` whose output is taken away with
+    ``drain`` as it is produced.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _archive_names(
+    documents: list[Documentation],
+) -> Iterator[tuple[Documentation, str]]:
+    used_names: set[str] = set()
+
+    for doc in documents:
+        if not doc.file:
+            continue
+
+        original_name = os.path.basename(doc.file.name)
+        name, ext = os.path.splitext(original_name)
+
+        safe_name = original_name
+        counter = 1
+        while safe_name in used_names:
+            safe_name = f"{name}_{counter}{ext}"
+            counter += 1
+
+        used_names.add(safe_name)
+        yield doc, safe_name
+
+
+def stream_documents_zip(documents: list[Documentation]) -> Iterator[bytes]:
+    """
+    Yields the ZIP archive of ``documents`` chunk by chunk (see ``build_documents_zip``).
+    """
+    sink = _ZipStream()
 
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        used_names: set[str] = set()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for doc, safe_name in _archive_names(documents):
+            info = zipfile.ZipInfo(safe_name, date_time=time.localtime()[:6])
+            info.external_attr = 0o600 << 16
+            # A known size lets zipfile switch the entry to ZIP64 when needed.
+            info.file_size = doc.file.size
+            info.compress_type = (
+                zipfile.ZIP_STORED
+                if os.path.splitext(safe_name)[1].lower() in COMPRESSED_EXTENSIONS
+                else zipfile.ZIP_DEFLATED
+            )
 
-        for doc in ordered_documents:
-            if not doc.file:
-                continue
+            with doc.file.open("rb") as source, zip_file.open(info, "w") as entry:
+                for chunk in source.chunks(ZIP_CHUNK_SIZE):
+                    entry.write(chunk)
+                    if data := sink.drain():
+                        yield data
 
-            original_name = os.path.basename(doc.file.name)
-            name, ext = os.path.splitext(original_name)
+            if data := sink.drain():
+                yield data
 
-            safe_name = original_name
-            counter = 1
-            while safe_name in used_names:
-                safe_name = f"{name}_{counter}{ext}"
-                counter += 1
+    yield sink.drain()
 
-            used_names.add(safe_name)
 
-            with doc.file.open("rb") as f:
-                zip_file.writestr(safe_name, f.read())
+def build_documents_zip(ids: list[int]) -> Iterator[bytes]:
+    """
+    Returns the ZIP archive of the given documents as an iterator of chunks.
 
-    zip_buffer.seek(0)
-    return zip_buffer
+    Entries are read from storage and written out chunk by chunk, so memory use does
+    not depend on the size of the bundle; ZIP64 is used for entries and archives
+    past the 4 GB limits. Already-compressed files are stored rather than deflated.
+    ``Http404`` is raised right away if none of the documents exist.
+    """
+    return stream_documents_zip(get_ordered_documents(ids))
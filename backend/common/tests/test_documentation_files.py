@@ -0,0 +1,220 @@
+import os
+import tracemalloc
+import zipfile
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from common.models import Documentation
+from common.routes import DocumentationRoutes
+from common.services.documentation_bundles import (
+    documentation_bundle_root,
+    evict_documentation_bundles,
+    purge_documentation_bundles,
+)
+from common.services.documentation_files import build_documents_zip
+from core.tests.utils import TestLoggerMixin
+
+
+def make_documentation(name: str, content: bytes) -> Documentation:
+    return Documentation.objects.create(
+        title=name, file=SimpleUploadedFile(name, content)
+    )
+
+
+@pytest.mark.django_db
+class TestDocumentationBulkDownload(APITestCase, TestLoggerMixin):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_superuser(
+            username="docs_user",
+            email="docs_user@example.com",
+            password="test_password",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse(f"common:{DocumentationRoutes.DOWNLOAD_ZIP.name}")
+        purge_documentation_bundles()
+
+    def test_zip_is_streamed(self) -> None:
+        self._logger_header("TEST: bulk download streamed as ZIP")
+        pdf = make_documentation("passport.pdf", b"%PDF-1.7 " + os.urandom(4096))
+        same_name = make_documentation("passport.pdf", b"%PDF-1.7 second")
+        text = make_documentation("readme.txt", b"text " * 1000)
+
+        response = self.client.post(
+            self.url, {"ids": [pdf.pk, same_name.pk, text.pk]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        assert isinstance(response, StreamingHttpResponse)
+        self.assertEqual(response["Content-Type"], "application/zip")
+
+        archive = zipfile.ZipFile(BytesIO(b"".join(response.streaming_content)))
+        infos = {info.filename: info for info in archive.infolist()}
+
+        self.assertEqual(len(infos), 3)
+        self.assertEqual(
+            infos[os.path.basename(pdf.file.name)].compress_type, zipfile.ZIP_STORED
+        )
+        self.assertEqual(
+            infos[os.path.basename(text.file.name)].compress_type, zipfile.ZIP_DEFLATED
+        )
+        self.assertEqual(
+            archive.read(os.path.basename(text.file.name)), b"text " * 1000
+        )
+        self.assertIsNone(archive.testzip())
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ PDFs stored, text deflated, archive valid"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_unknown_ids_return_404(self) -> None:
+        self._logger_header("TEST: bulk download of missing documents")
+
+        response = self.client.post(self.url, {"ids": [999999]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ 404 before the stream starts"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_memory_does_not_grow_with_bundle(self) -> None:
+        self._logger_header("TEST: bundle built in constant memory")
+        ids = [
+            make_documentation(f"scan_{i}.pdf", os.urandom(4 * 1024 * 1024)).pk
+            for i in range(4)
+        ]
+
+        tracemalloc.start()
+        size = sum(len(chunk) for chunk in build_documents_zip(ids))
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.assertGreater(size, 16 * 1024 * 1024)
+        self.assertLess(peak, 1024 * 1024)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            f"✓ 16 MB bundle with a {peak // 1024} KiB peak"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_large_entries_use_zip64(self) -> None:
+        self._logger_header("TEST: ZIP64 entries")
+        doc = make_documentation("big.bin", os.urandom(64 * 1024))
+
+        with patch("zipfile.ZIP64_LIMIT", 32 * 1024):
+            content = b"".join(build_documents_zip([doc.pk]))
+            archive = zipfile.ZipFile(BytesIO(content))
+            info = archive.infolist()[0]
+
+            self.assertGreaterEqual(info.extract_version, zipfile.ZIP64_VERSION)
+            self.assertIsNone(archive.testzip())
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Entries past the ZIP64 limit are written as ZIP64"
+            f"{self.COLOR['END']}"
+        )
+
+    def _download(self, ids: list[int]) -> bytes:
+        response = self.client.post(self.url, {"ids": ids}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        assert isinstance(response, StreamingHttpResponse)
+        return b"".join(response.streaming_content)
+
+    def test_bundle_served_from_cache(self) -> None:
+        self._logger_header("TEST: repeated bundle served from cache")
+        first = make_documentation("first.pdf", b"%PDF-1.7 first")
+        second = make_documentation("second.pdf", b"%PDF-1.7 second")
+
+        built = self._download([second.pk, first.pk])
+
+        with patch(
+            "common.services.documentation_bundles.stream_documents_zip"
+        ) as mock_stream:
+            cached = self._download([first.pk, second.pk])
+
+        mock_stream.assert_not_called()
+        self.assertEqual(cached, built)
+        self.assertEqual(
+            zipfile.ZipFile(BytesIO(built)).namelist(), ["first.pdf", "second.pdf"]
+        )
+        self.assertEqual(len(list(documentation_bundle_root().glob("*.zip"))), 1)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Same document set in any order reuses the same, id-ordered archive"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_changed_document_invalidates_bundle(self) -> None:
+        self._logger_header("TEST: changed document drops its bundles")
+        first = make_documentation("first.pdf", b"%PDF-1.7 first")
+        other = make_documentation("other.pdf", b"%PDF-1.7 other")
+
+        self._download([first.pk])
+        self._download([other.pk])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.file = SimpleUploadedFile("first.pdf", b"%PDF-1.7 replaced")
+            first.save()
+
+        self.assertEqual(len(list(documentation_bundle_root().glob("*.zip"))), 1)
+
+        archive = zipfile.ZipFile(BytesIO(self._download([first.pk])))
+        self.assertEqual(archive.read(archive.namelist()[0]), b"%PDF-1.7 replaced")
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Only bundles with the changed document are removed"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_least_recently_used_bundles_evicted(self) -> None:
+        self._logger_header("TEST: LRU eviction")
+        docs = [
+            make_documentation(f"doc_{i}.pdf", os.urandom(10 * 1024)) for i in range(3)
+        ]
+
+        for i, doc in enumerate(docs):
+            self._download([doc.pk])
+            bundle = next(
+                path
+                for path in documentation_bundle_root().glob("*.zip")
+                if path.stat().st_mtime > 10**6
+            )
+            os.utime(bundle, (1000 + i, 1000 + i))
+
+        # A cache hit makes the oldest bundle the most recently used.
+        self._download([docs[0].pk])
+
+        self.assertEqual(evict_documentation_bundles(max_bytes=25 * 1024), 1)
+
+        with patch(
+            "common.services.documentation_bundles.stream_documents_zip",
+            return_value=iter([b""]),
+        ) as mock_stream:
+            self._download([docs[0].pk])
+            self._download([docs[2].pk])
+            mock_stream.assert_not_called()
+
+            self._download([docs[1].pk])
+            mock_stream.assert_called_once()
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Least recently used bundle removed first"
+            f"{self.COLOR['END']}"
+        )
@@ -1,9 +1,16 @@
 from typing import Any
 
+from asgiref.sync import sync_to_async
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.auth.models import AnonymousUser
-from django.http import FileResponse, HttpRequest, HttpResponse
-from django.shortcuts import get_object_or_404, render
+from django.http import (
+    FileResponse,
+    HttpRequest,
+    HttpResponse,
+    StreamingHttpResponse,
+)
+from django.http.response import HttpResponseBase
+from django.shortcuts import aget_object_or_404, render
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics
 from rest_framework.generics import RetrieveAPIView
@@ -16,16 +23,23 @@ from common.serializers import (
     DocumentationBulkDownloadRequestSerializer,
     DocumentationSerializer,
 )
+from common.services.documentation_bundles import (
+    documentation_bundle_key,
+    open_cached_bundle,
+    stream_and_cache_bundle,
+)
 from common.services.documentation_files import (
-    build_documents_zip,
-    get_documentation_file_parts,
+    get_documentation_file,
+    get_ordered_documents,
 )
+from core.api.mixins import AsyncAPIViewMixin
 from core.openapi.base_views import (
     BaseCreateAPIView,
     BaseGenericAPIView,
     BaseListAPIView,
 )
 from core.services.docs_index import build_docs_index_sections
+from core.services.file_responses import serve_file, streaming_content
 
 from .models import Documentation
 
@@ -59,7 +73,7 @@ class DocumentsListAPIView(BaseListAPIView, generics.ListAPIView):
     serializer_class = DocumentationSerializer
 
 
-class DocumentationDetailView(BaseGenericAPIView, APIView):
+class DocumentationDetailView(AsyncAPIViewMixin, BaseGenericAPIView, APIView):
     """
     View to serve a documentation file inline.
     """
@@ -68,14 +82,18 @@ class DocumentationDetailView(BaseGenericAPIView, APIView):
     schema_tags = ["Documentation"]
     read_serializer_class = DocumentationSerializer
 
-    def get(self, request: HttpRequest, pk: int) -> FileResponse:
-        doc = get_object_or_404(Documentation, pk=pk)
-        file_obj, _filename = get_documentation_file_parts(doc)
+    queryset = Documentation.objects.all()
+    serializer_class = DocumentationSerializer
+
+    async def get(self, request: HttpRequest, pk: int) -> HttpResponseBase:
+        doc = await aget_object_or_404(Documentation, pk=pk)
 
-        return FileResponse(file_obj, as_attachment=False)
+        return await sync_to_async(serve_file)(
+            request, get_documentation_file(doc), as_attachment=False
+        )
 
 
-class DocumentationDownloadView(BaseGenericAPIView, APIView):
+class DocumentationDownloadView(AsyncAPIViewMixin, BaseGenericAPIView, APIView):
     """
     View to download a documentation file.
     """
@@ -84,18 +102,20 @@ class DocumentationDownloadView(BaseGenericAPIView, APIView):
     schema_tags = ["Documentation"]
     read_serializer_class = DocumentationSerializer
 
-    def get(self, request: HttpRequest, pk: int) -> FileResponse:
-        doc = get_object_or_404(Documentation, pk=pk)
-        file_obj, filename = get_documentation_file_parts(doc)
+    queryset = Documentation.objects.all()
+    serializer_class = DocumentationSerializer
+
+    async def get(self, request: HttpRequest, pk: int) -> HttpResponseBase:
+        doc = await aget_object_or_404(Documentation, pk=pk)
 
-        return FileResponse(
-            file_obj,
-            as_attachment=True,
-            filename=filename,
+        return await sync_to_async(serve_file)(
+            request, get_documentation_file(doc), as_attachment=True
         )
 
 
-class DocumentationBulkDownloadView(BaseCreateAPIView, generics.GenericAPIView):
+class DocumentationBulkDownloadView(
+    AsyncAPIViewMixin, BaseCreateAPIView, generics.GenericAPIView
+):
     """
     View to serve multiple documentation files as a zip archive.
     """
@@ -104,16 +124,37 @@ class DocumentationBulkDownloadView(BaseCreateAPIView, generics.GenericAPIView):
     schema_tags = ["Documentation"]
     read_serializer_class = DocumentationBulkDownloadRequestSerializer
 
+    queryset = Documentation.objects.all()
     serializer_class = DocumentationBulkDownloadRequestSerializer
 
-    def post(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:  # type: ignore[override]
+    def _bundle(self, request: Request) -> tuple[list[Documentation], str, Any]:
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        ids = serializer.validated_data["ids"]
-        zip_buffer = build_documents_zip(ids)
-
-        response = HttpResponse(zip_buffer.getvalue(), content_type="application/zip")
+        documents = get_ordered_documents(serializer.validated_data["ids"])
+        key = documentation_bundle_key(documents)
+
+        return documents, key, open_cached_bundle(key)
+
+    async def post(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponseBase:  # type: ignore[override]
+        documents, key, cached = await sync_to_async(self._bundle)(request)
+
+        if cached is not None:
+            cached_response = FileResponse(
+                cached,
+                content_type="application/zip",
+                as_attachment=True,
+                filename="documents.zip",
+            )
+            cached_response.streaming_content = streaming_content(
+                request, cached_response.streaming_content
+            )
+            return cached_response
+
+        response = StreamingHttpResponse(
+            streaming_content(request, stream_and_cache_bundle(key, documents)),
+            content_type="application/zip",
+        )
         response["Content-Disposition"] = 'attachment; filename="documents.zip"'
         return response
 
@@ -0,0 +1,42 @@
+from django.contrib import admin
+from django.http import HttpRequest
+
+from core.models import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """
+    Read-only list of the statements captured with ``SLOW_QUERY_CAPTURE_MS``.
+    """
+
+    list_display = (
+        "created_at",
+        "duration_ms",
+        "resource",
+        "method",
+        "path",
+        "database",
+    )
+    list_filter = ("resource", "database")
+    search_fields = ("sql", "path")
+    fields = (
+        "created_at",
+        "duration_ms",
+        "database",
+        "resource",
+        "method",
+        "path",
+        "sql",
+        "plan",
+        "stack",
+    )
+    readonly_fields = fields
+
+    def has_add_permission(self, request: HttpRequest) -> bool:
+        return False
+
+    def has_change_permission(
+        self, request: HttpRequest, obj: SlowQuery | None = None
+    ) -> bool:
+        return False
@@ -222,3 +222,9 @@ class AntivirusUnavailableError(exceptions.APIException):
     status_code = 503
     default_detail = "Антивирусная проверка временно недоступна."
     default_code = "antivirus_unavailable"
+
+
+class FileNotScannedError(exceptions.APIException):
+    status_code = 409
+    default_detail = "Файл ещё проходит антивирусную проверку."
+    default_code = "file_not_scanned"
@@ -0,0 +1,51 @@
+from typing import Any
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import serializers
+
+
+@extend_schema_field(OpenApiTypes.OBJECT)
+class ImageVariantsField(serializers.Field):
+    """
+    Read-only field exposing the generated variants of an image field as URLs.
+
+    Renders ``{variant: {format: url}}`` (for example ``thumbnail.webp``), or None
+    while the variants of the current image have not been generated yet, in which
+    case clients fall back to the original image URL.
+
+    Attributes:
+        image_field: The model image field the variants were generated from.
+    """
+
+    def __init__(self, *, image_field: str, **kwargs: Any) -> None:
+        self.image_field = image_field
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance: Any) -> Any:
+        image = getattr(instance, self.image_field)
+        variants = super().get_attribute(instance) or {}
+
+        if not image or variants.get("source") != image.name:
+            return None
+
+        return image.storage, variants
+
+    def to_representation(self, value: Any) -> dict[str, dict[str, str]] | None:
+        storage, variants = value
+        request = self.context.get("request")
+
+        result: dict[str, dict[str, str]] = {}
+        for variant, formats in variants.items():
+            if variant == "source":
+                continue
+
+            result[variant] = {}
+            for image_format, name in formats.items():
+                url = storage.url(name)
+                result[variant][image_format] = (
+                    request.build_absolute_uri(url) if request else url
+                )
+
+        return result or None
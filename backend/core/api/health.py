@@ -1,33 +1,31 @@
-import logging
-
-from django.db import connection
-from django.http import JsonResponse
+from django.http import HttpRequest, JsonResponse
 from django.views.decorators.http import require_GET
 
-logger = logging.getLogger(__name__)
+from core.services.health import readiness
 
 
 @require_GET
-def health_check(request):
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
+async def liveness_check(request: HttpRequest) -> JsonResponse:
+    """
+    The process is up and serving requests; no dependency is checked, so a slow
+    database or ClamAV never gets a healthy worker restarted.
+    """
+    return JsonResponse({"status": "ok"})
 
-        return JsonResponse(
-            {
-                "status": "ok",
-                "database": "ok",
-            }
-        )
 
-    except Exception:
-        logger.exception("Health check failed")
+@require_GET
+async def readiness_check(request: HttpRequest) -> JsonResponse:
+    """
+    Whether the database, ClamAV, the media volume and the cache are usable, with
+    the latency of each check. Results are reused for
+    ``HEALTH_CHECK_CACHE_SECONDS``.
+    """
+    ready, results = await readiness()
 
-        return JsonResponse(
-            {
-                "status": "error",
-                "database": "error",
-            },
-            status=503,
-        )
\ No newline at end of file
+    return JsonResponse(
+        {
+            "status": "ok" if ready else "error",
+            "checks": {name: result.as_dict() for name, result in results.items()},
+        },
+        status=200 if ready else 503,
+    )
@@ -0,0 +1,16 @@
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.http import require_GET
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+from core.services.metrics import metrics_registry
+
+
+@require_GET
+def metrics(request: HttpRequest) -> HttpResponse:
+    """
+    Prometheus text exposition of the metrics of all worker processes. Served on
+    the backend port only; nginx does not proxy it.
+    """
+    return HttpResponse(
+        generate_latest(metrics_registry()), content_type=CONTENT_TYPE_LATEST
+    )
@@ -1,7 +1,19 @@
 from typing import Any, Protocol
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
 from rest_framework.response import Response
 
+from core.security.upload_handlers import (
+    UploadRejectedError,
+    install_scanning_upload_handler,
+)
+from core.services.request_timing import timed_function
+
 
 class APIViewProtocol(Protocol):
     def get_object(self) -> Any: ...
@@ -24,4 +36,94 @@ class SoftDeleteResponseMixin:
         self.perform_destroy(instance)
 
         serializer = self.get_serializer(instance)  # type: ignore
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class TimedSerializerMixin:
+    """
+    Adds the time the view's serializers spend building response data to the
+    ``serialize`` phase of the request timings.
+    """
+
+    def get_serializer(self, *args: Any, **kwargs: Any) -> Any:
+        serializer = super().get_serializer(*args, **kwargs)  # type: ignore[misc]
+        # Only the outermost serializer is wrapped, so nested fields are not counted
+        # twice.
+        serializer.to_representation = timed_function("serialize")(
+            serializer.to_representation
+        )
+        return serializer
+
+
+class ScanningUploadMixin:
+    """
+    Receives multipart files with ``ScanningUploadHandler``, so they are hashed,
+    size-checked and scanned by ClamAV in the single pass that reads them from the
+    client. A refused upload is answered like a validation error of its field.
+
+    Attributes:
+        upload_max_size: Largest accepted file in bytes, ``None`` for no limit.
+    """
+
+    upload_max_size: int | None = None
+
+    def initialize_request(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> Request:
+        install_scanning_upload_handler(request, max_size=self.upload_max_size)
+        return super().initialize_request(request, *args, **kwargs)  # type: ignore[misc]
+
+    def handle_exception(self, exc: Exception) -> Response:
+        if isinstance(exc, UploadRejectedError):
+            exc = ValidationError(
+                {exc.field_name: [exc.message]} if exc.field_name else [exc.message]
+            )
+
+        return super().handle_exception(exc)  # type: ignore[misc]
+
+
+class AsyncAPIViewMixin:
+    """
+    Lets a DRF view define ``async def`` handlers, which run on the event loop
+    under ASGI, so a request waiting on files or ClamAV does not hold a thread.
+
+    Authentication, permissions, throttling and exception handling are DRF's own
+    and, like every ORM call of the handlers, run through ``sync_to_async``. Under
+    WSGI Django runs the async view in an event loop of its own.
+    """
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        if not self.view_is_async:  # type: ignore[attr-defined]
+            return super().dispatch(request, *args, **kwargs)  # type: ignore[misc]
+
+        return self._async_dispatch(request, *args, **kwargs)
+
+    async def _async_dispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        view: Any = self
+        view.args = args
+        view.kwargs = kwargs
+        drf_request = view.initialize_request(request, *args, **kwargs)
+        view.request = drf_request
+        view.headers = view.default_response_headers
+
+        try:
+            await sync_to_async(view.initial)(drf_request, *args, **kwargs)
+
+            method = drf_request.method.lower()
+            handler = (
+                getattr(view, method, view.http_method_not_allowed)
+                if method in view.http_method_names
+                else view.http_method_not_allowed
+            )
+
+            if iscoroutinefunction(handler):
+                response = await handler(drf_request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(drf_request, *args, **kwargs)
+        except Exception as exc:
+            response = await sync_to_async(view.handle_exception)(exc)
+
+        view.response = view.finalize_response(drf_request, response, *args, **kwargs)
+        return view.response
@@ -0,0 +1,21 @@
+from typing import Any, Mapping
+
+from rest_framework.renderers import JSONRenderer
+
+from core.services.request_timing import timed
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` that adds its time to the ``render`` phase of the request
+    timings.
+    """
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        with timed("render"):
+            return super().render(data, accepted_media_type, renderer_context)
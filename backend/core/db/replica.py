@@ -0,0 +1,159 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.http import HttpRequest, HttpResponse
+
+from app_settings import project_settings
+
+logger = logging.getLogger(__name__)
+
+REPLICA_DB_ALIAS = "replica"
+
+# Unix time until which a client reads from the primary; set after it writes.
+PIN_COOKIE = "pin_primary"
+PIN_HEADER = "X-Pin-Primary"
+
+_lock = threading.Lock()
+_replica_down_until = 0.0
+
+
+@dataclass
+class ReplicaReads:
+    """
+    Routing state of the current request: whether its reads may go to the replica,
+    whether one did, and whether the request wrote anything.
+    """
+
+    enabled: bool = False
+    used: bool = False
+    wrote: bool = False
+
+
+_state: ContextVar[ReplicaReads | None] = ContextVar("replica_reads", default=None)
+
+
+def replica_configured() -> bool:
+    return settings.DATABASE_REPLICA_READS and REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def replica_available() -> bool:
+    return time.monotonic() >= _replica_down_until
+
+
+def mark_replica_unavailable() -> None:
+    """
+    Sends reads to the primary for ``DB_REPLICA_RETRY_SECONDS``, after which the
+    replica is tried again.
+    """
+    global _replica_down_until
+
+    with _lock:
+        _replica_down_until = (
+            time.monotonic() + project_settings.DB_REPLICA_RETRY_SECONDS
+        )
+    connections[REPLICA_DB_ALIAS].close()
+    logger.warning(
+        "Database replica unavailable, reading from the primary for %s s",
+        project_settings.DB_REPLICA_RETRY_SECONDS,
+    )
+
+
+def reset_replica_health() -> None:
+    global _replica_down_until
+
+    with _lock:
+        _replica_down_until = 0.0
+
+
+@contextmanager
+def replica_reads(*, enabled: bool) -> Iterator[ReplicaReads]:
+    """
+    Routes the reads made inside the block to the replica if ``enabled``. Code
+    outside such a block, such as background tasks and management commands, always
+    reads from the primary.
+    """
+    state = ReplicaReads(enabled=enabled)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def primary_pinned(request: HttpRequest) -> bool:
+    """
+    Whether the client wrote within the last ``DB_REPLICA_PIN_SECONDS``, going by the
+    pin cookie or, for clients without cookies, the pin header.
+    """
+    value = request.headers.get(PIN_HEADER) or request.COOKIES.get(PIN_COOKIE)
+    if not value:
+        return False
+
+    try:
+        pinned_until = float(value)
+    except ValueError:
+        return False
+
+    now = time.time()
+    # Values further ahead than one window (rounded up) are not ours; ignore them.
+    return now < pinned_until <= now + project_settings.DB_REPLICA_PIN_SECONDS + 1
+
+
+def pin_primary(response: HttpResponse) -> None:
+    """
+    Pins the client to the primary for ``DB_REPLICA_PIN_SECONDS``, long enough for
+    the replica to catch up with its write.
+    """
+    window = project_settings.DB_REPLICA_PIN_SECONDS
+    pinned_until = str(int(time.time()) + window + 1)
+
+    response[PIN_HEADER] = pinned_until
+    response.set_cookie(
+        PIN_COOKIE,
+        pinned_until,
+        max_age=window + 1,
+        httponly=True,
+        samesite="Lax",
+        secure=not settings.DEBUG,
+    )
+
+
+class ReplicaRouter:
+    """
+    Sends reads made within ``replica_reads(enabled=True)`` to the ``replica``
+    database, unless the request has written, a transaction is open on the primary or
+    the replica recently failed. Writes always go to the primary.
+    """
+
+    def db_for_read(self, model: Any, **hints: Any) -> str | None:
+        state = _state.get()
+        if state is None or not state.enabled or not replica_configured():
+            return DEFAULT_DB_ALIAS
+
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block or not replica_available():
+            return DEFAULT_DB_ALIAS
+
+        state.used = True
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model: Any, **hints: Any) -> str | None:
+        state = _state.get()
+        if state is not None:
+            # Later reads of this request must see the write.
+            state.enabled = False
+            state.wrote = True
+
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Any, obj2: Any, **hints: Any) -> bool | None:
+        aliases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from io import BytesIO
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from core.security.clamav import AsyncClamAVClient, ClamAVClient
+from core.security.fake_clamd import FakeClamd
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure ClamAV scan throughput and latency with one connection per scan, "
+        "with pooled IDSESSION connections, and with the asyncio client running "
+        "as many scans at once on one event loop. Runs against an in-process fake "
+        "clamd unless --host is given."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--scans", type=int, default=500)
+        parser.add_argument("--size", type=int, default=256, help="File size in KiB.")
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.0,
+            help="Seconds the fake clamd spends on every scan.",
+        )
+        parser.add_argument("--host", help="Benchmark a real clamd instead.")
+        parser.add_argument("--port", type=int, default=3310)
+
+    def _run(
+        self, client: ClamAVClient, payload: bytes, options: dict[str, Any]
+    ) -> None:
+        def scan(_: int) -> float:
+            started = time.perf_counter()
+            client.instream(BytesIO(payload))
+            return time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+            latencies = sorted(executor.map(scan, range(options["scans"])))
+        elapsed = time.perf_counter() - started
+        client.close()
+
+        self._report(f"pool_size={client.pool_size}", latencies, elapsed, options)
+
+    def _run_async(
+        self, client: AsyncClamAVClient, payload: bytes, options: dict[str, Any]
+    ) -> None:
+        async def scan_all() -> list[float]:
+            # As many scans in flight as there are threads in the blocking runs.
+            slots = asyncio.Semaphore(options["threads"])
+
+            async def scan() -> float:
+                async with slots:
+                    started = time.perf_counter()
+                    await client.instream(BytesIO(payload))
+                    return time.perf_counter() - started
+
+            try:
+                return await asyncio.gather(
+                    *(scan() for _ in range(options["scans"]))
+                )
+            finally:
+                await client.close()
+
+        started = time.perf_counter()
+        latencies = sorted(asyncio.run(scan_all()))
+        elapsed = time.perf_counter() - started
+
+        self._report(f"asyncio pool_size={client.pool_size}", latencies, elapsed, options)
+
+    def _report(
+        self, label: str, latencies: list[float], elapsed: float, options: dict[str, Any]
+    ) -> None:
+        p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+        self.stdout.write(
+            f"  {label}: "
+            f"{options['scans'] / elapsed:.0f} scans/s, "
+            f"p50 {statistics.median(latencies) * 1000:.2f} ms, "
+            f"p95 {p95 * 1000:.2f} ms"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        payload = os.urandom(options["size"] * 1024)
+        server = (
+            nullcontext(None)
+            if options["host"]
+            else FakeClamd(latency=options["latency"])
+        )
+
+        with server as fake:
+            host, port = fake.address if fake else (options["host"], options["port"])
+            self.stdout.write(
+                f"{options['scans']} scans of {options['size']} KiB "
+                f"on {options['threads']} threads against {host}:{port}"
+            )
+
+            for pool_size in (0, options["threads"]):
+                connections = fake.connections if fake else 0
+                client = ClamAVClient(
+                    host, port, timeout=10, pool_size=pool_size, idle_timeout=20
+                )
+                self._run(client, payload, options)
+                self._report_connections(fake, connections)
+
+            connections = fake.connections if fake else 0
+            self._run_async(
+                AsyncClamAVClient(
+                    host,
+                    port,
+                    timeout=10,
+                    pool_size=options["threads"],
+                    idle_timeout=20,
+                ),
+                payload,
+                options,
+            )
+            self._report_connections(fake, connections)
+
+    def _report_connections(self, fake: FakeClamd | None, before: int) -> None:
+        if fake:
+            self.stdout.write(f"    connections opened: {fake.connections - before}")
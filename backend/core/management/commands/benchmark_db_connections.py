@@ -0,0 +1,86 @@
+import copy
+import statistics
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.utils import load_backend
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request database overhead with a new connection per "
+        "request (connect and TLS handshake every time), a persistent connection "
+        "and the psycopg pool, using the default database settings."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument(
+            "--queries", type=int, default=1, help="Queries per simulated request."
+        )
+
+    def _wrapper(self, mode: str) -> Any:
+        settings_dict = copy.deepcopy(connections.settings["default"])
+        options = settings_dict.setdefault("OPTIONS", {})
+        options.pop("pool", None)
+        settings_dict["CONN_MAX_AGE"] = 0
+
+        if mode == "persistent":
+            settings_dict["CONN_MAX_AGE"] = 600
+        elif mode == "pool":
+            options["pool"] = {"min_size": 1, "max_size": 1}
+
+        backend = load_backend(settings_dict["ENGINE"])
+        return backend.DatabaseWrapper(settings_dict, alias=f"benchmark_{mode}")
+
+    def _request(self, wrapper: Any, queries: int) -> float:
+        # What a request does: the first query connects (or checks a connection out
+        # of the pool) and request_finished closes or returns it.
+        started = time.perf_counter()
+        for _ in range(queries):
+            with wrapper.cursor() as cursor:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+        wrapper.close_if_unusable_or_obsolete()
+        return time.perf_counter() - started
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if connections["default"].vendor != "postgresql":
+            raise CommandError("The benchmark needs a PostgreSQL default database.")
+
+        settings_dict = connections.settings["default"]
+        self.stdout.write(
+            f"{options['requests']} requests x {options['queries']} queries against "
+            f"{settings_dict['HOST']}:{settings_dict['PORT'] or 5432} "
+            f"(sslmode={settings_dict['OPTIONS'].get('sslmode') or 'default'})"
+        )
+
+        baseline = None
+        for mode in ("connect", "persistent", "pool"):
+            wrapper = self._wrapper(mode)
+            try:
+                # Warm-up: opens the pool or the persistent connection.
+                self._request(wrapper, options["queries"])
+                latencies = sorted(
+                    self._request(wrapper, options["queries"])
+                    for _ in range(options["requests"])
+                )
+            finally:
+                wrapper.close()
+                if mode == "pool":
+                    wrapper.close_pool()
+
+            mean = statistics.fmean(latencies)
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            line = (
+                f"  {mode:<11} mean {mean * 1000:7.2f} ms, "
+                f"p50 {statistics.median(latencies) * 1000:7.2f} ms, "
+                f"p95 {p95 * 1000:7.2f} ms"
+            )
+            if baseline is None:
+                baseline = mean
+            else:
+                line += f", saves {(baseline - mean) * 1000:.2f} ms per request"
+            self.stdout.write(line)
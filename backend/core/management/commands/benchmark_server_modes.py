@@ -0,0 +1,199 @@
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from common.models import Documentation
+from common.routes import DocumentationRoutes
+
+SERVER_COMMANDS = {
+    "wsgi": ["backend.wsgi:application", "--worker-class", "sync"],
+    "asgi": [
+        "backend.asgi:application",
+        "--worker-class",
+        "uvicorn_worker.UvicornWorker",
+    ],
+}
+
+READ_SIZE = 64 * 1024
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare concurrent download throughput of gunicorn with sync workers "
+        "(WSGI) and with uvicorn workers (ASGI). Both servers are started on a free "
+        "local port with the same number of workers and serve a temporary "
+        "documentation file from Django, without nginx offloading."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--workers", type=int, default=3)
+        parser.add_argument("--clients", type=int, default=30)
+        parser.add_argument(
+            "--downloads", type=int, default=3, help="Downloads per client."
+        )
+        parser.add_argument("--size-kb", type=int, default=2048)
+        parser.add_argument(
+            "--client-kbps",
+            type=int,
+            default=4096,
+            help="Read rate of each client in KB/s, 0 for as fast as possible.",
+        )
+
+    def _free_port(self) -> int:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def _start(self, mode: str, port: int, workers: int) -> subprocess.Popen:
+        env = {**os.environ, "FILE_OFFLOAD_MODE": ""}
+        # Each run measures its own server; shared metric files would outlive it.
+        env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                *SERVER_COMMANDS[mode],
+                "--bind",
+                f"127.0.0.1:{port}",
+                "--workers",
+                str(workers),
+                "--log-level",
+                "warning",
+            ],
+            cwd=settings.BASE_DIR,
+            env=env,
+        )
+
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"The {mode} server exited on startup.")
+            try:
+                status, _seconds = self._get(port, reverse("health-live"), {}, 0)
+                if status == 200:
+                    return server
+            except OSError:
+                pass
+            time.sleep(0.2)
+
+        server.terminate()
+        raise CommandError(f"The {mode} server did not start in 30 s.")
+
+    def _get(
+        self, port: int, path: str, headers: dict[str, str], client_kbps: int
+    ) -> tuple[int, float]:
+        started = time.perf_counter()
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=300)
+        try:
+            # As forwarded by nginx, so SECURE_SSL_REDIRECT lets it through.
+            connection.request(
+                "GET", path, headers={"X-Forwarded-Proto": "https", **headers}
+            )
+            response = connection.getresponse()
+            while chunk := response.read(READ_SIZE):
+                # A client on a slow link takes this long to take the chunk.
+                if client_kbps:
+                    time.sleep(len(chunk) / (client_kbps * 1024))
+            return response.status, time.perf_counter() - started
+        finally:
+            connection.close()
+
+    def _run(
+        self, mode: str, path: str, headers: dict[str, str], options: dict
+    ) -> None:
+        port = self._free_port()
+        server = self._start(mode, port, options["workers"])
+
+        latencies: list[float] = []
+        failures = 0
+        lock = threading.Lock()
+
+        def client() -> None:
+            nonlocal failures
+            for _ in range(options["downloads"]):
+                try:
+                    status, seconds = self._get(
+                        port, path, headers, options["client_kbps"]
+                    )
+                except OSError:
+                    status, seconds = 0, 0.0
+                with lock:
+                    if status == 200:
+                        latencies.append(seconds)
+                    else:
+                        failures += 1
+
+        threads = [threading.Thread(target=client) for _ in range(options["clients"])]
+        try:
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        if not latencies:
+            raise CommandError(f"Every {mode} download failed.")
+
+        latencies.sort()
+        megabytes = len(latencies) * options["size_kb"] / 1024
+        p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+        self.stdout.write(
+            f"  {mode}  {len(latencies) / elapsed:6.2f} downloads/s, "
+            f"{megabytes / elapsed:7.2f} MB/s, "
+            f"p50 {statistics.median(latencies):6.2f} s, p95 {p95:6.2f} s"
+            + (f", {failures} failed" if failures else "")
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        user = (
+            get_user_model().objects.filter(is_superuser=True, is_active=True).first()
+        )
+        if user is None:
+            raise CommandError("The benchmark needs an active superuser.")
+
+        document = Documentation.objects.create(
+            title="benchmark_server_modes",
+            file=ContentFile(os.urandom(options["size_kb"] * 1024), "benchmark.bin"),
+        )
+        path = reverse(
+            f"common:{DocumentationRoutes.DOWNLOAD.name}", args=[document.pk]
+        )
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+        rate = (
+            f"{options['client_kbps']} KB/s each"
+            if options["client_kbps"]
+            else "unthrottled"
+        )
+        self.stdout.write(
+            f"{options['clients']} clients ({rate}) x {options['downloads']} downloads "
+            f"of {options['size_kb']} KB, {options['workers']} workers"
+        )
+
+        try:
+            for mode in SERVER_COMMANDS:
+                self._run(mode, path, headers, options)
+        finally:
+            # Blob storage files outlive their rows; these random bytes are not
+            # shared with any other row.
+            document.file.delete(save=False)
+            document.delete()
@@ -0,0 +1,146 @@
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from logistic.routes import CarrierRoutes
+
+# The Dockerfile command before gunicorn.conf.py: every worker loads the
+# application itself and nothing is warmed up.
+COMMAND_LINE = [
+    "backend.asgi:application",
+    "--worker-class",
+    "uvicorn_worker.UvicornWorker",
+    "--timeout",
+    "120",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure how long gunicorn takes to accept connections and to answer its "
+        "first API request, started with the former command-line options and with "
+        "gunicorn.conf.py (preloaded and warmed-up application)."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--runs", type=int, default=3)
+        parser.add_argument(
+            "--requests", type=int, default=20, help="Requests after the first one."
+        )
+
+    def _free_port(self) -> int:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    def _get(self, port: int, path: str, headers: dict[str, str]) -> float:
+        started = time.perf_counter()
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        try:
+            # As forwarded by nginx, so SECURE_SSL_REDIRECT lets it through.
+            connection.request(
+                "GET", path, headers={"X-Forwarded-Proto": "https", **headers}
+            )
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                raise CommandError(f"{path} answered {response.status}.")
+            return time.perf_counter() - started
+        finally:
+            connection.close()
+
+    def _run(
+        self, arguments: list[str], path: str, headers: dict[str, str], options: dict
+    ) -> tuple[float, float, float]:
+        port = self._free_port()
+        env = {**os.environ}
+        env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+        started = time.perf_counter()
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "gunicorn",
+                *arguments,
+                "--bind",
+                f"127.0.0.1:{port}",
+                "--workers",
+                str(options["workers"]),
+                "--log-level",
+                "warning",
+            ],
+            cwd=settings.BASE_DIR,
+            env=env,
+        )
+
+        try:
+            deadline = started + 60
+            while True:
+                if server.poll() is not None:
+                    raise CommandError("gunicorn exited on startup.")
+                try:
+                    socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                    break
+                except OSError:
+                    if time.perf_counter() > deadline:
+                        raise CommandError("gunicorn did not start in 60 s.")
+                    time.sleep(0.01)
+            listening = time.perf_counter() - started
+
+            first = self._get(port, path, headers)
+            later = statistics.median(
+                self._get(port, path, headers) for _ in range(options["requests"])
+            )
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+        return listening, first, later
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        user = (
+            get_user_model().objects.filter(is_superuser=True, is_active=True).first()
+        )
+        if user is None:
+            raise CommandError("The benchmark needs an active superuser.")
+
+        path = reverse(f"logistic:{CarrierRoutes.LIST_CREATE.name}")
+        headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+
+        self.stdout.write(
+            f"GET {path} with {options['workers']} workers, "
+            f"median of {options['runs']} runs"
+        )
+
+        with tempfile.NamedTemporaryFile(suffix=".py") as empty_config:
+            setups = {
+                "command line": ["--config", empty_config.name, *COMMAND_LINE],
+                "gunicorn.conf.py": ["--config", "gunicorn.conf.py"],
+            }
+
+            for name, arguments in setups.items():
+                runs = [
+                    self._run(arguments, path, headers, options)
+                    for _ in range(options["runs"])
+                ]
+                listening, first, later = (statistics.median(r) for r in zip(*runs))
+                self.stdout.write(
+                    f"  {name:<16} listening after {listening:5.2f} s, "
+                    f"first request {first * 1000:7.1f} ms, "
+                    f"later requests {later * 1000:5.1f} ms, "
+                    f"first response after {listening + first:5.2f} s"
+                )
@@ -0,0 +1,132 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from logistic.routes import CarrierRoutes
+
+URLS_MARKER = "-- URLconf --"
+
+# Run in a fresh interpreter, as a worker does on startup.
+PROBE = f"URLS_MARKER = {URLS_MARKER!r}\n" + """
+import json
+import os
+import sys
+import time
+
+started = time.perf_counter()
+import django
+
+django.setup()
+set_up = time.perf_counter()
+print(URLS_MARKER, file=sys.stderr, flush=True)
+
+from django.urls import get_resolver
+
+get_resolver().url_patterns
+urls_loaded = time.perf_counter()
+
+from django.test import Client
+
+response = Client().get(
+    os.environ["BENCHMARK_PATH"],
+    headers={"Authorization": os.environ["BENCHMARK_AUTHORIZATION"]},
+    secure=True,
+    SERVER_NAME="localhost",
+)
+answered = time.perf_counter()
+
+print(json.dumps({
+    "status": response.status_code,
+    "setup": set_up - started,
+    "urls": urls_loaded - set_up,
+    "first request": answered - urls_loaded,
+}))
+"""
+
+
+def url_import_times(report: str) -> dict[str, int]:
+    """
+    Cumulative time in microseconds of the modules first imported while the URLconf
+    loaded, from ``-X importtime`` output. Only top-level imports are kept, since
+    nested ones are part of their parent's time.
+
+    ``-X importtime`` does not list modules loaded with ``importlib.import_module``,
+    such as the URL modules themselves, only the modules they import.
+    """
+    times: dict[str, int] = {}
+    _setup, _marker, urls = report.partition(URLS_MARKER)
+    for line in urls.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _self, cumulative, module = line.removeprefix("import time:").split("|")
+        if not module.startswith("  "):
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure in fresh interpreters how long Django setup, the URLconf import "
+        "and the first API request take, and list the slowest modules imported by "
+        "the URLconf as reported by python -X importtime."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--runs", type=int, default=5)
+        parser.add_argument("--top", type=int, default=8)
+
+    def _probe(self, env: dict[str, str]) -> tuple[dict[str, float], dict[str, int]]:
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        if timings.pop("status") != 200:
+            raise CommandError("The first request failed.")
+        return timings, url_import_times(result.stderr)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        user = (
+            get_user_model().objects.filter(is_superuser=True, is_active=True).first()
+        )
+        if user is None:
+            raise CommandError("The benchmark needs an active superuser.")
+
+        env = {
+            **os.environ,
+            "BENCHMARK_PATH": reverse(f"logistic:{CarrierRoutes.LIST_CREATE.name}"),
+            "BENCHMARK_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}",
+        }
+        env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+        probes = [self._probe(env) for _ in range(options["runs"])]
+
+        self.stdout.write(f"Median of {options['runs']} fresh interpreters:")
+        for phase in probes[0][0]:
+            seconds = statistics.median(timings[phase] for timings, _ in probes)
+            self.stdout.write(f"  {phase:<14} {seconds * 1000:7.1f} ms")
+
+        modules = {
+            module: statistics.median(imports.get(module, 0) for _, imports in probes)
+            for module in probes[0][1]
+        }
+        self.stdout.write("Slowest imports while loading the URLconf (-X importtime):")
+        for module, microseconds in sorted(
+            modules.items(), key=lambda item: item[1], reverse=True
+        )[: options["top"]]:
+            self.stdout.write(f"  {module:<32} {microseconds / 1000:7.1f} ms")
@@ -0,0 +1,45 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from core.services.image_variants import (
+    generate_image_variants,
+    registered_image_variants,
+    variants_are_current,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate missing resized variants of product images and warehouse maps "
+        "(for example after a worker restart dropped queued tasks)."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate variants even if they are up to date.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        for registration in registered_image_variants():
+            model = registration.model
+            generated = 0
+
+            for instance in model._base_manager.iterator():
+                if not options["force"] and variants_are_current(instance):
+                    continue
+
+                generate_image_variants(
+                    model._meta.label,
+                    instance.pk,
+                    getattr(instance, registration.image_field).name or "",
+                )
+                generated += 1
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{model._meta.verbose_name_plural}: {generated} images processed."
+                )
+            )
@@ -0,0 +1,26 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from core.services.blob_storage import BLOB_GRACE_SECONDS, sweep_unreferenced_blobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete content-addressed media blobs (УПД, documentation) and files "
+        "stored there before, that no row refers to any more. Meant to run "
+        "periodically, e.g. from cron."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--grace",
+            type=int,
+            default=BLOB_GRACE_SECONDS,
+            help="Keep blobs written or reused within this many seconds.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        deleted = sweep_unreferenced_blobs(grace_seconds=options["grace"])
+
+        self.stdout.write(self.style.SUCCESS(f"Unreferenced blobs deleted: {deleted}."))
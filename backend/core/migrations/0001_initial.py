@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FileScanVerdict',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('upd_pdf', 'УПД')], max_length=20)),
+                ('sha256', models.CharField(max_length=64)),
+                ('signature_version', models.CharField(blank=True, max_length=255)),
+                ('is_clean', models.BooleanField()),
+                ('detail', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Результат проверки файла',
+                'verbose_name_plural': 'Результаты проверки файлов',
+                'constraints': [models.UniqueConstraint(fields=('kind', 'sha256', 'signature_version'), name='uniq_file_scan_verdict')],
+            },
+        ),
+    ]
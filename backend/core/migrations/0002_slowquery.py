@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-19 02:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('duration_ms', models.FloatField(verbose_name='Длительность, мс')),
+                ('database', models.CharField(max_length=50, verbose_name='База данных')),
+                ('resource', models.CharField(max_length=255, verbose_name='Ресурс')),
+                ('method', models.CharField(max_length=10, verbose_name='Метод')),
+                ('path', models.CharField(max_length=2048, verbose_name='Путь')),
+                ('sql', models.TextField(verbose_name='SQL')),
+                ('plan', models.TextField(blank=True, verbose_name='План')),
+                ('stack', models.TextField(blank=True, verbose_name='Стек')),
+            ],
+            options={
+                'verbose_name': 'Медленный запрос',
+                'verbose_name_plural': 'Медленные запросы',
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+    ]
@@ -1,7 +1,11 @@
 from .contact_info_mixin import ContactDetailsMixin
 from .active_mixin import ActiveMixin
+from .file_scan_verdict import FileScanVerdict
+from .slow_query import SlowQuery
 
 __all__ = [
     "ContactDetailsMixin",
     "ActiveMixin",
+    "FileScanVerdict",
+    "SlowQuery",
 ]
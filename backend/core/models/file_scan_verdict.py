@@ -0,0 +1,44 @@
+from django.db import models
+
+
+class FileScanVerdict(models.Model):
+    """
+    Remembers the outcome of checking a file, so identical uploads are not re-checked.
+
+    A verdict is only recorded after the file passed the structural validation of its
+    kind, so any verdict for a hash means the content is structurally valid. The
+    antivirus result is only reused with the ClamAV signature version it was
+    produced with.
+
+    Attributes:
+        kind: What the file was validated as (for example ``upd_pdf``).
+        sha256: Hex SHA-256 digest of the file content.
+        signature_version: The clamd ``VERSION`` response of the scan, or an empty
+            string if ClamAV was disabled.
+        is_clean: Whether the scan found no malware.
+        detail: The ClamAV response.
+        created_at: When the file was scanned.
+    """
+
+    class Kind(models.TextChoices):
+        UPD_PDF = "upd_pdf", "УПД"
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    sha256 = models.CharField(max_length=64)
+    signature_version = models.CharField(max_length=255, blank=True)
+    is_clean = models.BooleanField()
+    detail = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("kind", "sha256", "signature_version"),
+                name="uniq_file_scan_verdict",
+            )
+        ]
+        verbose_name = "Результат проверки файла"
+        verbose_name_plural = "Результаты проверки файлов"
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.sha256[:12]} ({'clean' if self.is_clean else 'infected'})"
@@ -0,0 +1,37 @@
+from django.db import models
+
+
+class SlowQuery(models.Model):
+    """
+    A statement that ran longer than ``SLOW_QUERY_CAPTURE_MS``, kept for finding
+    missing indexes. Only the newest ``SLOW_QUERY_BUFFER_SIZE`` rows are kept.
+
+    Attributes:
+        created_at: When the statement ran.
+        duration_ms: How long it took.
+        database: Alias of the database it ran on.
+        resource: ``resource_name`` of the view, or the URL name or path.
+        method: HTTP method of the request.
+        path: Path of the request.
+        sql: The statement with its parameters.
+        plan: Its ``EXPLAIN`` output, or the error explaining it failed with.
+        stack: The project frames of the Python stack that ran it.
+    """
+
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    duration_ms = models.FloatField(verbose_name="Длительность, мс")
+    database = models.CharField(max_length=50, verbose_name="База данных")
+    resource = models.CharField(max_length=255, verbose_name="Ресурс")
+    method = models.CharField(max_length=10, verbose_name="Метод")
+    path = models.CharField(max_length=2048, verbose_name="Путь")
+    sql = models.TextField(verbose_name="SQL")
+    plan = models.TextField(blank=True, verbose_name="План")
+    stack = models.TextField(blank=True, verbose_name="Стек")
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        verbose_name = "Медленный запрос"
+        verbose_name_plural = "Медленные запросы"
+
+    def __str__(self) -> str:
+        return f"{self.duration_ms:.0f} ms {self.resource}"
@@ -1,72 +1,106 @@
+import abc
 from typing import ClassVar, Any, Type, Sequence
 
 from drf_spectacular.utils import OpenApiParameter
 from rest_framework import generics, serializers
 
+from core.api.mixins import TimedSerializerMixin
 from core.openapi import ERRORS_DETAIL
 from core.openapi.schema_factories import list_create_schema, retrieve_update_destroy_schema, resources_schema, \
     update_patch_schema, create_schema, list_schema
+from core.services.request_timing import QueryBudget
 
 
-class BaseListCreateAPIView(generics.ListCreateAPIView):
+class LazySchemaMixin(abc.ABC):
+    """
+    Defers the view's drf-spectacular decorator, returned by ``schema_decorator``,
+    until an OpenAPI schema is generated, instead of building it whenever the
+    URLconf is imported. The schema views are only mounted with ``DEBUG``, so
+    workers in production never pay for it.
+
+    ``core.openapi.hooks.decorate_schema_views`` applies the decorator, once per
+    view class, to the views about to be documented.
+    """
+
+    # Set on each view class once its own decorator has been applied.
+    _schema_decorated: ClassVar[bool] = False
+
+    @classmethod
+    @abc.abstractmethod
+    def schema_decorator(cls) -> Any:
+        """
+        Returns the drf-spectacular decorator that documents the view.
+        """
+
+    @classmethod
+    def decorate_schema(cls) -> None:
+        if cls.__dict__.get("_schema_decorated"):
+            return
+
+        cls.schema_decorator()(cls)
+        cls._schema_decorated = True
+
+
+class BaseListCreateAPIView(LazySchemaMixin, TimedSerializerMixin, generics.ListCreateAPIView):
 
     resource_name: ClassVar[str] = ""
     schema_tags: ClassVar[list[str]] = []
+    query_budget: ClassVar[QueryBudget | None] = None
     read_serializer: Any
     write_serializer: Any
     errors_read: dict[int, Any]
     errors_write: dict[int, Any]
     query_parameters: ClassVar[list[OpenApiParameter]] = []
 
-
     read_serializer_class: ClassVar[Type[serializers.BaseSerializer]] = serializers.Serializer
     write_serializer_class: ClassVar[Type[serializers.BaseSerializer]] = serializers.Serializer
 
     @classmethod
-    def as_view(cls, **kwargs: dict) -> Any:
-        decorated = list_create_schema(
+    def schema_decorator(cls) -> Any:
+        return list_create_schema(
             resource=cls.resource_name,
             tags=cls.schema_tags,
             read_serializer=cls.read_serializer_class,
             write_serializer=cls.write_serializer_class,
             parameters=cls.query_parameters,
-        )(cls)
-        return super(BaseListCreateAPIView, decorated).as_view(**kwargs)
+        )
 
 
-class BaseRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class BaseRetrieveUpdateDestroyAPIView(LazySchemaMixin, TimedSerializerMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Base class that extends RetrieveUpdateDestroyAPIView to provide custom schema and serializer behavior.
 
     Attributes:
         resource_name: The name of the resource this view handles.
         schema_tags: List of tags used for schema organization and grouping.
+        query_budget: Statements a GET request may run, checked in tests and logged
+                      when exceeded.
         read_serializer_class: Serializer class used for reading resource data.
         write_serializer_class: Serializer class used for handling incoming
                                  request data. Typically used for validation.
 
     Methods:
-        as_view(**kwargs): Overrides the default as_view method to inject schema creation
-            logic and return a properly decorated view for the API endpoint.
+        schema_decorator(): Returns the schema decorator of the endpoint, applied
+            when an OpenAPI schema is generated (see ``LazySchemaMixin``).
     """
     resource_name: ClassVar[str] = ""
     schema_tags: ClassVar[list[str]] = []
+    query_budget: ClassVar[QueryBudget | None] = None
 
     read_serializer_class: ClassVar[Type[serializers.BaseSerializer]] = serializers.Serializer
     write_serializer_class: ClassVar[Type[serializers.BaseSerializer]] = serializers.Serializer
 
     @classmethod
-    def as_view(cls, **kwargs: Any) -> Any:
-        decorated = retrieve_update_destroy_schema(
+    def schema_decorator(cls) -> Any:
+        return retrieve_update_destroy_schema(
             resource=cls.resource_name,
             tags=cls.schema_tags,
             read_serializer=cls.read_serializer_class,
             request_serializer=cls.write_serializer_class,
-        )(cls)
+        )
 
-        return super(BaseRetrieveUpdateDestroyAPIView, decorated).as_view(**kwargs)
 
-class BaseGenericAPIView(generics.GenericAPIView):
+class BaseGenericAPIView(LazySchemaMixin, TimedSerializerMixin, generics.GenericAPIView):
     """
     Base class for a generic API view.
 
@@ -75,29 +109,31 @@ class BaseGenericAPIView(generics.GenericAPIView):
             of the resource. It is used for schema generation and resource identification.
         schema_tags (list[str]): A class-level list of strings representing schema
             tags associated with this API view for documentation purposes.
+        query_budget (QueryBudget | None): Statements a GET request may run, checked
+            in tests and logged when exceeded.
         read_serializer_class (Type[serializers.BaseSerializer]): A class-level
             serializer used for read operations within the API view.
 
     Methods:
-        as_view(**kwargs): Overrides the default as_view method to inject schema creation
-            logic and return a properly decorated view for the API endpoint.
+        schema_decorator(): Returns the schema decorator of the endpoint, applied
+            when an OpenAPI schema is generated (see ``LazySchemaMixin``).
     """
     resource_name: ClassVar[str] = ""
     schema_tags: ClassVar[list[str]] = []
+    query_budget: ClassVar[QueryBudget | None] = None
 
     read_serializer_class: ClassVar[Type[serializers.BaseSerializer]] = serializers.Serializer
 
     @classmethod
-    def as_view(cls, **kwargs: Any) -> Any:
-        decorated = resources_schema(
+    def schema_decorator(cls) -> Any:
+        return resources_schema(
             resource=cls.resource_name,
             tags=cls.schema_tags,
             read_serializer=cls.read_serializer_class,
-        )(cls)
+        )
 
-        return super(BaseGenericAPIView, decorated).as_view(**kwargs)
 
-class BaseUpdateGenericAPIView(generics.UpdateAPIView):
+class BaseUpdateGenericAPIView(LazySchemaMixin, TimedSerializerMixin, generics.UpdateAPIView):
     """
     BaseUpdateGenericAPIView is a generic view for handling update operations via PUT or PATCH requests.
 
@@ -113,26 +149,27 @@ class BaseUpdateGenericAPIView(generics.UpdateAPIView):
             Methods:
 
     Methods:
-        as_view(**kwargs): Overrides the default as_view method to inject schema creation
-            logic and return a properly decorated view for the API endpoint.
+        schema_decorator(): Returns the schema decorator of the endpoint, applied
+            when an OpenAPI schema is generated (see ``LazySchemaMixin``).
     """
     resource_name: ClassVar[str] = ""
     schema_tags: ClassVar[list[str]] = []
+    query_budget: ClassVar[QueryBudget | None] = None
     errors_read: dict[int, Any]
 
     update_serializer_class: ClassVar[Type[serializers.BaseSerializer]] = serializers.Serializer
 
     @classmethod
-    def as_view(cls, **kwargs: Any) -> Any:
-        decorated = update_patch_schema(
+    def schema_decorator(cls) -> Any:
+        return update_patch_schema(
             resource=cls.resource_name,
             tags=cls.schema_tags,
             serializer=cls.update_serializer_class,
             errors_read=cls.errors_read,
-        )(cls)
-        return super(BaseUpdateGenericAPIView, decorated).as_view(**kwargs)
+        )
 
-class BaseCreateAPIView(generics.CreateAPIView):
+
+class BaseCreateAPIView(LazySchemaMixin, TimedSerializerMixin, generics.CreateAPIView):
     """
     BaseCreateAPIView is a base class for creating API views in Django REST framework.
 
@@ -144,44 +181,44 @@ class BaseCreateAPIView(generics.CreateAPIView):
     Attributes:
         resource_name (str): The name of the API resource. Defaults to an empty string.
         schema_tags (list[str]): A list of tags used for API schema generation.
+        query_budget (QueryBudget | None): Statements a GET request may run, checked
+            in tests and logged when exceeded.
         read_serializer_class (Type[serializers.BaseSerializer]): The serializer class
             used for reading API responses. Defaults to `serializers.Serializer`.
 
     Methods:
-        as_view(**kwargs): Overrides the default as_view method to inject schema creation
-            logic and return a properly decorated view for the API endpoint.
+        schema_decorator(): Returns the schema decorator of the endpoint, applied
+            when an OpenAPI schema is generated (see ``LazySchemaMixin``).
     """
     resource_name: ClassVar[str] = ""
     schema_tags: ClassVar[list[str]] = []
+    query_budget: ClassVar[QueryBudget | None] = None
 
     read_serializer_class: ClassVar[Type[serializers.BaseSerializer]] = serializers.Serializer
 
     @classmethod
-    def as_view(cls, **kwargs: Any) -> Any:
-        decorated = create_schema(
+    def schema_decorator(cls) -> Any:
+        return create_schema(
             resource=cls.resource_name,
             tags=cls.schema_tags,
             read_serializer=cls.read_serializer_class,
-        )(cls)
-
-        return super(BaseCreateAPIView, decorated).as_view(**kwargs)
+        )
 
 
-class BaseListAPIView(generics.ListAPIView):
+class BaseListAPIView(LazySchemaMixin, TimedSerializerMixin, generics.ListAPIView):
     resource_name: ClassVar[str] = ""
     schema_tags: ClassVar[list[str]] = []
+    query_budget: ClassVar[QueryBudget | None] = None
     schema_parameters: ClassVar[Sequence[OpenApiParameter]] = ()
 
     read_serializer_class: ClassVar[Type[serializers.BaseSerializer]] = serializers.Serializer
 
     @classmethod
-    def as_view(cls, **kwargs: Any) -> Any:
-        decorated = list_schema(
+    def schema_decorator(cls) -> Any:
+        return list_schema(
             resource=cls.resource_name,
             tags=cls.schema_tags,
             read_serializer=cls.read_serializer_class,
             errors_read=ERRORS_DETAIL,
             parameters=list(cls.schema_parameters),
-        )(cls)
-
-        return super(BaseListAPIView, decorated).as_view(**kwargs)
+        )
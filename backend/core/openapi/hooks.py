@@ -0,0 +1,18 @@
+from typing import Any
+
+from core.openapi.base_views import LazySchemaMixin
+
+
+def decorate_schema_views(
+    endpoints: list[tuple[str, str, str, Any]],
+) -> list[tuple[str, str, str, Any]]:
+    """
+    drf-spectacular preprocessing hook that applies the deferred schema decorators
+    of the views about to be documented.
+    """
+    for _path, _path_regex, _method, callback in endpoints:
+        view = getattr(callback, "cls", None)
+        if isinstance(view, type) and issubclass(view, LazySchemaMixin):
+            view.decorate_schema()
+
+    return endpoints
@@ -1,12 +1,24 @@
+import asyncio
+import os
 import socket
 import struct
-from typing import Protocol
+import threading
+import time
+import weakref
+from collections.abc import Callable, Iterator
+from typing import Generic, Protocol, TypeVar
 
 from app_settings import project_settings
-
+from core.services.metrics import count_clamav_failure, observe_clamav
+from core.services.request_timing import timed, timed_function
 
 CHUNK_SIZE = 64 * 1024
 
+# Zero-length chunk terminates an INSTREAM upload.
+STREAM_END = struct.pack("!I", 0)
+
+T = TypeVar("T")
+
 
 class ScannableFile(Protocol):
     def read(self, size: int = -1) -> bytes: ...
@@ -30,6 +42,650 @@ class MalwareDetectedError(ClamAVError):
     """Malware was detected in the uploaded file."""
 
 
+def encode_command(command: bytes) -> bytes:
+    return b"z" + command + b"\0"
+
+
+def chunk_frame(data: bytes) -> bytes:
+    """
+    One ``INSTREAM`` chunk: the payload behind its length.
+    """
+    return struct.pack("!I", len(data)) + data
+
+
+def instream_frames(file: ScannableFile) -> Iterator[bytes]:
+    """
+    Yields the INSTREAM body of a file with every chunk header joined to its payload
+    and the terminator joined to the last chunk, so each chunk costs one send.
+    """
+    chunk = file.read(CHUNK_SIZE)
+
+    while chunk:
+        next_chunk = file.read(CHUNK_SIZE)
+        frame = chunk_frame(chunk)
+        if not next_chunk:
+            frame += STREAM_END
+
+        yield frame
+        chunk = next_chunk
+
+
+def keeps_session(response: str) -> bool:
+    # clamd closes the session after an error response.
+    return not response.endswith("ERROR")
+
+
+def check_pong(response: str) -> None:
+    if response != "PONG":
+        raise ClamAVUnavailableError(f"Некорректный ответ ClamAV: {response}")
+
+
+class ClamAVProtocol:
+    """
+    The clamd protocol of one connection, without any I/O: the bytes to send for a
+    command and the replies read out of the bytes received. ``ClamAVConnection``
+    and ``AsyncClamAVConnection`` only move these bytes over their socket.
+
+    Commands and replies are null-terminated (``z`` commands); bytes received past
+    the end of one reply are kept for the next one, so partial and merged reads are
+    both handled. Inside an ``IDSESSION`` every reply starts with the number of its
+    command, which is checked and removed.
+
+    Attributes:
+        session: Whether commands are sent inside an ``IDSESSION``.
+        last_used: ``time.monotonic()`` of the last completed command.
+        reused: Whether the connection has already served a command.
+    """
+
+    def __init__(self, *, session: bool) -> None:
+        self.session = session
+        self.last_used = time.monotonic()
+        self.reused = False
+        self._buffer = bytearray()
+        self._next_id = 1
+
+    def start(self) -> bytes:
+        """
+        What to send once the connection is open.
+        """
+        return encode_command(b"IDSESSION") if self.session else b""
+
+    def end(self) -> bytes:
+        """
+        What to send before the connection is closed.
+        """
+        return encode_command(b"END") if self.session else b""
+
+    def request(
+        self, command: bytes, body: Iterator[bytes] | None = None
+    ) -> Iterator[bytes]:
+        """
+        Yields the data to send for ``command``, the command joined with the first
+        frame of ``body``.
+        """
+        pending = encode_command(command)
+
+        if body is not None:
+            for frame in body:
+                yield pending + frame
+                pending = b""
+
+            if pending:
+                pending += STREAM_END
+
+        if pending:
+            yield pending
+
+    def feed(self, data: bytes) -> None:
+        """
+        Adds data received from clamd; no data means clamd closed the connection.
+        """
+        if not data:
+            raise ConnectionResetError("clamd closed the connection")
+
+        self._buffer += data
+
+    def reply(self) -> str | None:
+        """
+        Returns the reply to the command sent last, or ``None`` until it has been
+        received in full.
+        """
+        end = self._buffer.find(b"\0")
+        if end < 0:
+            return None
+
+        reply = bytes(self._buffer[:end]).decode("utf-8", errors="replace")
+        del self._buffer[: end + 1]
+        self.last_used = time.monotonic()
+        return self._parse_reply(reply)
+
+    def _parse_reply(self, reply: str) -> str:
+        if not self.session:
+            return reply
+
+        request_id = self._next_id
+        self._next_id += 1
+        prefix = f"{request_id}: "
+        if not reply.startswith(prefix):
+            raise ClamAVUnavailableError(f"Некорректный ответ ClamAV: {reply}")
+
+        self.reused = True
+        return reply[len(prefix) :]
+
+
+class _Connection(Protocol):
+    protocol: ClamAVProtocol
+
+
+C = TypeVar("C", bound=_Connection)
+
+
+class IdleConnections(Generic[C]):
+    """
+    Up to ``size`` connections kept open between commands, most recently used last.
+    A connection idle for longer than ``idle_timeout`` seconds is handed back to be
+    closed instead of reused, since clamd drops idle sessions on its own.
+
+    Only bookkeeping: the client closes the connections it gets back.
+    """
+
+    def __init__(self, size: int, idle_timeout: float) -> None:
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.connections: list[C] = []
+        self._lock = threading.Lock()
+
+    def take(self) -> tuple[C | None, list[C]]:
+        """
+        Returns a connection to reuse, if any, and the expired ones to close.
+        """
+        expired: list[C] = []
+
+        with self._lock:
+            now = time.monotonic()
+            while self.connections:
+                connection = self.connections.pop()
+                if now - connection.protocol.last_used < self.idle_timeout:
+                    return connection, expired
+                expired.append(connection)
+
+        return None, expired
+
+    def keep(self, connection: C) -> bool:
+        """
+        Keeps a connection for reuse; ``False`` means it should be closed.
+        """
+        with self._lock:
+            if connection.protocol.session and len(self.connections) < self.size:
+                self.connections.append(connection)
+                return True
+
+        return False
+
+    def clear(self) -> list[C]:
+        with self._lock:
+            connections, self.connections = self.connections, []
+
+        return connections
+
+
+class ClamAVConnection:
+    """
+    A blocking clamd socket speaking ``ClamAVProtocol``.
+    """
+
+    def __init__(self, sock: socket.socket, *, session: bool) -> None:
+        self.sock = sock
+        self.protocol = ClamAVProtocol(session=session)
+
+        if start := self.protocol.start():
+            self.sock.sendall(start)
+
+    def send(self, data: bytes) -> None:
+        self.sock.sendall(data)
+
+    def request(self, command: bytes, body: Iterator[bytes] | None = None) -> str:
+        for data in self.protocol.request(command, body):
+            self.sock.sendall(data)
+
+        return self.response()
+
+    def response(self) -> str:
+        """
+        Reads the response to the command sent last.
+        """
+        while (reply := self.protocol.reply()) is None:
+            self.protocol.feed(self.sock.recv(4096))
+
+        return reply
+
+    def close(self) -> None:
+        try:
+            if end := self.protocol.end():
+                self.sock.sendall(end)
+        except OSError:
+            pass
+        finally:
+            self.sock.close()
+
+
+class ClamAVClient:
+    """
+    Blocking clamd client for synchronous code, such as upload handlers and
+    background scans, that keeps up to ``pool_size`` ``IDSESSION`` connections open.
+    Code running on an event loop uses ``AsyncClamAVClient`` instead; both speak
+    ``ClamAVProtocol`` and pool connections in ``IdleConnections``.
+
+    If a reused connection fails, the command is retried once on a fresh one. With
+    ``pool_size`` 0 every command opens and closes its own connection, as clamd's
+    plain protocol expects.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        timeout: float,
+        pool_size: int,
+        idle_timeout: float,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._idle: IdleConnections[ClamAVConnection] = IdleConnections(
+            pool_size, idle_timeout
+        )
+
+    def _connect(self) -> ClamAVConnection:
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        try:
+            sock.settimeout(self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return ClamAVConnection(sock, session=self.pool_size > 0)
+        except BaseException:
+            sock.close()
+            raise
+
+    def _acquire(self) -> ClamAVConnection:
+        connection, expired = self._idle.take()
+        for stale in expired:
+            stale.close()
+
+        return connection or self._connect()
+
+    def _settle(self, connection: ClamAVConnection, response: str) -> None:
+        if not (keeps_session(response) and self._idle.keep(connection)):
+            connection.close()
+
+    @timed_function("clamav")
+    def _execute(self, command: bytes, file: ScannableFile | None = None) -> str:
+        try:
+            with observe_clamav(command.decode()):
+                return self._attempt(command, file, retry=True)
+        except OSError as exc:
+            raise ClamAVUnavailableError("ClamAV недоступен.") from exc
+
+    def _attempt(
+        self, command: bytes, file: ScannableFile | None, *, retry: bool
+    ) -> str:
+        connection = self._acquire()
+
+        try:
+            if file is not None:
+                file.seek(0)
+            response = connection.request(
+                command, instream_frames(file) if file is not None else None
+            )
+        except OSError:
+            connection.close()
+            if retry and connection.protocol.reused:
+                return self._attempt(command, file, retry=False)
+            raise
+        except BaseException:
+            connection.close()
+            raise
+
+        self._settle(connection, response)
+        return response
+
+    def ping(self) -> None:
+        check_pong(self._execute(b"PING"))
+
+    def version(self) -> str:
+        """
+        Returns the engine and signature database version, for example
+        ``ClamAV 1.4.1/27400/Mon Oct 13 08:00:00 2025``.
+        """
+        return self._execute(b"VERSION")
+
+    def instream(self, file: ScannableFile) -> str:
+        return self._execute(b"INSTREAM", file)
+
+    def stream(self) -> "ClamAVStream":
+        """
+        Starts an ``INSTREAM`` scan that is fed with ``ClamAVStream.write``.
+        """
+        try:
+            return ClamAVStream(self, self._acquire())
+        except OSError as exc:
+            count_clamav_failure("INSTREAM")
+            raise ClamAVUnavailableError("ClamAV недоступен.") from exc
+
+    def close(self) -> None:
+        for connection in self._idle.clear():
+            connection.close()
+
+
+class ClamAVStream:
+    """
+    An ``INSTREAM`` scan of data that is still arriving, such as a file being
+    uploaded: every ``write`` is sent as one chunk and ``finish`` returns the clamd
+    response.
+
+    Unlike ``ClamAVClient.instream`` a failed stream cannot be replayed, so it is not
+    retried; ``ClamAVUnavailableError`` is raised and the connection is dropped.
+    """
+
+    def __init__(self, client: ClamAVClient, connection: ClamAVConnection) -> None:
+        self._client = client
+        self._connection: ClamAVConnection | None = connection
+        self._pending = encode_command(b"INSTREAM")
+
+    def _send(self, data: bytes) -> None:
+        if self._connection is None:
+            raise ClamAVUnavailableError("ClamAV недоступен.")
+
+        try:
+            self._connection.send(self._pending + data)
+        except OSError as exc:
+            count_clamav_failure("INSTREAM")
+            self.abort()
+            raise ClamAVUnavailableError("ClamAV недоступен.") from exc
+
+        self._pending = b""
+
+    @timed_function("clamav")
+    def write(self, data: bytes) -> None:
+        if data:
+            self._send(chunk_frame(data))
+
+    @timed_function("clamav")
+    def finish(self) -> str:
+        self._send(STREAM_END)
+        connection, self._connection = self._connection, None
+        assert connection is not None
+
+        try:
+            with observe_clamav("INSTREAM"):
+                response = connection.response()
+        except OSError as exc:
+            connection.close()
+            raise ClamAVUnavailableError("ClamAV недоступен.") from exc
+        except BaseException:
+            connection.close()
+            raise
+
+        self._client._settle(connection, response)
+        return response
+
+    def abort(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            connection.close()
+
+
+class AsyncClamAVConnection:
+    """
+    A clamd connection on the running event loop speaking ``ClamAVProtocol``.
+
+    Every send waits for the socket buffer to drain, so a slow clamd holds the sender
+    back instead of the data piling up in memory, and every send and read gives up
+    after ``timeout`` seconds.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        *,
+        session: bool,
+        timeout: float,
+    ) -> None:
+        self.protocol = ClamAVProtocol(session=session)
+        self.timeout = timeout
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def open(
+        cls, host: str, port: int, *, session: bool, timeout: float
+    ) -> "AsyncClamAVConnection":
+        async with asyncio.timeout(timeout):
+            reader, writer = await asyncio.open_connection(host, port)
+
+        connection = cls(reader, writer, session=session, timeout=timeout)
+        if start := connection.protocol.start():
+            try:
+                await connection.send(start)
+            except BaseException:
+                connection.abort()
+                raise
+
+        return connection
+
+    async def send(self, data: bytes) -> None:
+        self._writer.write(data)
+        async with asyncio.timeout(self.timeout):
+            await self._writer.drain()
+
+    async def request(self, command: bytes, body: Iterator[bytes] | None = None) -> str:
+        for data in self.protocol.request(command, body):
+            await self.send(data)
+
+        return await self.response()
+
+    async def response(self) -> str:
+        """
+        Reads the response to the command sent last.
+        """
+        while (reply := self.protocol.reply()) is None:
+            async with asyncio.timeout(self.timeout):
+                self.protocol.feed(await self._reader.read(4096))
+
+        return reply
+
+    async def close(self) -> None:
+        try:
+            end = self.protocol.end()
+            if end and not self._writer.is_closing():
+                self._writer.write(end)
+            self._writer.close()
+            async with asyncio.timeout(self.timeout):
+                await self._writer.wait_closed()
+        except OSError:
+            pass
+
+    def abort(self) -> None:
+        """
+        Drops the connection without ending the session, after a failed command.
+        """
+        self._writer.transport.abort()
+
+
+class AsyncClamAVClient:
+    """
+    asyncio counterpart of ``ClamAVClient`` for code running on an event loop, such
+    as the readiness probe. Commands awaited concurrently run on separate
+    connections, so several files are scanned at once on one event loop.
+
+    Connections belong to the event loop they were opened on, so a client must only
+    be used on one loop; ``get_async_clamav_client`` keeps one per loop.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        timeout: float,
+        pool_size: int,
+        idle_timeout: float,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._idle: IdleConnections[AsyncClamAVConnection] = IdleConnections(
+            pool_size, idle_timeout
+        )
+
+    async def _acquire(self) -> AsyncClamAVConnection:
+        connection, expired = self._idle.take()
+        for stale in expired:
+            await stale.close()
+
+        return connection or await AsyncClamAVConnection.open(
+            self.host, self.port, session=self.pool_size > 0, timeout=self.timeout
+        )
+
+    async def _settle(self, connection: AsyncClamAVConnection, response: str) -> None:
+        if not keeps_session(response):
+            connection.abort()
+        elif not self._idle.keep(connection):
+            await connection.close()
+
+    async def _execute(self, command: bytes, file: ScannableFile | None = None) -> str:
+        try:
+            with timed("clamav"), observe_clamav(command.decode()):
+                return await self._attempt(command, file, retry=True)
+        except OSError as exc:
+            raise ClamAVUnavailableError("ClamAV недоступен.") from exc
+
+    async def _attempt(
+        self, command: bytes, file: ScannableFile | None, *, retry: bool
+    ) -> str:
+        connection = await self._acquire()
+
+        try:
+            if file is not None:
+                file.seek(0)
+            response = await connection.request(
+                command, instream_frames(file) if file is not None else None
+            )
+        except OSError:
+            connection.abort()
+            if retry and connection.protocol.reused:
+                return await self._attempt(command, file, retry=False)
+            raise
+        except BaseException:
+            connection.abort()
+            raise
+
+        await self._settle(connection, response)
+        return response
+
+    async def ping(self) -> None:
+        check_pong(await self._execute(b"PING"))
+
+    async def version(self) -> str:
+        """
+        Returns the engine and signature database version, for example
+        ``ClamAV 1.4.1/27400/Mon Oct 13 08:00:00 2025``.
+        """
+        return await self._execute(b"VERSION")
+
+    async def instream(self, file: ScannableFile) -> str:
+        """
+        Sends the file in ``CHUNK_SIZE`` frames. The file is read on the event loop,
+        which suits uploads held in memory or in a local temporary file.
+        """
+        return await self._execute(b"INSTREAM", file)
+
+    async def close(self) -> None:
+        for connection in self._idle.clear():
+            await connection.close()
+
+
+_clients: dict[tuple[object, ...], ClamAVClient] = {}
+_async_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[tuple[object, ...], AsyncClamAVClient]
+] = weakref.WeakKeyDictionary()
+_clients_lock = threading.Lock()
+
+
+def _client_settings() -> tuple[object, ...]:
+    return (
+        project_settings.CLAMAV_HOST,
+        project_settings.CLAMAV_PORT,
+        project_settings.CLAMAV_TIMEOUT,
+        project_settings.CLAMAV_POOL_SIZE,
+        project_settings.CLAMAV_POOL_IDLE_TIMEOUT,
+    )
+
+
+def _create_client(factory: Callable[..., T]) -> T:
+    return factory(
+        project_settings.CLAMAV_HOST,
+        project_settings.CLAMAV_PORT,
+        timeout=project_settings.CLAMAV_TIMEOUT,
+        pool_size=project_settings.CLAMAV_POOL_SIZE,
+        idle_timeout=project_settings.CLAMAV_POOL_IDLE_TIMEOUT,
+    )
+
+
+def get_clamav_client() -> ClamAVClient:
+    """
+    Returns the per-process blocking client for the configured clamd.
+    """
+    key = _client_settings()
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = _create_client(ClamAVClient)
+
+    return client
+
+
+def get_async_clamav_client() -> AsyncClamAVClient:
+    """
+    Returns the client for the configured clamd that belongs to the running event
+    loop.
+    """
+    loop = asyncio.get_running_loop()
+    key = _client_settings()
+
+    with _clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = clients[key] = _create_client(AsyncClamAVClient)
+
+    return client
+
+
+def _forget_clients_after_fork() -> None:
+    # Sockets inherited from the parent process belong to the parent's sessions.
+    global _clients_lock
+    _clients.clear()
+    _async_clients.clear()
+    _clients_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_clients_after_fork)
+
+
+def close_clamav_clients() -> None:
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+
+    for client in clients:
+        client.close()
+
+
 def scan_file_for_malware(file: ScannableFile) -> None:
     """
     Scan a file using ClamAV clamd INSTREAM protocol.
@@ -45,46 +701,22 @@ def scan_file_for_malware(file: ScannableFile) -> None:
         return
 
     try:
+        response = get_clamav_client().instream(file)
+    finally:
         file.seek(0)
 
-        with socket.create_connection(
-            (
-                project_settings.CLAMAV_HOST,
-                project_settings.CLAMAV_PORT,
-            ),
-            timeout=project_settings.CLAMAV_TIMEOUT,
-        ) as sock:
-            sock.settimeout(project_settings.CLAMAV_TIMEOUT)
-
-            # z = null-terminated clamd command.
-            sock.sendall(b"zINSTREAM\0")
-
-            while chunk := file.read(CHUNK_SIZE):
-                sock.sendall(struct.pack("!I", len(chunk)))
-                sock.sendall(chunk)
-
-            # Zero-length chunk terminates the stream.
-            sock.sendall(struct.pack("!I", 0))
-
-            response = sock.recv(4096).decode(
-                "utf-8",
-                errors="replace",
-            ).rstrip("\0")
+    check_scan_response(response)
 
-    except (OSError, socket.timeout) as exc:
-        raise ClamAVUnavailableError(
-            "ClamAV недоступен."
-        ) from exc
-
-    finally:
-        file.seek(0)
 
+def check_scan_response(response: str) -> None:
+    """
+    Raises ``MalwareDetectedError`` or ``ClamAVUnavailableError`` unless an
+    ``INSTREAM`` response reports the stream as clean.
+    """
     if response.endswith(" OK"):
         return
 
     if " FOUND" in response:
         raise MalwareDetectedError(response)
 
-    raise ClamAVUnavailableError(
-        f"Некорректный ответ ClamAV: {response}"
-    )
\ No newline at end of file
+    raise ClamAVUnavailableError(f"Некорректный ответ ClamAV: {response}")
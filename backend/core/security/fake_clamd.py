@@ -0,0 +1,129 @@
+import socketserver
+import struct
+import threading
+import time
+from typing import Any
+
+# The standard antivirus test string; any stream containing it is reported as infected.
+EICAR_SIGNATURE = b"EICAR-STANDARD-ANTIVIRUS-TEST-FILE"
+
+FAKE_CLAMD_VERSION = "ClamAV 1.4.1/27400/Mon Oct 13 08:00:00 2025"
+
+
+class _ClamdHandler(socketserver.BaseRequestHandler):
+    server: "FakeClamd"
+
+    def setup(self) -> None:
+        self._buffer = bytearray()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _read_exact(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            data = self.request.recv(65536)
+            if not data:
+                raise ConnectionResetError
+            self._buffer += data
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def _read_command(self) -> bytes:
+        while (end := self._buffer.find(b"\0")) < 0:
+            data = self.request.recv(65536)
+            if not data:
+                raise ConnectionResetError
+            self._buffer += data
+
+        command = bytes(self._buffer[:end])
+        del self._buffer[: end + 1]
+        return command.removeprefix(b"z")
+
+    def _instream(self) -> str:
+        infected = False
+        tail = b""
+
+        while size := struct.unpack("!I", self._read_exact(4))[0]:
+            chunk = self._read_exact(size)
+            infected = infected or EICAR_SIGNATURE in tail + chunk
+            tail = chunk[-len(EICAR_SIGNATURE) :]
+
+        with self.server.lock:
+            self.server.scans += 1
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        return "stream: Eicar-Test-Signature FOUND" if infected else "stream: OK"
+
+    def _execute(self, command: bytes) -> str | None:
+        if command == b"PING":
+            return "PONG"
+        if command == b"VERSION":
+            return self.server.version
+        if command == b"INSTREAM":
+            return self._instream()
+        return None
+
+    def handle(self) -> None:
+        try:
+            command = self._read_command()
+
+            if command != b"IDSESSION":
+                response = self._execute(command)
+                self.request.sendall(f"{response or 'UNKNOWN COMMAND'}\0".encode())
+                return
+
+            request_id = 0
+            while (command := self._read_command()) != b"END":
+                request_id += 1
+                response = self._execute(command) or "UNKNOWN COMMAND"
+                self.request.sendall(f"{request_id}: {response}\0".encode())
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+
+
+class FakeClamd(socketserver.ThreadingTCPServer):
+    """
+    In-process stand-in for clamd speaking the ``z``-command protocol.
+
+    Supports ``PING``, ``VERSION``, ``INSTREAM`` and ``IDSESSION``/``END``, reports
+    streams containing the EICAR test string as infected and counts accepted
+    connections and scans, so the client can be tested and benchmarked without the
+    real daemon. Use as a context manager; ``address`` is the bound host and port.
+
+    Attributes:
+        latency: Seconds added to every scan, to model a loaded daemon.
+        version: The ``VERSION`` response.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        version: str = FAKE_CLAMD_VERSION,
+    ) -> None:
+        super().__init__(("127.0.0.1", 0), _ClamdHandler)
+        self.latency = latency
+        self.version = version
+        self.connections = 0
+        self.scans = 0
+        self.lock = threading.Lock()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self.server_address[:2]
+        return str(host), int(port)
+
+    def __enter__(self) -> "FakeClamd":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+        self.server_close()
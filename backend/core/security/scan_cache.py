@@ -0,0 +1,134 @@
+import hashlib
+import threading
+import time
+from typing import Any
+
+from app_settings import project_settings
+from core.models import FileScanVerdict
+from core.security.clamav import (
+    MalwareDetectedError,
+    ScannableFile,
+    get_clamav_client,
+    scan_file_for_malware,
+)
+from core.services.metrics import count_cache_lookup
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_version_lock = threading.Lock()
+_version: tuple[float, str] | None = None
+
+
+def file_sha256(file: Any) -> str:
+    """
+    Returns the hex SHA-256 of a file and remembers it on the file object, so later
+    checks of the same upload do not read it again.
+    """
+    digest = getattr(file, "sha256", None)
+    if digest:
+        return str(digest)
+
+    sha256 = hashlib.sha256()
+    file.seek(0)
+    while chunk := file.read(HASH_CHUNK_SIZE):
+        sha256.update(chunk)
+    file.seek(0)
+
+    digest = sha256.hexdigest()
+    file.sha256 = digest
+    return digest
+
+
+def signature_version() -> str:
+    """
+    Returns the clamd ``VERSION`` response (engine and signature database version),
+    asked at most once per ``CLAMAV_VERSION_TTL`` seconds, or an empty string if
+    ClamAV is disabled.
+    """
+    global _version
+
+    if not project_settings.CLAMAV_ENABLED:
+        return ""
+
+    with _version_lock:
+        if _version is not None and time.monotonic() < _version[0]:
+            return _version[1]
+
+    version = get_clamav_client().version()
+
+    with _version_lock:
+        _version = (time.monotonic() + project_settings.CLAMAV_VERSION_TTL, version)
+
+    return version
+
+
+def reset_signature_version() -> None:
+    global _version
+
+    with _version_lock:
+        _version = None
+
+
+def is_known_valid(kind: str, sha256: str) -> bool:
+    """
+    Whether a file with this content already passed the structural validation of
+    ``kind``; verdicts are only recorded for such files.
+    """
+    return FileScanVerdict.objects.filter(kind=kind, sha256=sha256).exists()
+
+
+def record_scan_result(file: Any, *, kind: str, sha256: str) -> None:
+    """
+    Stores the verdict ``ScanningUploadHandler`` left on an upload as
+    ``scan_result``, so the later scan of the saved file finds it in the cache
+    instead of sending the file to clamd again.
+
+    Must only be called once the file has passed the validation of ``kind``.
+    """
+    result = getattr(file, "scan_result", None)
+    if result is None or not result.signature_version:
+        return
+
+    FileScanVerdict.objects.get_or_create(
+        kind=kind,
+        sha256=sha256,
+        signature_version=result.signature_version,
+        defaults={"is_clean": result.is_clean, "detail": result.detail},
+    )
+
+
+def scan_with_cache(file: ScannableFile, *, kind: str, sha256: str) -> FileScanVerdict:
+    """
+    Scans a file unless a verdict for its content and the current ClamAV signatures
+    is already known.
+
+    Verdicts produced with older signatures are dropped when a new one is stored.
+    ``ClamAVUnavailableError`` is raised as by ``scan_file_for_malware`` and nothing
+    is recorded.
+    """
+    version = signature_version()
+
+    verdict = FileScanVerdict.objects.filter(
+        kind=kind, sha256=sha256, signature_version=version
+    ).first()
+    count_cache_lookup("scan_verdict", hit=verdict is not None)
+    if verdict is not None:
+        return verdict
+
+    try:
+        scan_file_for_malware(file)
+        is_clean, detail = True, "OK"
+    except MalwareDetectedError as exc:
+        is_clean, detail = False, str(exc)[:255]
+
+    verdict, _created = FileScanVerdict.objects.get_or_create(
+        kind=kind,
+        sha256=sha256,
+        signature_version=version,
+        defaults={"is_clean": is_clean, "detail": detail},
+    )
+    FileScanVerdict.objects.filter(kind=kind, sha256=sha256).exclude(
+        signature_version=version
+    ).delete()
+
+    return verdict
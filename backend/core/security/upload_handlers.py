@@ -0,0 +1,192 @@
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import IO, Any, cast
+
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http import HttpRequest
+
+from app_settings import project_settings
+from core.security.clamav import (
+    ClamAVStream,
+    ClamAVUnavailableError,
+    MalwareDetectedError,
+    check_scan_response,
+    get_clamav_client,
+)
+from core.security.scan_cache import signature_version
+from core.services.metrics import observe_upload
+
+logger = logging.getLogger(__name__)
+
+
+class UploadRejectedError(Exception):
+    """
+    An upload refused while it was being received.
+
+    Attributes:
+        message: The user-facing reason.
+        field_name: The form field of the refused file, if the body got that far.
+    """
+
+    def __init__(self, message: str, field_name: str | None = None) -> None:
+        super().__init__(message)
+        self.message = message
+        self.field_name = field_name
+
+
+@dataclass(frozen=True)
+class StreamScanResult:
+    """
+    The clamd verdict on an upload scanned while it was received.
+    """
+
+    signature_version: str
+    is_clean: bool
+    detail: str
+
+
+def _size_limit_message(max_size: int) -> str:
+    return f"Размер файла не должен превышать {max_size // (1024 * 1024)} МБ."
+
+
+class ScanningUploadHandler(TemporaryFileUploadHandler):
+    """
+    Receives uploaded files into temporary files and, in the same pass, hashes them,
+    enforces ``max_size`` and streams them into a clamd ``INSTREAM`` scan.
+
+    The SHA-256 is left on the uploaded file as ``sha256`` (see ``file_sha256``) and
+    the verdict as ``scan_result``, which is ``None`` if ClamAV is disabled or failed
+    mid-stream, so later checks do not read the file again. A body or file larger
+    than ``max_size`` raises ``UploadRejectedError`` as soon as that is known, before
+    the rest is received; with ``reject_infected`` so does an infected file.
+    """
+
+    def __init__(
+        self,
+        request: HttpRequest | None = None,
+        *,
+        max_size: int | None = None,
+        reject_infected: bool = False,
+    ) -> None:
+        super().__init__(request)
+        self.max_size = max_size
+        self.reject_infected = reject_infected
+        self._sha256: Any = None
+        self._stream: ClamAVStream | None = None
+        self._signature_version = ""
+
+    def handle_raw_input(
+        self,
+        input_data: IO[bytes],
+        META: dict[str, str],
+        content_length: int,
+        boundary: str,
+        encoding: str | None = None,
+    ) -> None:
+        # Other form fields are bounded by DATA_UPLOAD_MAX_MEMORY_SIZE.
+        fields_size = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+        if (
+            self.max_size is not None
+            and fields_size is not None
+            and content_length > self.max_size + fields_size
+        ):
+            raise UploadRejectedError(_size_limit_message(self.max_size))
+
+    def new_file(self, field_name: str, *args: Any, **kwargs: Any) -> None:
+        super().new_file(field_name, *args, **kwargs)
+
+        if self.max_size is not None and (self.content_length or 0) > self.max_size:
+            self._reject(_size_limit_message(self.max_size))
+
+        self._sha256 = hashlib.sha256()
+        self._stream = None
+
+        if not project_settings.CLAMAV_ENABLED:
+            return
+
+        try:
+            self._signature_version = signature_version()
+            self._stream = get_clamav_client().stream()
+        except ClamAVUnavailableError:
+            logger.warning("Could not stream upload %s to ClamAV", self.file_name)
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> None:
+        if self.max_size is not None and start + len(raw_data) > self.max_size:
+            self._reject(_size_limit_message(self.max_size))
+
+        self._sha256.update(raw_data)
+
+        if self._stream is not None:
+            try:
+                self._stream.write(raw_data)
+            except ClamAVUnavailableError:
+                logger.warning("ClamAV stream of %s failed", self.file_name)
+                self._stream = None
+
+        super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size: int) -> UploadedFile | None:
+        file = super().file_complete(file_size)
+        if file is None:
+            return None
+
+        observe_upload(self.field_name, file_size)
+        scan_result = self._finish_scan()
+
+        # Not attributes of UploadedFile; read back through getattr by scan_cache.
+        scanned = cast(Any, file)
+        scanned.sha256 = self._sha256.hexdigest()
+        scanned.scan_result = scan_result
+
+        if self.reject_infected and scan_result and not scan_result.is_clean:
+            self.upload_interrupted()
+            raise UploadRejectedError(
+                "Файл не прошёл антивирусную проверку.", self.field_name
+            )
+
+        return file
+
+    def _finish_scan(self) -> StreamScanResult | None:
+        stream, self._stream = self._stream, None
+        if stream is None:
+            return None
+
+        try:
+            check_scan_response(stream.finish())
+            return StreamScanResult(self._signature_version, True, "OK")
+        except MalwareDetectedError as exc:
+            return StreamScanResult(self._signature_version, False, str(exc)[:255])
+        except ClamAVUnavailableError:
+            logger.warning("ClamAV stream of %s failed", self.file_name, exc_info=True)
+            return None
+
+    def _reject(self, message: str) -> None:
+        self.upload_interrupted()
+        raise UploadRejectedError(message, self.field_name)
+
+    def upload_interrupted(self) -> None:
+        if self._stream is not None:
+            self._stream.abort()
+            self._stream = None
+
+        super().upload_interrupted()
+
+
+def install_scanning_upload_handler(
+    request: HttpRequest,
+    *,
+    max_size: int | None = None,
+    reject_infected: bool = False,
+) -> None:
+    """
+    Makes the request receive its files with ``ScanningUploadHandler``; must be called
+    before the body is read.
+    """
+    request.upload_handlers = [
+        ScanningUploadHandler(
+            request, max_size=max_size, reject_infected=reject_infected
+        )
+    ]
@@ -0,0 +1,51 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+
+from app_settings import project_settings
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(
+    max_workers=project_settings.BACKGROUND_WORKERS,
+    thread_name_prefix="background",
+)
+
+
+def _run(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", func.__qualname__)
+
+
+def _run_in_thread(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    close_old_connections()
+    try:
+        _run(func, *args, **kwargs)
+    finally:
+        connections.close_all()
+
+
+def run_in_background(func: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    """
+    Runs a function outside the request cycle once the current transaction commits.
+
+    Tasks run on a small per-process thread pool, so they must be idempotent and
+    reload whatever they need from the database: a worker restart drops queued tasks,
+    and every caller is expected to have a management command that picks up the
+    leftovers. With ``BACKGROUND_TASKS_EAGER`` enabled (tests) the task runs inline
+    right after the commit.
+    """
+
+    def submit() -> None:
+        if settings.BACKGROUND_TASKS_EAGER:
+            _run(func, *args, **kwargs)
+            return
+
+        _executor.submit(_run_in_thread, func, *args, **kwargs)
+
+    transaction.on_commit(submit)
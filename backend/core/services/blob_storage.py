@@ -0,0 +1,256 @@
+import logging
+import os
+import posixpath
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from typing import Any
+
+from django.apps import apps
+from django.core.files.base import File
+from django.core.files.storage import FileSystemStorage
+from django.db.models import FileField
+from django.db.models.signals import post_delete, post_save
+
+from core.services.background import run_in_background
+from core.services.request_timing import timed_function
+
+logger = logging.getLogger(__name__)
+
+# Blobs younger than this are never collected: the row referencing a fresh upload
+# may not be committed yet.
+BLOB_GRACE_SECONDS = 60 * 60
+
+# Saving or deleting rows schedules a sweep at most this often per process.
+BLOB_SWEEP_INTERVAL = 10 * 60
+
+_BLOB_NAME_RE = re.compile(r"^(?:.+/)?([0-9a-f]{2})/([0-9a-f]{64})/[^/]+$")
+
+_sweep_lock = threading.Lock()
+_last_sweep = 0.0
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores every file as ``<upload dir>/<sha256[:2]>/<sha256>/<file name>``, so the
+    same content saved again under the same directory and name reuses the stored
+    blob. Under another name it becomes a hard link to the stored blob, so downloads
+    keep the name it was uploaded with while the bytes are stored once.
+
+    Deleting a row never deletes its file right away, since other rows may share it;
+    ``sweep_unreferenced_blobs`` removes blobs no ``FileField`` using this storage
+    refers to any more.
+    """
+
+    @timed_function("file")
+    def save(
+        self, name: str | None, content: Any, max_length: int | None = None
+    ) -> str:
+        from core.security.scan_cache import file_sha256
+
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+
+        sha256 = file_sha256(content)
+        directory, filename = posixpath.split(str(name))
+        blob_dir = posixpath.join(directory, sha256[:2], sha256)
+        blob_name = posixpath.join(blob_dir, filename)
+
+        if self._reuse(blob_name) or self._link_existing_blob(blob_dir, blob_name):
+            return blob_name
+
+        return super().save(blob_name, content, max_length=max_length)
+
+    def _reuse(self, name: str) -> bool:
+        try:
+            # Restarts the grace period, so a concurrent sweep keeps the blob.
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            return False
+
+        return True
+
+    def _link_existing_blob(self, blob_dir: str, name: str) -> bool:
+        try:
+            _dirs, files = self.listdir(blob_dir)
+        except FileNotFoundError:
+            return False
+
+        for existing in sorted(files):
+            try:
+                os.link(self.path(posixpath.join(blob_dir, existing)), self.path(name))
+            except FileExistsError:
+                return self._reuse(name)
+            except FileNotFoundError:
+                # Swept meanwhile.
+                continue
+            except OSError:
+                # No hard links on this file system; the caller stores a copy.
+                return False
+
+            return self._reuse(name)
+
+        return False
+
+
+_blob_storage: ContentAddressedStorage | None = None
+
+
+def get_blob_storage() -> ContentAddressedStorage:
+    """
+    Returns the content-addressed storage under ``MEDIA_ROOT`` used by file fields
+    (``FileField(storage=get_blob_storage)``).
+    """
+    global _blob_storage
+
+    if _blob_storage is None:
+        _blob_storage = ContentAddressedStorage()
+
+    return _blob_storage
+
+
+def _blob_fields() -> Iterator[tuple[Any, FileField]]:
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, FileField) and isinstance(
+                field.storage, ContentAddressedStorage
+            ):
+                yield model, field
+
+
+def blob_reference_counts() -> Counter[str]:
+    """
+    Counts the rows referring to each blob, over every ``FileField`` that uses a
+    ``ContentAddressedStorage``.
+    """
+    counts: Counter[str] = Counter()
+
+    for model, field in _blob_fields():
+        names = (
+            model._default_manager.exclude(**{field.name: ""})
+            .exclude(**{f"{field.name}__isnull": True})
+            .values_list(field.name, flat=True)
+        )
+        counts.update(names)
+
+    return counts
+
+
+def blob_directories() -> list[str]:
+    """
+    The upload directories of the file fields using a ``ContentAddressedStorage``,
+    relative to ``MEDIA_ROOT``, without those nested in another one. A field whose
+    ``upload_to`` is a callable makes it the whole ``MEDIA_ROOT`` (``""``).
+    """
+    directories = set()
+
+    for _model, field in _blob_fields():
+        upload_to = field.upload_to if isinstance(field.upload_to, str) else ""
+        # Date placeholders (``%Y`` and the like) only vary the subdirectories.
+        prefix, placeholder, _rest = upload_to.partition("%")
+        if placeholder:
+            prefix = posixpath.dirname(prefix)
+        directory = posixpath.normpath(prefix or ".")
+        directories.add("" if directory == "." else directory)
+
+    return sorted(
+        directory
+        for directory in directories
+        if not any(
+            parent == "" or directory.startswith(parent + "/")
+            for parent in directories - {directory}
+        )
+    )
+
+
+def sweep_unreferenced_blobs(*, grace_seconds: float = BLOB_GRACE_SECONDS) -> int:
+    """
+    Deletes the files in ``blob_directories`` that no row refers to and that were
+    not written or reused within ``grace_seconds``, with the blob directories left
+    empty. Returns the number of files deleted.
+
+    Files stored before the content-addressed layout are collected the same way
+    once no row refers to them.
+    """
+    storage = get_blob_storage()
+    root = storage.location
+    if not os.path.isdir(root):
+        return 0
+
+    references = blob_reference_counts()
+    cutoff = time.time() - grace_seconds
+    deleted = 0
+
+    for blob_directory in blob_directories():
+        top = os.path.join(root, blob_directory)
+
+        for directory, _dirs, files in os.walk(top, topdown=False):
+            for filename in files:
+                path = os.path.join(directory, filename)
+                name = os.path.relpath(path, root).replace(os.sep, "/")
+
+                if references[name]:
+                    continue
+
+                try:
+                    if os.stat(path).st_mtime > cutoff:
+                        continue
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+
+                deleted += 1
+
+            if _BLOB_NAME_RE.match(
+                os.path.relpath(directory, root).replace(os.sep, "/") + "/x"
+            ):
+                try:
+                    os.rmdir(directory)
+                except OSError:
+                    pass
+
+    if deleted:
+        logger.info("Deleted %s unreferenced media blobs", deleted)
+
+    return deleted
+
+
+def schedule_blob_sweep() -> None:
+    """
+    Sweeps unreferenced blobs in the background once the current transaction
+    commits, unless this process did so within ``BLOB_SWEEP_INTERVAL``.
+    """
+    global _last_sweep
+
+    with _sweep_lock:
+        now = time.monotonic()
+        if _last_sweep and now - _last_sweep < BLOB_SWEEP_INTERVAL:
+            return
+        _last_sweep = now
+
+    run_in_background(sweep_unreferenced_blobs)
+
+
+def _schedule_on_change(sender: Any, **kwargs: Any) -> None:
+    schedule_blob_sweep()
+
+
+def register_blob_sweep_hooks(model: Any) -> None:
+    """
+    Schedules a sweep when rows of ``model``, whose file fields use the blob
+    storage, are saved or deleted and may have dropped their last reference to a blob.
+    """
+    post_save.connect(
+        _schedule_on_change,
+        sender=model,
+        dispatch_uid=f"blob_sweep_save_{model._meta.label}",
+    )
+    post_delete.connect(
+        _schedule_on_change,
+        sender=model,
+        dispatch_uid=f"blob_sweep_delete_{model._meta.label}",
+    )
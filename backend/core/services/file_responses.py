@@ -0,0 +1,260 @@
+import mimetypes
+import os
+import re
+from collections.abc import AsyncIterator, Iterator
+from typing import Any
+from urllib.parse import quote
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models.fields.files import FieldFile
+from django.http import FileResponse, Http404, HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import (
+    content_disposition_header,
+    http_date,
+    parse_http_date_safe,
+)
+from rest_framework.request import Request
+
+from app_settings import project_settings
+from core.services.request_timing import timed
+
+OFFLOAD_X_ACCEL = "x-accel"
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class _RangeNotSatisfiable(Exception):
+    pass
+
+
+class _FileRange:
+    """
+    A read-only view of ``length`` bytes of ``file`` starting at ``start``.
+    """
+
+    def __init__(self, file: Any, start: int, length: int) -> None:
+        file.seek(start)
+        self._file = file
+        self._remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            return b""
+
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return bytes(data)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def is_asgi_request(request: HttpRequest | Request) -> bool:
+    return isinstance(getattr(request, "_request", request), ASGIRequest)
+
+
+def _next_chunk(iterator: Iterator[bytes]) -> bytes | None:
+    return next(iterator, None)
+
+
+async def iterate_in_thread(iterator: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Advances a blocking iterator one chunk at a time in a worker thread, so a slow
+    client only holds the event loop's attention while a chunk is being read.
+    """
+    next_chunk = sync_to_async(_next_chunk, thread_sensitive=False)
+    try:
+        while (chunk := await next_chunk(iterator)) is not None:
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            await sync_to_async(close, thread_sensitive=False)()
+
+
+def streaming_content(
+    request: HttpRequest | Request, content: Iterator[bytes] | AsyncIterator[bytes]
+) -> Iterator[bytes] | AsyncIterator[bytes]:
+    """
+    The body of a streaming response to ``request``. Under ASGI Django reads a
+    synchronous iterator to the end before sending anything, so it is handed over
+    as an asynchronous one. Asynchronous content is returned as it is.
+    """
+    if isinstance(content, AsyncIterator) or not is_asgi_request(request):
+        return content
+
+    return iterate_in_thread(content)
+
+
+def _media_relative_path(file: FieldFile) -> str | None:
+    try:
+        path = file.path
+    except NotImplementedError:
+        return None
+
+    relative = os.path.relpath(path, settings.MEDIA_ROOT)
+    if relative.startswith(os.pardir):
+        return None
+
+    return relative.replace(os.sep, "/")
+
+
+def _byte_range(
+    request: HttpRequest | Request, size: int, etag: str, last_modified: int
+) -> tuple[int, int] | None:
+    """
+    Returns the inclusive bounds of a single-range ``Range`` request, or ``None`` if
+    the whole file should be sent: no or unsupported ``Range`` (multiple ranges
+    included), or an ``If-Range`` that no longer matches.
+    """
+    header = request.META.get("HTTP_RANGE", "")
+    match = _RANGE_RE.match(header.strip())
+    if match is None:
+        return None
+
+    if_range = request.META.get("HTTP_IF_RANGE", "").strip()
+    if if_range:
+        if if_range.startswith(('"', "W/")):
+            if if_range != etag:
+                return None
+        elif parse_http_date_safe(if_range) != last_modified:
+            return None
+
+    first, last = match.groups()
+
+    if not first:
+        if not last:
+            return None
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise _RangeNotSatisfiable
+        return max(size - suffix, 0), size - 1
+
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise _RangeNotSatisfiable
+
+    end = int(last) if last else size - 1
+
+    return start, min(end, size - 1)
+
+
+def serve_file(
+    request: HttpRequest | Request,
+    file: FieldFile,
+    *,
+    as_attachment: bool,
+    content_type: str | None = None,
+    filename: str | None = None,
+) -> HttpResponseBase:
+    """
+    Returns the response for a stored file once the view has done its checks.
+
+    The ``ETag`` (modification time and size, in the format nginx uses) and
+    ``Last-Modified`` validators answer ``If-None-Match`` and ``If-Modified-Since``
+    with 304, so a browser revalidates a file it already has instead of
+    downloading it again.
+
+    With ``FILE_OFFLOAD_MODE`` set to ``x-accel`` the body is left to nginx: the
+    response only carries an ``X-Accel-Redirect`` to the internal
+    ``FILE_OFFLOAD_ACCEL_LOCATION``, so the worker is free as soon as the headers are
+    sent, and nginx serves byte ranges itself. Otherwise, and for files outside
+    ``MEDIA_ROOT``, the file is streamed by ``FileResponse`` with single ``Range``
+    requests answered by 206 Partial Content; under ASGI it is read in a worker
+    thread chunk by chunk.
+
+    The file's size and modification time are read from storage, so async views call
+    this through ``sync_to_async``.
+    """
+    name = file.name
+    if not name:
+        raise Http404("Файл не найден")
+
+    filename = filename or os.path.basename(name)
+
+    try:
+        with timed("file"):
+            size = file.storage.size(name)
+            last_modified = int(file.storage.get_modified_time(name).timestamp())
+    except FileNotFoundError as exc:
+        raise Http404("Файл не найден") from exc
+
+    etag = f'"{last_modified:x}-{size:x}"'
+
+    validators = HttpResponse()
+    validators["ETag"] = etag
+    validators["Last-Modified"] = http_date(last_modified)
+    validators["Accept-Ranges"] = "bytes"
+    patch_cache_control(validators, private=True, no_cache=True)
+
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=last_modified, response=validators
+    )
+    if conditional is not None and conditional is not validators:
+        return conditional
+
+    relative_path = (
+        _media_relative_path(file)
+        if project_settings.FILE_OFFLOAD_MODE == OFFLOAD_X_ACCEL
+        else None
+    )
+
+    if relative_path is not None:
+        response: HttpResponseBase = HttpResponse(
+            content_type=content_type
+            or mimetypes.guess_type(filename)[0]
+            or "application/octet-stream"
+        )
+        disposition = content_disposition_header(as_attachment, filename)
+        if disposition is not None:
+            response["Content-Disposition"] = disposition
+        response["X-Accel-Redirect"] = quote(
+            project_settings.FILE_OFFLOAD_ACCEL_LOCATION.rstrip("/")
+            + "/"
+            + relative_path
+        )
+    else:
+        try:
+            byte_range = _byte_range(request, size, etag, last_modified)
+        except _RangeNotSatisfiable:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        if byte_range is None:
+            file_response = FileResponse(
+                file.open("rb"),
+                content_type=content_type,
+                as_attachment=as_attachment,
+                filename=filename,
+            )
+        else:
+            start, end = byte_range
+            file_response = FileResponse(
+                _FileRange(file.open("rb"), start, end - start + 1),
+                status=206,
+                content_type=content_type,
+                as_attachment=as_attachment,
+                filename=filename,
+            )
+            file_response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            file_response["Content-Length"] = end - start + 1
+
+        file_response.streaming_content = streaming_content(
+            request, file_response.streaming_content
+        )
+        response = file_response
+
+    for header in ("ETag", "Last-Modified", "Accept-Ranges", "Cache-Control"):
+        response[header] = validators[header]
+
+    return response
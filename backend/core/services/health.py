@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from app_settings import project_settings
+from core.security.clamav import get_async_clamav_client
+
+logger = logging.getLogger(__name__)
+
+CHECK_OK = "ok"
+CHECK_ERROR = "error"
+CHECK_DISABLED = "disabled"
+
+
+@dataclass
+class CheckResult:
+    status: str
+    latency: float = 0.0
+    checked_at: float = field(default_factory=time.monotonic)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"status": self.status, "latency_ms": round(self.latency * 1000, 1)}
+
+
+@dataclass
+class DependencyCheck:
+    """
+    A readiness check whose result is reused for ``HEALTH_CHECK_CACHE_SECONDS``,
+    so frequent probes do not reach the dependency every time.
+
+    ``probe`` returns ``False`` if the dependency is disabled and raises if it is
+    unavailable. It runs on the event loop; blocking probes are wrapped with
+    ``sync_to_async``.
+    """
+
+    name: str
+    probe: Callable[[], Awaitable[bool]]
+    _result: CheckResult | None = None
+    _pending: "asyncio.Task[CheckResult] | None" = None
+
+    def _fresh(self) -> CheckResult | None:
+        result = self._result
+        if result is None:
+            return None
+
+        age = time.monotonic() - result.checked_at
+        return result if age < project_settings.HEALTH_CHECK_CACHE_SECONDS else None
+
+    async def result(self) -> CheckResult:
+        result = self._fresh()
+        if result is not None:
+            return result
+
+        # Concurrent probes wait for one check instead of each running it.
+        loop = asyncio.get_running_loop()
+        pending = self._pending
+        if pending is None or pending.done() or pending.get_loop() is not loop:
+            pending = self._pending = loop.create_task(self._run())
+
+        return await asyncio.shield(pending)
+
+    async def _run(self) -> CheckResult:
+        started = time.perf_counter()
+        try:
+            status = CHECK_OK if await self.probe() else CHECK_DISABLED
+        except Exception:
+            logger.exception("Readiness check %s failed", self.name)
+            status = CHECK_ERROR
+
+        self._result = CheckResult(status=status, latency=time.perf_counter() - started)
+        return self._result
+
+    def reset(self) -> None:
+        self._result = None
+        self._pending = None
+
+
+def _check_database() -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+    return True
+
+
+async def _check_clamav() -> bool:
+    if not project_settings.CLAMAV_ENABLED:
+        return False
+
+    await get_async_clamav_client().ping()
+    return True
+
+
+def _check_media() -> bool:
+    with tempfile.NamedTemporaryFile(dir=settings.MEDIA_ROOT, prefix=".ready-") as file:
+        file.write(b"ok")
+        file.flush()
+    return True
+
+
+def _check_cache() -> bool:
+    key = f"readiness:{uuid.uuid4().hex}"
+    cache.set(key, "ok", timeout=10)
+    try:
+        if cache.get(key) != "ok":
+            raise RuntimeError("Cache did not return the value just written")
+    finally:
+        cache.delete(key)
+    return True
+
+
+READINESS_CHECKS = (
+    DependencyCheck("database", sync_to_async(_check_database)),
+    DependencyCheck("clamav", _check_clamav),
+    DependencyCheck("media", sync_to_async(_check_media)),
+    DependencyCheck("cache", sync_to_async(_check_cache)),
+)
+
+
+async def readiness() -> tuple[bool, dict[str, CheckResult]]:
+    """
+    Results of the readiness checks by dependency, and whether none of them
+    failed.
+    """
+    results = {check.name: await check.result() for check in READINESS_CHECKS}
+    ready = all(result.status != CHECK_ERROR for result in results.values())
+    return ready, results
+
+
+def reset_readiness_checks() -> None:
+    for check in READINESS_CHECKS:
+        check.reset()
@@ -0,0 +1,238 @@
+import logging
+import os
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Any
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from core.services.background import run_in_background
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ImageVariantSpec:
+    """
+    A resized copy of an uploaded image.
+
+    Attributes:
+        name: The variant key exposed to API clients.
+        max_size: The longest side in pixels, or None to keep the original size.
+    """
+
+    name: str
+    max_size: int | None
+
+
+@dataclass(frozen=True)
+class ImageVariantsRegistration:
+    """
+    Links an image field to the JSON field holding the storage names of its variants.
+    """
+
+    model: type[models.Model]
+    image_field: str
+    variants_field: str
+
+
+IMAGE_VARIANTS = (
+    ImageVariantSpec("thumbnail", 320),
+    ImageVariantSpec("screen", 1600),
+    ImageVariantSpec("original", None),
+)
+
+IMAGE_FORMATS: dict[str, tuple[str, str, dict[str, Any]]] = {
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+_registry: dict[str, ImageVariantsRegistration] = {}
+
+# Sent with ``instance`` once the variants of its image are stored on the row.
+image_variants_generated = Signal()
+
+
+def register_image_variants(
+    model: type[models.Model],
+    *,
+    image_field: str,
+    variants_field: str,
+) -> None:
+    """
+    Generates variants of ``image_field`` in the background whenever its file changes
+    and deletes them together with the row.
+    """
+    registration = ImageVariantsRegistration(model, image_field, variants_field)
+    _registry[model._meta.label] = registration
+
+    post_save.connect(
+        _schedule_on_save,
+        sender=model,
+        dispatch_uid=f"image_variants_save_{model._meta.label}",
+    )
+    post_delete.connect(
+        _schedule_on_delete,
+        sender=model,
+        dispatch_uid=f"image_variants_delete_{model._meta.label}",
+    )
+
+
+def registered_image_variants() -> list[ImageVariantsRegistration]:
+    return list(_registry.values())
+
+
+def variants_are_current(instance: models.Model) -> bool:
+    registration = _registry[instance._meta.label]
+    source = getattr(instance, registration.image_field).name or ""
+    variants = getattr(instance, registration.variants_field) or {}
+    return bool(variants.get("source", "") == source)
+
+
+def _schedule_on_save(sender: type[models.Model], instance: Any, **kwargs: Any) -> None:
+    if kwargs.get("raw") or variants_are_current(instance):
+        return
+
+    registration = _registry[sender._meta.label]
+    run_in_background(
+        generate_image_variants,
+        sender._meta.label,
+        instance.pk,
+        getattr(instance, registration.image_field).name or "",
+    )
+
+
+def _schedule_on_delete(
+    sender: type[models.Model], instance: Any, **kwargs: Any
+) -> None:
+    registration = _registry[sender._meta.label]
+    variants = getattr(instance, registration.variants_field) or {}
+    field = sender._meta.get_field(registration.image_field)
+
+    if isinstance(field, models.FileField) and variant_file_names(variants):
+        run_in_background(delete_variant_files, field.storage, variants)
+
+
+def variant_file_names(variants: dict[str, Any]) -> set[str]:
+    return {
+        name
+        for key, formats in variants.items()
+        if key != "source" and isinstance(formats, dict)
+        for name in formats.values()
+    }
+
+
+def delete_variant_files(
+    storage: Storage, variants: dict[str, Any], keep: set[str] | None = None
+) -> None:
+    for name in variant_file_names(variants) - (keep or set()):
+        storage.delete(name)
+
+
+def _variant_name(source: str, variant: str, extension: str) -> str:
+    root, _ext = os.path.splitext(source)
+    return f"{root}.{variant}.{extension}"
+
+
+def _encode(image: Image.Image, image_format: str, options: dict[str, Any]) -> bytes:
+    if image_format == "JPEG" and image.mode != "RGB":
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        rgba = image.convert("RGBA")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        image = background
+
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return buffer.getvalue()
+
+
+def render_image_variants(field_file: FieldFile) -> dict[str, dict[str, str]]:
+    """
+    Writes every variant of ``field_file`` next to the original and returns their
+    storage names as ``{variant: {format: name}}``.
+    """
+    source_name = field_file.name
+    if not source_name:
+        return {}
+
+    with field_file.open("rb") as f, Image.open(f) as source:
+        image = ImageOps.exif_transpose(source)
+
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+        variants: dict[str, dict[str, str]] = {}
+
+        for spec in IMAGE_VARIANTS:
+            resized = image.copy()
+            if spec.max_size is not None:
+                resized.thumbnail(
+                    (spec.max_size, spec.max_size), Image.Resampling.LANCZOS
+                )
+
+            variants[spec.name] = {}
+            for key, (image_format, extension, options) in IMAGE_FORMATS.items():
+                name = field_file.storage.save(
+                    _variant_name(source_name, spec.name, extension),
+                    ContentFile(_encode(resized, image_format, options)),
+                )
+                variants[spec.name][key] = name
+
+    return variants
+
+
+def generate_image_variants(model_label: str, pk: Any, source_name: str) -> None:
+    """
+    Renders the variants of a registered image field and stores their names on the row.
+
+    Does nothing if the image has changed since the task was scheduled; the newer save
+    schedules its own task. Variants of the previous image are deleted once the row
+    points at the new ones.
+    """
+    registration = _registry[model_label]
+    model = apps.get_model(model_label)
+    instance = model._base_manager.filter(pk=pk).first()
+
+    if instance is None:
+        return
+
+    field_file = getattr(instance, registration.image_field)
+    if (field_file.name or "") != source_name:
+        return
+
+    previous = getattr(instance, registration.variants_field) or {}
+    variants: dict[str, Any] = {"source": source_name}
+
+    if source_name:
+        try:
+            variants.update(render_image_variants(field_file))
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+            logger.warning(
+                "Could not render image variants for %s %s (%s)",
+                model_label,
+                pk,
+                source_name,
+                exc_info=True,
+            )
+
+    updated = model._base_manager.filter(
+        pk=pk, **{registration.image_field: source_name}
+    ).update(**{registration.variants_field: variants})
+
+    if not updated:
+        delete_variant_files(field_file.storage, variants)
+        return
+
+    delete_variant_files(
+        field_file.storage, previous, keep=variant_file_names(variants)
+    )
+
+    setattr(instance, registration.variants_field, variants)
+    image_variants_generated.send(sender=model, instance=instance)
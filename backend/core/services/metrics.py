@@ -0,0 +1,142 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    multiprocess,
+)
+
+from core.services.request_timing import RequestTimings, resource_name
+
+# With this environment variable set before the first import of prometheus_client,
+# every process writes its samples to memory-mapped files in that directory and
+# /metrics sums them up, so all gunicorn workers are reported together. The
+# directory must be emptied before the workers start.
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+KB = 1024
+MB = 1024 * KB
+
+REQUEST_LATENCY = Histogram(
+    "mixity_http_request_duration_seconds",
+    "Time to respond to a request.",
+    ["view", "method", "status"],
+)
+REQUEST_DB_TIME = Histogram(
+    "mixity_http_request_db_seconds",
+    "Time a request spent running SQL statements.",
+    ["view"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "mixity_http_request_db_queries",
+    "SQL statements run by a request.",
+    ["view"],
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+CACHE_LOOKUPS = Counter(
+    "mixity_cache_lookups",
+    "Cache lookups by result (hit or miss).",
+    ["cache", "result"],
+)
+CLAMAV_LATENCY = Histogram(
+    "mixity_clamav_command_duration_seconds",
+    "Time clamd took to answer a command.",
+    ["command"],
+)
+CLAMAV_FAILURES = Counter(
+    "mixity_clamav_failures",
+    "clamd commands that failed because ClamAV was unreachable.",
+    ["command"],
+)
+UPLOAD_SIZE = Histogram(
+    "mixity_upload_size_bytes",
+    "Size of uploaded files.",
+    ["field"],
+    buckets=(10 * KB, 100 * KB, MB, 5 * MB, 10 * MB, 25 * MB, 50 * MB, 100 * MB),
+)
+EXPORT_DURATION = Histogram(
+    "mixity_export_duration_seconds",
+    "Time to produce an export.",
+    ["export"],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+
+def metrics_registry() -> CollectorRegistry:
+    """
+    The registry to expose: the samples of all processes in multiprocess mode,
+    otherwise those of this process.
+    """
+    path = os.environ.get(MULTIPROC_DIR_ENV)
+    if not path:
+        return REGISTRY
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=path)
+    return registry
+
+
+def view_label(request: HttpRequest) -> str:
+    # Unresolved paths are not used as labels, so scanners cannot add series.
+    if getattr(request, "resolver_match", None) is None:
+        return "unresolved"
+
+    return resource_name(request)
+
+
+def observe_request(
+    request: HttpRequest,
+    response: HttpResponseBase,
+    timings: RequestTimings,
+    total: float,
+) -> None:
+    view = view_label(request)
+
+    REQUEST_LATENCY.labels(view, request.method, response.status_code).observe(total)
+    REQUEST_DB_TIME.labels(view).observe(timings.db_time)
+    REQUEST_DB_QUERIES.labels(view).observe(timings.db_queries)
+
+
+def count_cache_lookup(cache: str, *, hit: bool) -> None:
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+@contextmanager
+def observe_clamav(command: str) -> Iterator[None]:
+    """
+    Records how long the clamd command in the block took, and counts it as failed
+    if the block raises.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        CLAMAV_FAILURES.labels(command).inc()
+        raise
+    finally:
+        CLAMAV_LATENCY.labels(command).observe(time.perf_counter() - started)
+
+
+def count_clamav_failure(command: str) -> None:
+    CLAMAV_FAILURES.labels(command).inc()
+
+
+def observe_upload(field: str, size: int) -> None:
+    UPLOAD_SIZE.labels(field).observe(size)
+
+
+@contextmanager
+def observe_export(export: str) -> Iterator[None]:
+    """
+    Records how long the block took to produce ``export``, if it completed.
+    """
+    started = time.perf_counter()
+    yield
+    EXPORT_DURATION.labels(export).observe(time.perf_counter() - started)
@@ -0,0 +1,287 @@
+import heapq
+import itertools
+import json
+import logging
+import time
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+
+from app_settings import project_settings
+from core.services.slow_queries import (
+    CapturedQuery,
+    capture_query,
+    explaining,
+    slow_query_threshold,
+)
+
+logger = logging.getLogger(__name__)
+
+# Slow statements kept per request, SQL shortened to this many characters.
+STATEMENT_MAX_LENGTH = 500
+
+_sequence = itertools.count()
+
+
+@dataclass
+class RequestTimings:
+    """
+    Time spent by the current request in SQL and in named phases (``serialize``,
+    ``render``, ``clamav``, ``file``), in seconds.
+    """
+
+    started: float = field(default_factory=time.perf_counter)
+    db_queries: int = 0
+    db_time: float = 0.0
+    phases: dict[str, float] = field(default_factory=dict)
+    # Min-heap of (duration, sequence, sql) holding the slowest statements.
+    slowest: list[tuple[float, int, str]] = field(default_factory=list)
+    # Statements over SLOW_QUERY_CAPTURE_MS, with their plans.
+    captured: list[CapturedQuery] = field(default_factory=list)
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def add_query(self, sql: str, seconds: float) -> None:
+        self.db_queries += 1
+        self.db_time += seconds
+
+        entry = (seconds, next(_sequence), sql)
+        if len(self.slowest) < project_settings.REQUEST_SLOW_STATEMENTS:
+            heapq.heappush(self.slowest, entry)
+        elif self.slowest and seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, entry)
+
+    def slowest_statements(self) -> list[dict[str, Any]]:
+        return [
+            {"ms": round(seconds * 1000, 2), "sql": sql[:STATEMENT_MAX_LENGTH]}
+            for seconds, _sequence, sql in sorted(self.slowest, reverse=True)
+        ]
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """
+    Statements a ``GET`` request to a view may run: at most ``max_queries`` if set
+    and, if ``constant``, no more for many rows than for one, so serializers cannot
+    slip into N+1 queries.
+
+    ``max_queries`` counts every statement of the request, including the few that
+    authenticate the user and load their permissions.
+    """
+
+    max_queries: int | None = None
+    constant: bool = True
+
+
+_current: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Adds the time spent in the block to ``phase`` of the current request; does
+    nothing outside a request.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - started)
+
+
+def timed_function(phase: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timed(phase):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _time_query(
+    execute: Callable[..., Any],
+    sql: str,
+    params: Any,
+    many: bool,
+    context: dict[str, Any],
+) -> Any:
+    timings = _current.get()
+    if timings is None or explaining():
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        result = execute(sql, params, many, context)
+    finally:
+        seconds = time.perf_counter() - started
+        timings.add_query(sql, seconds)
+
+    threshold = slow_query_threshold()
+    if threshold is not None and seconds >= threshold:
+        timings.captured.append(capture_query(sql, params, many, context, seconds))
+
+    return result
+
+
+def _wrap_connections(stack: ExitStack) -> None:
+    for alias in connections:
+        stack.enter_context(connections[alias].execute_wrapper(_time_query))
+
+
+@contextmanager
+def request_timings() -> Iterator[RequestTimings]:
+    """
+    Collects ``RequestTimings`` for the block, timing every statement on every
+    configured database through ``execute_wrapper``.
+    """
+    timings = RequestTimings()
+    token = _current.set(timings)
+
+    try:
+        with ExitStack() as stack:
+            _wrap_connections(stack)
+            yield timings
+    finally:
+        _current.reset(token)
+
+
+@asynccontextmanager
+async def async_request_timings() -> AsyncIterator[RequestTimings]:
+    """
+    ``request_timings`` for requests served under ASGI. Database connections belong
+    to the thread that runs the request's ``sync_to_async`` calls, so the wrappers
+    are installed there rather than on the event loop's thread.
+    """
+    timings = RequestTimings()
+    token = _current.set(timings)
+
+    try:
+        stack = ExitStack()
+        await sync_to_async(_wrap_connections)(stack)
+        try:
+            yield timings
+        finally:
+            await sync_to_async(stack.close)()
+    finally:
+        _current.reset(token)
+
+
+def view_class(request: HttpRequest) -> type | None:
+    """
+    The class of the view that handled the request, ``None`` for function views and
+    unresolved URLs.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return None
+
+    return getattr(match.func, "view_class", None) or getattr(match.func, "cls", None)
+
+
+def resource_name(request: HttpRequest) -> str:
+    """
+    The ``resource_name`` of the view that handled the request, falling back to the
+    URL name or the path.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return request.path
+
+    return (
+        getattr(view_class(request), "resource_name", "")
+        or match.view_name
+        or request.path
+    )
+
+
+def query_budget_limit(request: HttpRequest) -> int | None:
+    """
+    The ``max_queries`` of the ``query_budget`` declared by the view that handled
+    the request, for ``GET`` and ``HEAD`` requests only.
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+
+    budget = getattr(view_class(request), "query_budget", None)
+    return budget.max_queries if budget is not None else None
+
+
+def server_timing_header(timings: RequestTimings, total: float) -> str:
+    metrics = [
+        f'db;desc="{timings.db_queries} queries";dur={timings.db_time * 1000:.1f}'
+    ]
+    metrics += [
+        f"{phase};dur={seconds * 1000:.1f}"
+        for phase, seconds in sorted(timings.phases.items())
+    ]
+    metrics.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(metrics)
+
+
+def log_request_timings(
+    request: HttpRequest,
+    response: HttpResponseBase,
+    timings: RequestTimings,
+    total: float,
+) -> None:
+    """
+    Logs one JSON line per request. Requests slower than ``REQUEST_SLOW_MS``, with
+    more than ``REQUEST_SLOW_QUERIES`` statements or over the view's query budget
+    are logged as warnings with their slowest statements.
+    """
+    budget = query_budget_limit(request)
+    over_budget = budget is not None and timings.db_queries > budget
+    slow = (
+        over_budget
+        or total * 1000 >= project_settings.REQUEST_SLOW_MS
+        or timings.db_queries > project_settings.REQUEST_SLOW_QUERIES
+    )
+    level = logging.WARNING if slow else logging.INFO
+    if not logger.isEnabledFor(level):
+        return
+
+    if over_budget:
+        event = "query_budget_exceeded"
+    elif slow:
+        event = "slow_request"
+    else:
+        event = "request"
+
+    record: dict[str, Any] = {
+        "event": event,
+        "resource": resource_name(request),
+        "method": request.method,
+        "path": request.path,
+        "status": response.status_code,
+        "duration_ms": round(total * 1000, 1),
+        "db_queries": timings.db_queries,
+        "db_ms": round(timings.db_time * 1000, 1),
+    }
+    record.update(
+        (f"{phase}_ms", round(seconds * 1000, 1))
+        for phase, seconds in sorted(timings.phases.items())
+    )
+    if over_budget:
+        record["query_budget"] = budget
+    if slow:
+        record["slowest_statements"] = timings.slowest_statements()
+
+    logger.log(level, json.dumps(record, ensure_ascii=False))
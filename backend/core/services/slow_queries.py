@@ -0,0 +1,158 @@
+import logging
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+from app_settings import project_settings
+
+logger = logging.getLogger(__name__)
+
+# Project frames kept from the stack of a slow statement.
+STACK_DEPTH = 15
+
+_explaining: ContextVar[bool] = ContextVar("explaining_slow_query", default=False)
+
+_SKIPPED_FRAMES = (
+    str(Path(__file__)),
+    str(Path(__file__).with_name("request_timing.py")),
+)
+
+
+@dataclass
+class CapturedQuery:
+    database: str
+    duration: float
+    sql: str
+    plan: str
+    stack: str
+
+
+def explaining() -> bool:
+    """
+    Whether the current statement is an ``EXPLAIN`` run by this module, which the
+    request timings leave out.
+    """
+    return _explaining.get()
+
+
+@contextmanager
+def _explain_block() -> Iterator[None]:
+    token = _explaining.set(True)
+    try:
+        yield
+    finally:
+        _explaining.reset(token)
+
+
+def slow_query_threshold() -> float | None:
+    """
+    ``SLOW_QUERY_CAPTURE_MS`` in seconds, ``None`` while capture is disabled.
+    """
+    threshold = project_settings.SLOW_QUERY_CAPTURE_MS
+    return threshold / 1000 if threshold is not None else None
+
+
+def explain_plan(connection: BaseDatabaseWrapper, sql: str, params: Any) -> str:
+    """
+    Returns the plan of a statement: ``EXPLAIN (ANALYZE, BUFFERS)`` on PostgreSQL
+    for ``SELECT`` statements, which it runs again, plain ``EXPLAIN`` for statements
+    that write, and ``EXPLAIN QUERY PLAN`` on SQLite.
+
+    The statement is explained inside a savepoint, so a failure does not break the
+    transaction of the request; the error is returned instead of the plan.
+    """
+    if connection.vendor == "postgresql":
+        is_select = sql.lstrip()[:6].upper() == "SELECT"
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) " if is_select else "EXPLAIN "
+    elif connection.vendor == "sqlite":
+        prefix = "EXPLAIN QUERY PLAN "
+    else:
+        prefix = "EXPLAIN "
+
+    try:
+        with _explain_block(), transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(prefix + sql, params)
+                rows = cursor.fetchall()
+    except DatabaseError as exc:
+        return f"EXPLAIN failed: {exc}"
+
+    return "\n".join(" ".join(str(value) for value in row) for row in rows)
+
+
+def project_stack() -> str:
+    """
+    The frames of the current stack that belong to the project, innermost last.
+    """
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame
+        for frame in traceback.extract_stack()
+        if frame.filename.startswith(base_dir)
+        and "site-packages" not in frame.filename
+        and frame.filename not in _SKIPPED_FRAMES
+    ]
+    return "".join(traceback.format_list(frames[-STACK_DEPTH:]))
+
+
+def capture_query(
+    sql: str, params: Any, many: bool, context: dict[str, Any], seconds: float
+) -> CapturedQuery:
+    connection = context["connection"]
+
+    try:
+        statement = connection.ops.last_executed_query(context["cursor"], sql, params)
+    except Exception:
+        statement = sql
+
+    return CapturedQuery(
+        database=connection.alias,
+        duration=seconds,
+        sql=str(statement),
+        # executemany has no single statement to explain.
+        plan="" if many else explain_plan(connection, sql, params),
+        stack=project_stack(),
+    )
+
+
+def store_slow_queries(
+    captured: list[CapturedQuery], *, resource: str, method: str, path: str
+) -> None:
+    """
+    Saves the captured statements of a request and drops the oldest rows beyond
+    ``SLOW_QUERY_BUFFER_SIZE``.
+    """
+    from core.models import SlowQuery
+
+    try:
+        SlowQuery.objects.bulk_create(
+            SlowQuery(
+                duration_ms=round(query.duration * 1000, 2),
+                database=query.database,
+                resource=resource[:255],
+                method=method[:10],
+                path=path[:2048],
+                sql=query.sql,
+                plan=query.plan,
+                stack=query.stack,
+            )
+            for query in captured
+        )
+
+        size = project_settings.SLOW_QUERY_BUFFER_SIZE
+        oldest_kept = list(
+            SlowQuery.objects.order_by("-id").values_list("id", flat=True)[
+                size - 1 : size
+            ]
+        )
+        if oldest_kept:
+            SlowQuery.objects.filter(id__lt=oldest_kept[0]).delete()
+    except DatabaseError:
+        logger.exception("Could not store slow queries of %s %s", method, path)
@@ -0,0 +1,83 @@
+import logging
+import time
+from typing import Callable
+
+import phonenumbers
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.urls import get_resolver, reverse
+
+logger = logging.getLogger(__name__)
+
+# Phone number fields parse numbers for this region.
+PHONE_REGION = "RU"
+PHONE_SAMPLE = "+79991234567"
+
+
+def _warm_urls() -> None:
+    # Imports every view module and builds the reverse lookup tables.
+    get_resolver().url_patterns
+    reverse("health-live")
+
+
+def _warm_models() -> None:
+    for model in apps.get_models():
+        model._meta.get_fields()
+
+
+def _warm_phone_numbers() -> None:
+    # Region metadata is loaded from its module on the first parse.
+    phonenumbers.is_valid_number(phonenumbers.parse(PHONE_SAMPLE, PHONE_REGION))
+
+
+def _warm_schema() -> None:
+    from drf_spectacular.generators import SchemaGenerator
+
+    SchemaGenerator().get_schema(request=None, public=True)
+
+
+def warm_up() -> dict[str, float]:
+    """
+    Builds the per-process state the first requests would otherwise build, and
+    returns how long each step took in seconds.
+
+    Meant for the gunicorn master once the application is loaded, so forked workers
+    start with it. No step touches the database. The OpenAPI schema is only
+    generated when the schema views are mounted, that is with ``DEBUG``.
+    """
+    steps: dict[str, Callable[[], None]] = {
+        "urls": _warm_urls,
+        "models": _warm_models,
+        "phone numbers": _warm_phone_numbers,
+    }
+    if settings.DEBUG:
+        steps["schema"] = _warm_schema
+
+    durations: dict[str, float] = {}
+    for name, step in steps.items():
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            # A cold cache only slows the first requests down.
+            logger.exception("Warm-up step %s failed", name)
+        durations[name] = time.perf_counter() - started
+
+    return durations
+
+
+def close_database_connections() -> None:
+    """
+    Closes the process's database connections and connection pools, so that none
+    are shared with processes forked from it.
+    """
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+        # Reading ``pool`` would create a pool just to close it.
+        if connection.alias not in getattr(connection, "_connection_pools", {}):
+            continue
+        # Only the PostgreSQL backend has connection pools.
+        close_pool = getattr(connection, "close_pool", None)
+        if close_pool is not None:
+            close_pool()
@@ -11,6 +11,7 @@ from core.tests.crud_tests import CrudContractMixin
 from core.tests.field_matching_tests import FieldContractMixin
 from core.tests.model_tests import ModelContractMixin
 from core.tests.permission_tests import PermissionContractMixin
+from core.tests.query_budget_tests import QueryBudgetContractMixin
 from core.tests.queryset_tests import QuerysetContractMixin
 from core.tests.utils import TestLoggerMixin, UploadSpec
 from core.tests.validation_tests import ValidationContractMixin
@@ -46,6 +47,7 @@ class BaseAPIContractTestCase(
     SoftDeleteContractMixin,
     ReadOnlyActiveFieldContractMixin,
     QuerysetContractMixin,
+    QueryBudgetContractMixin,
     AuthenticationContractMixin,
     BaseTestCase,
 ):
@@ -0,0 +1,74 @@
+from typing import TYPE_CHECKING, Any, Callable
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+from rest_framework.reverse import reverse
+
+if TYPE_CHECKING:
+    from core.tests.type_stubs import BaseMixinProto as _Base
+else:
+    _Base = object
+
+
+class QueryBudgetContractMixin(_Base):
+    """
+    Checks the ``query_budget`` a view declares against the statements its ``GET``
+    endpoint actually runs.
+    """
+
+    def _count_queries(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def _assert_query_budget(
+        self,
+        url: str,
+        seed: Callable[[], Any],
+        rows: int = 5,
+    ) -> None:
+        """
+        Counts the statements of the endpoint after ``seed`` adds one row and again
+        after it adds ``rows - 1`` more, and asserts that both stay within the view's
+        ``max_queries`` and, for a constant budget, are equal.
+        """
+        view_class = getattr(resolve(url).func, "view_class")
+        budget = getattr(view_class, "query_budget", None)
+        assert budget is not None, f"{url}: no query_budget declared"
+        self._logger_header(f"QUERY BUDGET GET: {url}")
+
+        seed()
+        single = self._count_queries(url)
+
+        for _ in range(rows - 1):
+            seed()
+        many = self._count_queries(url)
+
+        if budget.max_queries is not None:
+            self.assertLessEqual(
+                many,
+                budget.max_queries,
+                f"{url}: {many} queries, budget {budget.max_queries}",
+            )
+        if budget.constant:
+            self.assertEqual(
+                many,
+                single,
+                f"{url}: {single} queries for 1 row, {many} for {rows} rows",
+            )
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}✓ Query budget held: "
+            f"{single} queries for 1 row, {many} for {rows} rows{self.COLOR['END']}"
+        )
+
+    def _query_budget_logic(self, rows: int = 5) -> None:
+        """
+        Checks the budget of the list endpoint at ``url_name`` with rows created by
+        the test's ``factory``.
+        """
+        assert self.url_name is not None
+        self._assert_query_budget(reverse(self.url_name), self.factory.create, rows)
@@ -0,0 +1,124 @@
+import zipfile
+from collections.abc import AsyncIterator
+from io import BytesIO
+from typing import cast
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http.response import HttpResponseBase, StreamingHttpResponse
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from common.models import Documentation
+from common.routes import DocumentationRoutes
+from common.services.documentation_bundles import purge_documentation_bundles
+from core.services.health import reset_readiness_checks
+from core.tests.utils import TestLoggerMixin
+from order.routes import OrderRoutes
+
+
+async def read_streaming(response: HttpResponseBase) -> bytes:
+    """
+    Reads the body of a response streamed from an asynchronous iterator.
+    """
+    assert isinstance(response, StreamingHttpResponse) and response.is_async
+    content = cast(AsyncIterator[bytes], response.streaming_content)
+    return b"".join([chunk async for chunk in content])
+
+
+class TestAsgiRequests(TestCase, TestLoggerMixin):
+    """
+    Requests served by Django's ASGI handler, as under uvicorn workers.
+    """
+
+    def setUp(self) -> None:
+        user = get_user_model().objects.create_superuser(
+            username="asgi_admin",
+            email="asgi_admin@example.com",
+            password="test_password",
+        )
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(user)}"}
+        self.content = b"%PDF-1.7 " + b"x" * 200_000
+        self.document = Documentation.objects.create(
+            title="passport.pdf", file=SimpleUploadedFile("passport.pdf", self.content)
+        )
+        purge_documentation_bundles()
+        reset_readiness_checks()
+
+    async def test_download_streamed_asynchronously(self) -> None:
+        self._logger_header("TEST: ASGI file download")
+        url = reverse(
+            f"common:{DocumentationRoutes.DOWNLOAD.name}", args=[self.document.pk]
+        )
+
+        response = await self.async_client.get(url, headers=self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(await read_streaming(response), self.content)
+        # SQL run in the request's thread is still timed.
+        self.assertRegex(response["Server-Timing"], r'^db;desc="[1-9]\d* queries"')
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ File sent chunk by chunk, SQL timed across threads"
+            f"{self.COLOR['END']}"
+        )
+
+    async def test_bulk_download_streamed_asynchronously(self) -> None:
+        self._logger_header("TEST: ASGI bulk ZIP download")
+        url = reverse(f"common:{DocumentationRoutes.DOWNLOAD_ZIP.name}")
+
+        for _source in ("streamed", "cached"):
+            response = await self.async_client.post(
+                url,
+                {"ids": [self.document.pk]},
+                content_type="application/json",
+                headers=self.headers,
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            archive = zipfile.ZipFile(BytesIO(await read_streaming(response)))
+            self.assertEqual(archive.read(archive.namelist()[0]), self.content)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Fresh and cached archives streamed without buffering"
+            f"{self.COLOR['END']}"
+        )
+
+    async def test_drf_errors_handled_in_async_views(self) -> None:
+        self._logger_header("TEST: ASGI authentication errors")
+        url = reverse(f"order_orders:{OrderRoutes.VIEW_UPD.name}", kwargs={"pk": 1})
+
+        anonymous = await self.async_client.get(url)
+        missing = await self.async_client.get(
+            reverse(f"common:{DocumentationRoutes.DOWNLOAD.name}", args=[999999]),
+            headers=self.headers,
+        )
+
+        self.assertEqual(anonymous.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(missing.status_code, status.HTTP_404_NOT_FOUND)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ DRF authentication and 404 responses from async views"
+            f"{self.COLOR['END']}"
+        )
+
+    async def test_health_checks(self) -> None:
+        self._logger_header("TEST: ASGI health checks")
+
+        live = await self.async_client.get(reverse("health-live"))
+        ready = await self.async_client.get(reverse("health-ready"))
+
+        self.assertEqual(live.status_code, status.HTTP_200_OK)
+        self.assertEqual(ready.status_code, status.HTTP_200_OK)
+        self.assertEqual(ready.json()["checks"]["database"]["status"], "ok")
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Liveness and readiness answered by async views"
+            f"{self.COLOR['END']}"
+        )
@@ -0,0 +1,154 @@
+import os
+import time
+from io import StringIO
+from tempfile import TemporaryDirectory
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from common.models import Documentation
+from core.services.blob_storage import (
+    blob_directories,
+    blob_reference_counts,
+    get_blob_storage,
+    sweep_unreferenced_blobs,
+)
+from core.tests.utils import TestLoggerMixin
+
+
+@pytest.mark.django_db
+class TestContentAddressedStorage(TestCase, TestLoggerMixin):
+    def setUp(self) -> None:
+        temp_media = TemporaryDirectory()
+        self.addCleanup(temp_media.cleanup)
+        override_media = override_settings(MEDIA_ROOT=temp_media.name)
+        override_media.enable()
+        self.addCleanup(override_media.disable)
+
+        self.storage = get_blob_storage()
+
+    def _document(
+        self, title: str, content: bytes, name: str = "doc.pdf"
+    ) -> Documentation:
+        document = Documentation(title=title)
+        document.file.save(name, ContentFile(content), save=True)
+        return document
+
+    def _age(self, name: str, seconds: int) -> None:
+        past = time.time() - seconds
+        os.utime(self.storage.path(name), (past, past))
+
+    def test_identical_content_shares_one_blob(self) -> None:
+        self._logger_header("TEST: identical uploads share one blob")
+        first = self._document("Паспорт", b"%PDF-1.7 same")
+        second = self._document("Паспорт (копия)", b"%PDF-1.7 same")
+        renamed = self._document("Паспорт", b"%PDF-1.7 same", name="copy.pdf")
+        other = self._document("Сертификат", b"%PDF-1.7 other")
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertNotEqual(first.file.name, other.file.name)
+        self.assertTrue(first.file.name.startswith("docs/"))
+        self.assertTrue(first.file.name.endswith("/doc.pdf"))
+
+        self.assertEqual(
+            os.path.dirname(renamed.file.name), os.path.dirname(first.file.name)
+        )
+        self.assertTrue(renamed.file.name.endswith("/copy.pdf"))
+        self.assertTrue(
+            os.path.samefile(
+                self.storage.path(first.file.name), self.storage.path(renamed.file.name)
+            )
+        )
+
+        counts = blob_reference_counts()
+        self.assertEqual(counts[first.file.name], 2)
+        self.assertEqual(counts[renamed.file.name], 1)
+        self.assertEqual(counts[other.file.name], 1)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Same bytes stored once, each upload keeps its file name"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_sweep_keeps_referenced_and_fresh_blobs(self) -> None:
+        self._logger_header("TEST: sweep deletes only old unreferenced blobs")
+        first = self._document("Паспорт", b"%PDF-1.7 shared")
+        second = self._document("Паспорт (копия)", b"%PDF-1.7 shared")
+        name = first.file.name
+        self._age(name, 2 * 60 * 60)
+
+        first.delete()
+        self.assertEqual(sweep_unreferenced_blobs(), 0)
+        self.assertTrue(self.storage.exists(name))
+
+        second.delete()
+        fresh = self._document("Сертификат", b"%PDF-1.7 fresh")
+        fresh_name = fresh.file.name
+        fresh.delete()
+
+        self.assertEqual(sweep_unreferenced_blobs(), 1)
+        self.assertFalse(self.storage.exists(name))
+        self.assertFalse(os.path.exists(os.path.dirname(self.storage.path(name))))
+        self.assertTrue(self.storage.exists(fresh_name))
+
+        call_command("sweep_media_blobs", "--grace", "0", stdout=StringIO())
+        self.assertFalse(self.storage.exists(fresh_name))
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Shared and recently written blobs survive the sweep"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_reuse_restarts_grace_period(self) -> None:
+        self._logger_header("TEST: reusing a blob protects it from the sweep")
+        document = self._document("Паспорт", b"%PDF-1.7 reused")
+        name = document.file.name
+        document.delete()
+        self._age(name, 2 * 60 * 60)
+
+        document = self._document("Паспорт", b"%PDF-1.7 reused")
+        Documentation.objects.filter(pk=document.pk).delete()
+
+        self.assertEqual(document.file.name, name)
+        self.assertEqual(sweep_unreferenced_blobs(), 0)
+        self.assertTrue(self.storage.exists(name))
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Blob reused before its row is committed is kept"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_sweep_limited_to_blob_directories(self) -> None:
+        self._logger_header("TEST: sweep collects legacy files in blob directories")
+        self.assertEqual(blob_directories(), ["docs", "quarantine/upd"])
+
+        names = {
+            "kept": "docs/kept.pdf",
+            "legacy": "docs/legacy.pdf",
+            "quarantined": "quarantine/upd/legacy.pdf",
+            "elsewhere": "maps/map.png",
+        }
+        for name in names.values():
+            FileSystemStorage().save(name, ContentFile(b"legacy"))
+            self._age(name, 2 * 60 * 60)
+
+        document = self._document("Паспорт", b"%PDF-1.7 kept")
+        Documentation.objects.filter(pk=document.pk).update(file=names["kept"])
+
+        self.assertEqual(sweep_unreferenced_blobs(), 2)
+        self.assertTrue(self.storage.exists(names["kept"]))
+        self.assertFalse(self.storage.exists(names["legacy"]))
+        self.assertFalse(self.storage.exists(names["quarantined"]))
+        self.assertTrue(self.storage.exists(names["elsewhere"]))
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Unreferenced legacy files removed, other media untouched"
+            f"{self.COLOR['END']}"
+        )
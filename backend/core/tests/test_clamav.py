@@ -1,16 +1,73 @@
+import asyncio
+import time
+from io import BytesIO
+from typing import Any, Callable
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from core.security.clamav import (
+    AsyncClamAVClient,
+    ClamAVClient,
+    ClamAVProtocol,
     ClamAVUnavailableError,
     MalwareDetectedError,
+    check_scan_response,
+    close_clamav_clients,
+    get_async_clamav_client,
     scan_file_for_malware,
 )
+from core.security.fake_clamd import EICAR_SIGNATURE, FAKE_CLAMD_VERSION, FakeClamd
 from core.tests.utils import TestLoggerMixin
 
 
+class FakeStreamWriter:
+    """
+    Records what the client sends instead of writing to a socket.
+    """
+
+    def __init__(self) -> None:
+        self.sent: list[bytes] = []
+        self.transport = MagicMock()
+        self._closing = False
+
+    def write(self, data: bytes) -> None:
+        self.sent.append(data)
+
+    async def drain(self) -> None:
+        pass
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self) -> None:
+        self._closing = True
+
+    async def wait_closed(self) -> None:
+        pass
+
+
+def clamd_replies(*replies: bytes) -> tuple[Callable[..., Any], FakeStreamWriter]:
+    """
+    Returns an ``asyncio.open_connection`` replacement whose reader receives
+    ``replies`` one after another, and the writer it hands out.
+    """
+    writer = FakeStreamWriter()
+
+    async def open_connection(host: str, port: int) -> tuple[Any, FakeStreamWriter]:
+        reader = asyncio.StreamReader()
+        loop = asyncio.get_running_loop()
+        for position, reply in enumerate(replies):
+            loop.call_later(position * 0.01, reader.feed_data, reply)
+        return reader, writer
+
+    return open_connection, writer
+
+
 class TestClamAVScanner(TestLoggerMixin):
+    def teardown_method(self) -> None:
+        close_clamav_clients()
+
     @patch("core.security.clamav.project_settings")
     @patch("core.security.clamav.socket.create_connection")
     def test_clean_file(
@@ -26,11 +83,13 @@ class TestClamAVScanner(TestLoggerMixin):
         mock_settings.CLAMAV_HOST = "clamav"
         mock_settings.CLAMAV_PORT = 3310
         mock_settings.CLAMAV_TIMEOUT = 10
+        mock_settings.CLAMAV_POOL_SIZE = 0
+        mock_settings.CLAMAV_POOL_IDLE_TIMEOUT = 20
 
         sock = MagicMock()
         sock.recv.return_value = b"stream: OK\0"
 
-        mock_create_connection.return_value.__enter__.return_value = sock
+        mock_create_connection.return_value = sock
 
         file = MagicMock()
         file.read.side_effect = [
@@ -68,11 +127,13 @@ class TestClamAVScanner(TestLoggerMixin):
         mock_settings.CLAMAV_HOST = "clamav"
         mock_settings.CLAMAV_PORT = 3310
         mock_settings.CLAMAV_TIMEOUT = 10
+        mock_settings.CLAMAV_POOL_SIZE = 0
+        mock_settings.CLAMAV_POOL_IDLE_TIMEOUT = 20
 
         sock = MagicMock()
         sock.recv.return_value = b"stream: Eicar-Test-Signature FOUND\0"
 
-        mock_create_connection.return_value.__enter__.return_value = sock
+        mock_create_connection.return_value = sock
 
         file = MagicMock()
         file.read.side_effect = [
@@ -109,6 +170,8 @@ class TestClamAVScanner(TestLoggerMixin):
         mock_settings.CLAMAV_HOST = "clamav"
         mock_settings.CLAMAV_PORT = 3310
         mock_settings.CLAMAV_TIMEOUT = 10
+        mock_settings.CLAMAV_POOL_SIZE = 0
+        mock_settings.CLAMAV_POOL_IDLE_TIMEOUT = 20
 
         file = MagicMock()
 
@@ -150,3 +213,246 @@ class TestClamAVScanner(TestLoggerMixin):
             "✓ ClamAV scanner is disabled"
             f"{self.COLOR['END']}"
         )
+
+
+class TestClamAVProtocol(TestLoggerMixin):
+    def test_session_requests_and_replies(self) -> None:
+        """
+        Test the bytes sent for commands and the replies parsed from received bytes.
+        """
+        self._logger_header("TEST: clamd protocol without I/O")
+        protocol = ClamAVProtocol(session=True)
+
+        assert protocol.start() == b"zIDSESSION\0"
+        assert list(protocol.request(b"PING")) == [b"zPING\0"]
+        assert list(protocol.request(b"INSTREAM", iter([b"a", b"b"]))) == [
+            b"zINSTREAM\0a",
+            b"b",
+        ]
+        assert list(protocol.request(b"INSTREAM", iter([]))) == [b"zINSTREAM\0\0\0\0\0"]
+
+        protocol.feed(b"1: PO")
+        assert protocol.reply() is None
+        protocol.feed(b"NG\x002: stream: OK\0")
+        assert protocol.reply() == "PONG"
+        assert protocol.reply() == "stream: OK"
+        assert protocol.reused
+
+        protocol.feed(b"4: PONG\0")
+        with pytest.raises(ClamAVUnavailableError, match="Некорректный ответ"):
+            protocol.reply()
+
+        with pytest.raises(ConnectionResetError):
+            protocol.feed(b"")
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Frames joined to commands, split replies parsed, ids checked"
+            f"{self.COLOR['END']}"
+        )
+
+
+class TestClamAVClient(TestLoggerMixin):
+    def test_session_reused_between_scans(self) -> None:
+        """
+        Test that pooled scans share one IDSESSION connection.
+        """
+        self._logger_header("TEST: session reused between scans")
+
+        with FakeClamd() as server:
+            client = ClamAVClient(
+                *server.address, timeout=5, pool_size=2, idle_timeout=20
+            )
+            payload = b"x" * 200_000
+
+            for _ in range(3):
+                assert client.instream(BytesIO(payload)) == "stream: OK"
+
+            assert (
+                client.instream(BytesIO(payload + EICAR_SIGNATURE))
+                == "stream: Eicar-Test-Signature FOUND"
+            )
+            assert client.version() == FAKE_CLAMD_VERSION
+            client.ping()
+            client.close()
+
+            assert server.connections == 1
+            assert server.scans == 4
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Four scans, VERSION and PING served by one connection"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_stale_connection_retried(self) -> None:
+        """
+        Test that a pooled connection closed by clamd is replaced transparently.
+        """
+        self._logger_header("TEST: stale pooled connection retried")
+
+        with FakeClamd() as server:
+            client = ClamAVClient(
+                *server.address, timeout=5, pool_size=1, idle_timeout=20
+            )
+            client.ping()
+            client._idle.connections[0].sock.close()
+
+            assert client.instream(BytesIO(b"content")) == "stream: OK"
+            client.close()
+
+            assert server.connections == 2
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Scan retried on a fresh connection"
+            f"{self.COLOR['END']}"
+        )
+
+    @patch("core.security.clamav.socket.create_connection")
+    def test_partial_responses(self, mock_create_connection: MagicMock) -> None:
+        """
+        Test that responses split across reads and merged in one read are parsed.
+        """
+        self._logger_header("TEST: partial responses")
+        sock = MagicMock()
+        sock.recv.side_effect = [b"1: PO", b"NG\x002: stream", b": OK\0"]
+        mock_create_connection.return_value = sock
+
+        client = ClamAVClient("clamav", 3310, timeout=5, pool_size=1, idle_timeout=20)
+        client.ping()
+
+        assert client.instream(BytesIO(b"content")) == "stream: OK"
+        sock.sendall.assert_any_call(
+            b"zINSTREAM\0\x00\x00\x00\x07content\x00\x00\x00\x00"
+        )
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Split and merged responses parsed, frames coalesced"
+            f"{self.COLOR['END']}"
+        )
+
+
+class TestAsyncClamAVClient(TestLoggerMixin):
+    def test_stale_connection_retried(self) -> None:
+        """
+        Test that a pooled connection closed by clamd is replaced transparently.
+        """
+        self._logger_header("TEST: stale pooled connection retried")
+
+        with FakeClamd() as server:
+            client = AsyncClamAVClient(
+                *server.address, timeout=5, pool_size=1, idle_timeout=20
+            )
+
+            async def scan_after_drop() -> str:
+                await client.ping()
+                client._idle.connections[0].abort()
+                try:
+                    return await client.instream(BytesIO(b"content"))
+                finally:
+                    await client.close()
+
+            assert asyncio.run(scan_after_drop()) == "stream: OK"
+            assert server.connections == 2
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Scan retried on a fresh connection"
+            f"{self.COLOR['END']}"
+        )
+
+    @patch("core.security.clamav.asyncio.open_connection")
+    def test_partial_responses(self, mock_open_connection: MagicMock) -> None:
+        """
+        Test that responses split across reads and merged in one read are parsed.
+        """
+        self._logger_header("TEST: partial responses")
+        mock_open_connection.side_effect, writer = clamd_replies(
+            b"1: PO", b"NG\x002: stream", b": OK\0"
+        )
+
+        client = AsyncClamAVClient(
+            "clamav", 3310, timeout=5, pool_size=1, idle_timeout=20
+        )
+
+        async def ping_and_scan() -> str:
+            await client.ping()
+            return await client.instream(BytesIO(b"content"))
+
+        assert asyncio.run(ping_and_scan()) == "stream: OK"
+        assert b"zINSTREAM\0\x00\x00\x00\x07content\x00\x00\x00\x00" in writer.sent
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Split and merged responses parsed, frames coalesced"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_concurrent_scans_on_one_loop(self) -> None:
+        """
+        Test that scans awaited together run at the same time on one event loop.
+        """
+        self._logger_header("TEST: concurrent scans on one event loop")
+
+        with FakeClamd(latency=0.3) as server:
+            client = AsyncClamAVClient(
+                *server.address, timeout=5, pool_size=4, idle_timeout=20
+            )
+            files = [BytesIO(b"x" * 200_000) for _ in range(3)]
+            files.append(BytesIO(b"x" * 200_000 + EICAR_SIGNATURE))
+
+            async def scan_all() -> list[str]:
+                try:
+                    return await asyncio.gather(*map(client.instream, files))
+                finally:
+                    await client.close()
+
+            started = time.perf_counter()
+            responses = asyncio.run(scan_all())
+            elapsed = time.perf_counter() - started
+
+            assert responses == ["stream: OK"] * 3 + [
+                "stream: Eicar-Test-Signature FOUND"
+            ]
+            assert server.scans == 4
+            # Scanned one after another the four files would take 1.2 s.
+            assert elapsed < 0.9
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Four scans overlapped on separate connections"
+            f"{self.COLOR['END']}"
+        )
+
+    @patch("core.security.clamav.project_settings")
+    def test_async_scan_errors(self, mock_settings: MagicMock) -> None:
+        """
+        Test that the asyncio scan raises the errors of the blocking one.
+        """
+        self._logger_header("TEST: asyncio scan errors")
+
+        with FakeClamd(latency=1) as server:
+            mock_settings.CLAMAV_ENABLED = True
+            mock_settings.CLAMAV_HOST, mock_settings.CLAMAV_PORT = server.address
+            mock_settings.CLAMAV_TIMEOUT = 0.2
+            mock_settings.CLAMAV_POOL_SIZE = 1
+            mock_settings.CLAMAV_POOL_IDLE_TIMEOUT = 20
+
+            async def scan(content: bytes) -> None:
+                client = get_async_clamav_client()
+                check_scan_response(await client.instream(BytesIO(content)))
+
+            with pytest.raises(ClamAVUnavailableError, match="ClamAV недоступен"):
+                asyncio.run(scan(b"content"))
+
+            mock_settings.CLAMAV_TIMEOUT = 5
+            with pytest.raises(MalwareDetectedError):
+                asyncio.run(scan(EICAR_SIGNATURE))
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Timeout and malware reported with the blocking API's errors"
+            f"{self.COLOR['END']}"
+        )
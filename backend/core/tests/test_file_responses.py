@@ -0,0 +1,209 @@
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from app_settings import project_settings
+from common.models import Documentation
+from common.routes import DocumentationRoutes
+from core.tests.utils import TestLoggerMixin
+from order.models import Order
+from order.routes import OrderRoutes
+from order.tests.factories import OrderFactory
+from order.tests.pdf_corpus import small_pdf
+
+
+@pytest.mark.django_db
+class TestServeFile(APITestCase, TestLoggerMixin):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_superuser(
+            username="files_admin",
+            email="files_admin@example.com",
+            password="test_password",
+        )
+        self.client.force_authenticate(user=self.user)
+
+        for patcher in (
+            patch.object(project_settings, "FILE_OFFLOAD_MODE", "x-accel"),
+            patch.object(
+                project_settings, "FILE_OFFLOAD_ACCEL_LOCATION", "/protected-media/"
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.doc = Documentation.objects.create(
+            title="Паспорт", file=SimpleUploadedFile("паспорт.pdf", small_pdf())
+        )
+
+    def test_documentation_offloaded_to_nginx(self) -> None:
+        self._logger_header("TEST: documentation served through X-Accel-Redirect")
+
+        response = self.client.get(
+            reverse(
+                f"common:{DocumentationRoutes.DOWNLOAD.name}",
+                kwargs={"pk": self.doc.pk},
+            )
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertTrue(response["Content-Disposition"].startswith("attachment;"))
+        self.assertTrue(
+            response["X-Accel-Redirect"].startswith("/protected-media/docs/")
+        )
+        self.assertTrue(
+            response["X-Accel-Redirect"].endswith(
+                "/%D0%BF%D0%B0%D1%81%D0%BF%D0%BE%D1%80%D1%82.pdf"
+            )
+        )
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Headers from Django, body left to nginx"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_checks_still_run_before_offload(self) -> None:
+        self._logger_header("TEST: access checks before X-Accel-Redirect")
+        order = OrderFactory.create(
+            upd_pdf=SimpleUploadedFile("upd.pdf", small_pdf()),
+        )
+        url = reverse(
+            f"order_orders:{OrderRoutes.VIEW_UPD.name}", kwargs={"pk": order.pk}
+        )
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_409_CONFLICT)
+
+        Order.objects.filter(pk=order.pk).update(upd_scan_status=Order.ScanStatus.CLEAN)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{order.upd_pdf.name}"
+        )
+
+        self.client.force_authenticate(user=None)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertNotIn("X-Accel-Redirect", response)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Unscanned and anonymous requests never reach nginx"
+            f"{self.COLOR['END']}"
+        )
+
+    @patch.object(project_settings, "FILE_OFFLOAD_MODE", "")
+    def test_python_fallback(self) -> None:
+        self._logger_header("TEST: files streamed by Django without offload")
+
+        response = self.client.get(
+            reverse(
+                f"common:{DocumentationRoutes.DETAIL.name}",
+                kwargs={"pk": self.doc.pk},
+            )
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Accel-Redirect", response)
+        assert isinstance(response, StreamingHttpResponse)
+        with self.doc.file.open("rb") as file:
+            self.assertEqual(b"".join(response.streaming_content), file.read())
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ FileResponse used when offload is off"
+            f"{self.COLOR['END']}"
+        )
+
+    def _detail(self, **headers: str) -> Any:
+        return self.client.get(
+            reverse(
+                f"common:{DocumentationRoutes.DETAIL.name}",
+                kwargs={"pk": self.doc.pk},
+            ),
+            headers=headers,
+        )
+
+    def test_conditional_requests(self) -> None:
+        self._logger_header("TEST: revalidation answered with 304")
+
+        for mode in ("x-accel", ""):
+            with patch.object(project_settings, "FILE_OFFLOAD_MODE", mode):
+                response = self._detail()
+
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertIn("private", response["Cache-Control"])
+                self.assertEqual(response["Accept-Ranges"], "bytes")
+
+                not_modified = self._detail(If_None_Match=response["ETag"])
+                self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertNotIn("X-Accel-Redirect", not_modified)
+
+                not_modified = self._detail(If_Modified_Since=response["Last-Modified"])
+                self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+                self.assertEqual(
+                    self._detail(If_None_Match='"0-0"').status_code, status.HTTP_200_OK
+                )
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ ETag and Last-Modified honoured with and without offload"
+            f"{self.COLOR['END']}"
+        )
+
+    @patch.object(project_settings, "FILE_OFFLOAD_MODE", "")
+    def test_range_requests(self) -> None:
+        self._logger_header("TEST: byte ranges answered with 206")
+        with self.doc.file.open("rb") as file:
+            content = file.read()
+        size = len(content)
+
+        response = self._detail(Range="bytes=0-99")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response["Content-Range"], f"bytes 0-99/{size}")
+        self.assertEqual(response["Content-Length"], "100")
+        self.assertEqual(b"".join(response.streaming_content), content[:100])
+
+        response = self._detail(Range="bytes=-10")
+        self.assertEqual(b"".join(response.streaming_content), content[-10:])
+
+        response = self._detail(Range=f"bytes=100-{size * 2}")
+        self.assertEqual(response["Content-Range"], f"bytes 100-{size - 1}/{size}")
+        self.assertEqual(b"".join(response.streaming_content), content[100:])
+
+        response = self._detail(Range=f"bytes={size}-")
+        self.assertEqual(
+            response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+        self.assertEqual(response["Content-Range"], f"bytes */{size}")
+
+        etag = self._detail()["ETag"]
+        self.assertEqual(
+            self._detail(Range="bytes=0-9", If_Range=etag).status_code,
+            status.HTTP_206_PARTIAL_CONTENT,
+        )
+
+        response = self._detail(Range="bytes=0-9", If_Range='"0-0"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), content)
+
+        response = self._detail(Range="bytes=0-9,20-29")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Single ranges, suffixes, If-Range and 416 handled"
+            f"{self.COLOR['END']}"
+        )
@@ -1,25 +1,98 @@
-from typing import Any
+from typing import Any, Iterator
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from django.urls import reverse
 
+from app_settings import project_settings
+from core.security.clamav import ClamAVUnavailableError
+from core.services.health import reset_readiness_checks
 from core.tests.utils import TestLoggerMixin
 
 
+@pytest.fixture(autouse=True)
+def fresh_readiness_checks() -> Iterator[None]:
+    reset_readiness_checks()
+    yield
+    reset_readiness_checks()
+
+
 @pytest.mark.django_db
 class TestHealthCheck(TestLoggerMixin):
-    def test_health_check(self, client: Any) -> None:
-        self._logger_header("TEST DB - health check")
-        response = client.get(reverse("health-check"))
+    def test_liveness(self, client: Any, django_assert_num_queries: Any) -> None:
+        self._logger_header("TEST - liveness check")
+
+        with django_assert_num_queries(0):
+            response = client.get(reverse("health-live"))
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Liveness is OK | HTTP 200 | No dependency touched"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_readiness(self, client: Any) -> None:
+        self._logger_header("TEST - readiness check")
+        response = client.get(reverse("health-ready"))
 
         assert response.status_code == 200
-        assert response.json() == {
-            "status": "ok",
+        body = response.json()
+        assert body["status"] == "ok"
+        assert {name: check["status"] for name, check in body["checks"].items()} == {
             "database": "ok",
+            "clamav": "disabled",
+            "media": "ok",
+            "cache": "ok",
         }
+        assert all(check["latency_ms"] >= 0 for check in body["checks"].values())
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Readiness is OK | HTTP 200 | Latency per dependency"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_readiness_results_cached(
+        self, client: Any, django_assert_num_queries: Any
+    ) -> None:
+        self._logger_header("TEST - readiness results reused")
+        client.get(reverse("health-ready"))
+
+        with django_assert_num_queries(0):
+            response = client.get(reverse("health-ready"))
+        assert response.status_code == 200
+
+        with patch.object(project_settings, "HEALTH_CHECK_CACHE_SECONDS", 0):
+            with django_assert_num_queries(1):
+                client.get(reverse("health-ready"))
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Database checked once per HEALTH_CHECK_CACHE_SECONDS"
+            f"{self.COLOR['END']}"
+        )
+
+    @patch.object(project_settings, "CLAMAV_ENABLED", True)
+    @patch("core.services.health.get_async_clamav_client")
+    def test_readiness_fails_without_clamav(self, get_client: Any, client: Any) -> None:
+        self._logger_header("TEST - readiness without ClamAV")
+        get_client.return_value.ping = AsyncMock(
+            side_effect=ClamAVUnavailableError("ClamAV недоступен.")
+        )
+
+        response = client.get(reverse("health-check"))
+
+        assert response.status_code == 503
+        body = response.json()
+        assert body["status"] == "error"
+        assert body["checks"]["clamav"]["status"] == "error"
+        assert body["checks"]["database"]["status"] == "ok"
 
         print(
             f"{self.INDENT}{self.COLOR['OK']}"
-            "✓ Health check is OK | HTTP 200 | Database OK"
+            "✓ Readiness fails | HTTP 503 | Failing dependency reported"
             f"{self.COLOR['END']}"
         )
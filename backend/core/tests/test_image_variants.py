@@ -0,0 +1,106 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from rest_framework.test import APITestCase
+
+from catalog.api.serializers.product_serializers import ProductListCreateAPISerializer
+from catalog.models import Product
+from catalog.tests.api.factories import ProductFactory
+from core.tests.utils import TestLoggerMixin
+
+
+def make_image(
+    name: str = "photo.png", size: tuple[int, int] = (2400, 1200)
+) -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new("RGBA", size, (10, 120, 200, 255)).save(buffer, format="PNG")
+
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+@pytest.mark.django_db
+class TestImageVariants(APITestCase, TestLoggerMixin):
+    def _save_image(self, product: Product, name: str) -> Product:
+        with self.captureOnCommitCallbacks(execute=True):
+            product.product_image = make_image(name)
+            product.save()
+
+        product.refresh_from_db()
+        return product
+
+    def test_variants_generated_after_commit(self) -> None:
+        self._logger_header("TEST: image variants generated after commit")
+        product = self._save_image(ProductFactory.create(), "photo.png")
+        variants = product.product_image_variants
+        storage = product.product_image.storage
+
+        self.assertEqual(variants["source"], product.product_image.name)
+        self.assertEqual(
+            set(variants) - {"source"}, {"thumbnail", "screen", "original"}
+        )
+
+        with storage.open(variants["thumbnail"]["webp"]) as f, Image.open(f) as image:
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.size, (320, 160))
+
+        with storage.open(variants["screen"]["jpeg"]) as f, Image.open(f) as image:
+            self.assertEqual(image.format, "JPEG")
+            self.assertEqual(image.size, (1600, 800))
+
+        with storage.open(variants["original"]["webp"]) as f, Image.open(f) as image:
+            self.assertEqual(image.size, (2400, 1200))
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Thumbnail, screen and original variants stored next to the image"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_replacing_image_deletes_old_variants(self) -> None:
+        self._logger_header("TEST: replacing image deletes old variants")
+        product = self._save_image(ProductFactory.create(), "first.png")
+        old_variants = product.product_image_variants
+        storage = product.product_image.storage
+
+        product = self._save_image(product, "second.png")
+
+        self.assertNotEqual(product.product_image_variants, old_variants)
+        self.assertFalse(storage.exists(old_variants["thumbnail"]["webp"]))
+        self.assertTrue(
+            storage.exists(product.product_image_variants["thumbnail"]["webp"])
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            product.delete()
+
+        self.assertFalse(
+            storage.exists(product.product_image_variants["thumbnail"]["webp"])
+        )
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Stale variants removed on replace and delete"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_serializer_exposes_variant_urls(self) -> None:
+        self._logger_header("TEST: serializer exposes variant URLs")
+        product = ProductFactory.create()
+
+        self.assertIsNone(
+            ProductListCreateAPISerializer(product).data["productImageVariants"]
+        )
+
+        product = self._save_image(product, "photo.png")
+        data = ProductListCreateAPISerializer(product).data["productImageVariants"]
+
+        self.assertTrue(data["thumbnail"]["webp"].endswith(".thumbnail.webp"))
+        self.assertTrue(data["screen"]["jpeg"].endswith(".screen.jpg"))
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Variant URLs exposed once generated"
+            f"{self.COLOR['END']}"
+        )
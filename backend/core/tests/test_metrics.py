@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.services.metrics import MULTIPROC_DIR_ENV, metrics_registry
+from core.tests.utils import TestLoggerMixin
+from logistic.models import Carrier
+from logistic.routes import CarrierRoutes
+
+WORKER_SCRIPT = """
+from prometheus_client import Counter
+
+Counter("mixity_test_worker_requests", "Requests handled by a test worker.").inc()
+"""
+
+
+class TestMetrics(APITestCase, TestLoggerMixin):
+    def setUp(self) -> None:
+        self.url = reverse("metrics")
+        self.user = get_user_model().objects.create_superuser(
+            username="metrics_admin",
+            email="metrics_admin@example.com",
+            password="test_password",
+        )
+        Carrier.objects.create(name="Перевозчик")
+
+    def test_request_latency_exposed_per_view(self) -> None:
+        self._logger_header("TEST: /metrics exposes request latency")
+        self.client.force_authenticate(user=self.user)
+        self.client.get(reverse(f"logistic:{CarrierRoutes.LIST_CREATE.name}"))
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn(
+            'mixity_http_request_duration_seconds_count{method="GET",status="200",'
+            'view="Carrier"}',
+            body,
+        )
+        self.assertIn('mixity_http_request_db_queries_count{view="Carrier"}', body)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Latency histogram labelled with view, method and status"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_unresolved_paths_share_one_label(self) -> None:
+        self._logger_header("TEST: unknown paths do not add series")
+        self.client.get("/no-such-page/")
+
+        body = self.client.get(self.url).content.decode()
+
+        self.assertIn('view="unresolved"', body)
+        self.assertNotIn("no-such-page", body)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Unresolved requests recorded under a single label"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_samples_of_worker_processes_summed(self) -> None:
+        self._logger_header("TEST: metrics aggregated across processes")
+
+        with tempfile.TemporaryDirectory() as directory:
+            env = {**os.environ, MULTIPROC_DIR_ENV: directory}
+            for _ in range(2):
+                subprocess.run(
+                    [sys.executable, "-c", WORKER_SCRIPT], env=env, check=True
+                )
+
+            with patch.dict(os.environ, {MULTIPROC_DIR_ENV: directory}):
+                value = metrics_registry().get_sample_value(
+                    "mixity_test_worker_requests_total"
+                )
+
+        self.assertEqual(value, 2)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Counters of both processes summed from the shared directory"
+            f"{self.COLOR['END']}"
+        )
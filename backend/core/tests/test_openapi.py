@@ -0,0 +1,52 @@
+import pytest
+from django.urls import path
+from drf_spectacular.generators import SchemaGenerator
+
+from core.openapi.base_views import LazySchemaMixin
+from core.tests.utils import TestLoggerMixin
+from logistic.views.carriers import CarrierListCreateAPIView
+
+
+class TestLazySchemaDecoration(TestLoggerMixin):
+    def test_views_decorated_when_schema_generated(self) -> None:
+        self._logger_header("TEST - schema decorators deferred to schema generation")
+
+        class CarrierView(CarrierListCreateAPIView):
+            pass
+
+        patterns = [path("carriers/", CarrierView.as_view())]
+
+        assert "get" not in CarrierView.__dict__
+        assert not CarrierView.__dict__.get("_schema_decorated")
+
+        for _ in range(2):
+            schema = SchemaGenerator(patterns=patterns).get_schema(
+                request=None, public=True
+            )
+            operations = schema["paths"]["/carriers/"]
+            assert operations["get"]["operationId"] == "listCarriers"
+            assert operations["post"]["operationId"] == "createCarrier"
+
+        assert CarrierView.__dict__["_schema_decorated"]
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Nothing built by as_view | Operations documented on generation"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_schema_decorator_required(self) -> None:
+        self._logger_header("TEST - views must provide a schema decorator")
+
+        class UndocumentedView(LazySchemaMixin):
+            pass
+
+        assert UndocumentedView._schema_decorated is False
+        with pytest.raises(TypeError, match="schema_decorator"):
+            UndocumentedView()  # type: ignore[abstract]
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ View without schema_decorator cannot be instantiated"
+            f"{self.COLOR['END']}"
+        )
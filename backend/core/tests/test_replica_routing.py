@@ -0,0 +1,110 @@
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+
+from core.db.replica import (
+    PIN_COOKIE,
+    PIN_HEADER,
+    REPLICA_DB_ALIAS,
+    replica_available,
+    reset_replica_health,
+)
+from core.tests.utils import TestLoggerMixin
+from logistic.models import TruckType
+from logistic.routes import TruckTypeRoutes
+
+
+@pytest.mark.django_db(databases=["default", "replica"], transaction=True)
+@override_settings(DATABASE_REPLICA_READS=True)
+class TestReplicaRouting(APITransactionTestCase, TestLoggerMixin):
+    databases = {"default", "replica"}
+
+    def setUp(self) -> None:
+        reset_replica_health()
+        self.addCleanup(reset_replica_health)
+
+        self.user = get_user_model().objects.create_superuser(
+            username="replica_admin",
+            email="replica_admin@example.com",
+            password="test_password",
+        )
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse(f"logistic:{TruckTypeRoutes.LIST_CREATE.name}")
+
+        TruckType.objects.create(name="primary")
+        TruckType.objects.using(REPLICA_DB_ALIAS).create(name="replica")
+
+    def _names(self, **headers: str) -> set[str]:
+        response = self.client.get(self.url, headers=headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {truck_type["truckType"] for truck_type in response.data}
+
+    def test_safe_requests_read_from_replica(self) -> None:
+        self._logger_header("TEST: GET served from the replica")
+        response = self.client.get(self.url)
+
+        self.assertEqual({item["truckType"] for item in response.data}, {"replica"})
+        self.assertNotIn(PIN_HEADER, response)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Reads routed to the replica without pinning"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_write_pins_client_to_primary(self) -> None:
+        self._logger_header("TEST: writer reads its own writes")
+        response = self.client.post(self.url, {"truckType": "new"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertIn(PIN_COOKIE, response.cookies)
+        pinned_until = response[PIN_HEADER]
+
+        self.assertEqual(self._names(), {"primary", "new"})
+
+        self.client.cookies.clear()
+        self.assertEqual(self._names(), {"replica"})
+        self.assertEqual(self._names(**{PIN_HEADER: pinned_until}), {"primary", "new"})
+        self.assertEqual(self._names(**{PIN_HEADER: str(time.time() - 1)}), {"replica"})
+        self.assertEqual(
+            self._names(**{PIN_HEADER: str(time.time() + 3600)}), {"replica"}
+        )
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Cookie or header pins the primary for the window only"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_unavailable_replica_falls_back_to_primary(self) -> None:
+        self._logger_header("TEST: failing replica skipped")
+        replica = connections[REPLICA_DB_ALIAS]
+        # The test replica is SQLite; only driver errors mark the connection as
+        # failed, as psycopg's would in production.
+        with patch.object(
+            replica,
+            "create_cursor",
+            side_effect=sqlite3.OperationalError("replica down"),
+        ):
+            self.assertEqual(self._names(), {"primary"})
+
+        self.assertFalse(replica_available())
+        self.assertEqual(self._names(), {"primary"})
+
+        reset_replica_health()
+        self.assertEqual(self._names(), {"replica"})
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Request retried on the primary and replica skipped until retry"
+            f"{self.COLOR['END']}"
+        )
@@ -0,0 +1,145 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.services.request_timing import QueryBudget
+from core.tests.utils import TestLoggerMixin
+from logistic.models import Carrier
+from logistic.routes import CarrierRoutes
+from logistic.views.carriers import CarrierListCreateAPIView
+
+TIMING_LOGGER = "core.services.request_timing"
+
+
+class TestRequestTiming(APITestCase, TestLoggerMixin):
+    def setUp(self) -> None:
+        self.url = reverse(f"logistic:{CarrierRoutes.LIST_CREATE.name}")
+        self.staff = get_user_model().objects.create_superuser(
+            username="timing_admin",
+            email="timing_admin@example.com",
+            password="test_password",
+        )
+        Carrier.objects.create(name="Перевозчик")
+
+    def _log_records(self, logs: list[str]) -> list[dict]:
+        return [json.loads(line.split(":", 2)[2]) for line in logs]
+
+    def test_staff_receive_server_timing(self) -> None:
+        self._logger_header("TEST: Server-Timing header for staff")
+        self.client.force_authenticate(user=self.staff)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        metrics = [
+            metric.split(";")[0] for metric in response["Server-Timing"].split(", ")
+        ]
+        self.assertEqual(metrics[0], "db")
+        self.assertIn("serialize", metrics)
+        self.assertIn("render", metrics)
+        self.assertEqual(metrics[-1], "total")
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ DB, serializer and render timings sent to staff"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_other_users_get_no_server_timing(self) -> None:
+        self._logger_header("TEST: Server-Timing hidden from non-staff")
+        user = get_user_model().objects.create_user(
+            username="timing_user", password="test_password"
+        )
+        user.user_permissions.add(Permission.objects.get(codename="view_carrier"))
+        self.client.force_authenticate(user=user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Server-Timing", response)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ No Server-Timing header for non-staff users"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_request_logged_with_resource_name(self) -> None:
+        self._logger_header("TEST: structured request log")
+        self.client.force_authenticate(user=self.staff)
+
+        with self.assertLogs(TIMING_LOGGER, level="INFO") as logs:
+            self.client.get(self.url)
+
+        (record,) = self._log_records(logs.output)
+        self.assertEqual(record["event"], "request")
+        self.assertEqual(record["resource"], "Carrier")
+        self.assertEqual(record["status"], status.HTTP_200_OK)
+        self.assertGreater(record["db_queries"], 0)
+        self.assertIn("serialize_ms", record)
+        self.assertNotIn("slowest_statements", record)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ One JSON line tagged with the view's resource name"
+            f"{self.COLOR['END']}"
+        )
+
+    @patch("core.services.request_timing.project_settings")
+    def test_slow_request_logs_slowest_statements(self, settings: MagicMock) -> None:
+        self._logger_header("TEST: slow request warning")
+        settings.REQUEST_SLOW_MS = 10_000
+        settings.REQUEST_SLOW_QUERIES = 0
+        settings.REQUEST_SLOW_STATEMENTS = 2
+        self.client.force_authenticate(user=self.staff)
+
+        with self.assertLogs(TIMING_LOGGER, level="WARNING") as logs:
+            self.client.get(self.url)
+
+        (record,) = self._log_records(logs.output)
+        self.assertEqual(record["event"], "slow_request")
+        statements = record["slowest_statements"]
+        self.assertTrue(1 <= len(statements) <= 2)
+        self.assertEqual(
+            [statement["ms"] for statement in statements],
+            sorted((statement["ms"] for statement in statements), reverse=True),
+        )
+        self.assertIn("SELECT", statements[0]["sql"])
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Slow request logged as a warning with its slowest statements"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_request_over_query_budget_logged(self) -> None:
+        self._logger_header("TEST: query budget exceeded")
+        self.client.force_authenticate(user=self.staff)
+
+        with (
+            patch.object(
+                CarrierListCreateAPIView, "query_budget", QueryBudget(max_queries=0)
+            ),
+            self.assertLogs(TIMING_LOGGER, level="WARNING") as logs,
+        ):
+            self.client.get(self.url)
+
+        (record,) = self._log_records(logs.output)
+        self.assertEqual(record["event"], "query_budget_exceeded")
+        self.assertEqual(record["resource"], "Carrier")
+        self.assertEqual(record["query_budget"], 0)
+        self.assertTrue(record["slowest_statements"])
+
+        with self.assertNoLogs(TIMING_LOGGER, level="WARNING"):
+            self.client.get(self.url)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Request over the view's query budget logged as a warning"
+            f"{self.COLOR['END']}"
+        )
@@ -0,0 +1,102 @@
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+import pytest
+from rest_framework.test import APITestCase
+
+from core.models import FileScanVerdict
+from core.security.clamav import close_clamav_clients
+from core.security.fake_clamd import EICAR_SIGNATURE, FakeClamd
+from core.security.scan_cache import (
+    file_sha256,
+    reset_signature_version,
+    scan_with_cache,
+)
+from core.tests.utils import TestLoggerMixin
+
+
+@pytest.mark.django_db
+class TestScanCache(APITestCase, TestLoggerMixin):
+    def setUp(self) -> None:
+        self.server = FakeClamd()
+        self.server.__enter__()
+
+        host, port = self.server.address
+        clamav_patcher = patch("core.security.clamav.project_settings")
+        settings = clamav_patcher.start()
+        settings.CLAMAV_ENABLED = True
+        settings.CLAMAV_HOST = host
+        settings.CLAMAV_PORT = port
+        settings.CLAMAV_TIMEOUT = 5
+        settings.CLAMAV_POOL_SIZE = 1
+        settings.CLAMAV_POOL_IDLE_TIMEOUT = 20
+        self.addCleanup(clamav_patcher.stop)
+
+        cache_patcher = patch("core.security.scan_cache.project_settings", settings)
+        cache_patcher.start()
+        settings.CLAMAV_VERSION_TTL = 60
+        self.addCleanup(cache_patcher.stop)
+
+        reset_signature_version()
+
+    def tearDown(self) -> None:
+        close_clamav_clients()
+        reset_signature_version()
+        self.server.__exit__(None, None, None)
+
+    def _scan(self, content: bytes) -> FileScanVerdict:
+        file = BytesIO(content)
+        return scan_with_cache(
+            file, kind=FileScanVerdict.Kind.UPD_PDF, sha256=file_sha256(file)
+        )
+
+    def test_identical_content_scanned_once(self) -> None:
+        self._logger_header("TEST: identical content scanned once")
+
+        self.assertTrue(self._scan(b"%PDF-1.7 content").is_clean)
+        self.assertTrue(self._scan(b"%PDF-1.7 content").is_clean)
+        self.assertFalse(self._scan(b"%PDF-1.7 " + EICAR_SIGNATURE).is_clean)
+        self.assertFalse(self._scan(b"%PDF-1.7 " + EICAR_SIGNATURE).is_clean)
+
+        self.assertEqual(self.server.scans, 2)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Clean and infected verdicts reused for repeat content"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_signature_update_invalidates_verdicts(self) -> None:
+        self._logger_header("TEST: signature update invalidates verdicts")
+        self._scan(b"%PDF-1.7 content")
+
+        self.server.version = "ClamAV 1.4.1/27401/Tue Oct 14 08:00:00 2025"
+        reset_signature_version()
+        verdict = self._scan(b"%PDF-1.7 content")
+
+        self.assertEqual(self.server.scans, 2)
+        self.assertEqual(verdict.signature_version, self.server.version)
+        self.assertEqual(FileScanVerdict.objects.count(), 1)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ New signatures trigger a rescan and replace the old verdict"
+            f"{self.COLOR['END']}"
+        )
+
+    @patch("core.security.scan_cache.get_clamav_client")
+    def test_version_cached_between_scans(self, mock_client: MagicMock) -> None:
+        self._logger_header("TEST: signature version cached")
+        mock_client.return_value.version.return_value = "ClamAV 1.4.1/1/x"
+
+        with patch("core.security.scan_cache.scan_file_for_malware"):
+            self._scan(b"first")
+            self._scan(b"second")
+
+        mock_client.return_value.version.assert_called_once()
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ VERSION asked once per TTL"
+            f"{self.COLOR['END']}"
+        )
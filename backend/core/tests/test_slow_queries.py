@@ -0,0 +1,125 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from app_settings import project_settings
+from core.models import SlowQuery
+from core.services.slow_queries import explain_plan
+from core.tests.utils import TestLoggerMixin
+from logistic.models import Carrier
+from logistic.routes import CarrierRoutes
+
+
+class TestSlowQueryCapture(APITestCase, TestLoggerMixin):
+    def setUp(self) -> None:
+        self.url = reverse(f"logistic:{CarrierRoutes.LIST_CREATE.name}")
+        self.user = get_user_model().objects.create_superuser(
+            username="slow_admin",
+            email="slow_admin@example.com",
+            password="test_password",
+        )
+        Carrier.objects.create(name="Перевозчик")
+
+    def test_capture_disabled_by_default(self) -> None:
+        self._logger_header("TEST: nothing captured unless enabled")
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(SlowQuery.objects.exists())
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ No statements stored while SLOW_QUERY_CAPTURE_MS is unset"
+            f"{self.COLOR['END']}"
+        )
+
+    @patch.object(project_settings, "SLOW_QUERY_CAPTURE_MS", 0)
+    def test_slow_statement_stored_with_plan_view_and_stack(self) -> None:
+        self._logger_header("TEST: slow statement captured")
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        query = SlowQuery.objects.get(sql__contains='FROM "logistic_carrier"')
+        self.assertEqual(query.resource, "Carrier")
+        self.assertEqual(query.method, "GET")
+        self.assertEqual(query.path, self.url)
+        self.assertEqual(query.database, "default")
+        self.assertIn("logistic_carrier", query.plan)
+        self.assertIn("middleware.py", query.stack)
+        self.assertNotIn(
+            "EXPLAIN", "".join(SlowQuery.objects.values_list("sql", flat=True))
+        )
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Statement stored with its plan, view and stack"
+            f"{self.COLOR['END']}"
+        )
+
+    @patch.object(project_settings, "SLOW_QUERY_BUFFER_SIZE", 3)
+    @patch.object(project_settings, "SLOW_QUERY_CAPTURE_MS", 0)
+    def test_buffer_keeps_newest_records(self) -> None:
+        self._logger_header("TEST: bounded slow query buffer")
+        self.client.force_authenticate(user=self.user)
+
+        self.client.get(self.url)
+        first_ids = set(SlowQuery.objects.values_list("id", flat=True))
+        for _ in range(4):
+            self.client.get(self.url)
+        ids = set(SlowQuery.objects.values_list("id", flat=True))
+
+        self.assertEqual(len(ids), 3)
+        self.assertGreater(min(ids), max(first_ids))
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Only the newest SLOW_QUERY_BUFFER_SIZE records kept"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_explain_failure_returned_as_plan(self) -> None:
+        self._logger_header("TEST: failing EXPLAIN")
+
+        plan = explain_plan(connection, "SELECT * FROM missing_table", [])
+
+        self.assertTrue(plan.startswith("EXPLAIN failed:"))
+        self.assertEqual(Carrier.objects.count(), 1)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Error returned instead of a plan, transaction still usable"
+            f"{self.COLOR['END']}"
+        )
+
+    @patch.object(project_settings, "SLOW_QUERY_CAPTURE_MS", 0)
+    def test_admin_lists_slow_queries(self) -> None:
+        self._logger_header("TEST: slow queries in the admin")
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.url)
+        query = SlowQuery.objects.first()
+        assert query is not None
+
+        self.client.force_login(self.user)
+        changelist = self.client.get(reverse("admin:core_slowquery_changelist"))
+        change = self.client.get(
+            reverse("admin:core_slowquery_change", args=[query.pk])
+        )
+
+        self.assertEqual(changelist.status_code, status.HTTP_200_OK)
+        self.assertEqual(change.status_code, status.HTTP_200_OK)
+        self.assertContains(change, "logistic_carrier")
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Captured statements viewable in the admin"
+            f"{self.COLOR['END']}"
+        )
@@ -0,0 +1,180 @@
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.http.multipartparser import MultiPartParser
+from django.test import Client, override_settings
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from common.models import Documentation
+from core.models import FileScanVerdict
+from core.security.clamav import close_clamav_clients
+from core.security.fake_clamd import EICAR_SIGNATURE, FakeClamd
+from core.security.scan_cache import reset_signature_version
+from core.security.upload_handlers import ScanningUploadHandler, UploadRejectedError
+from core.tests.utils import TestLoggerMixin
+from order.models import Order
+from order.routes import OrderRoutes
+from order.tests.factories import OrderFactory
+from order.tests.pdf_corpus import small_pdf
+from order.views.orders import OrderUpdUploadAPIView
+
+
+class _CountingStream(BytesIO):
+    def read(self, size: int | None = -1) -> bytes:
+        data = super().read(size)
+        self.bytes_read = getattr(self, "bytes_read", 0) + len(data)
+        return data
+
+
+@pytest.mark.django_db
+class TestScanningUploadHandler(APITestCase, TestLoggerMixin):
+    def setUp(self) -> None:
+        self.server = FakeClamd()
+        self.server.__enter__()
+
+        host, port = self.server.address
+        patcher = patch("core.security.clamav.project_settings")
+        settings = patcher.start()
+        settings.CLAMAV_ENABLED = True
+        settings.CLAMAV_HOST = host
+        settings.CLAMAV_PORT = port
+        settings.CLAMAV_TIMEOUT = 5
+        settings.CLAMAV_POOL_SIZE = 1
+        settings.CLAMAV_POOL_IDLE_TIMEOUT = 20
+        settings.CLAMAV_VERSION_TTL = 60
+        self.addCleanup(patcher.stop)
+
+        for target in (
+            "core.security.scan_cache.project_settings",
+            "core.security.upload_handlers.project_settings",
+        ):
+            target_patcher = patch(target, settings)
+            target_patcher.start()
+            self.addCleanup(target_patcher.stop)
+
+        reset_signature_version()
+
+        self.user = get_user_model().objects.create_superuser(
+            username="upload_admin",
+            email="upload_admin@example.com",
+            password="test_password",
+        )
+
+        temp_media = TemporaryDirectory()
+        self.addCleanup(temp_media.cleanup)
+        override_media = override_settings(MEDIA_ROOT=temp_media.name)
+        override_media.enable()
+        self.addCleanup(override_media.disable)
+
+    def tearDown(self) -> None:
+        close_clamav_clients()
+        reset_signature_version()
+        self.server.__exit__(None, None, None)
+
+    def test_upd_scanned_once_while_received(self) -> None:
+        self._logger_header("TEST: УПД scanned while it is uploaded")
+        order = OrderFactory.create()
+        self.client.force_authenticate(user=self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse(
+                    f"order_orders:{OrderRoutes.UPLOAD_UPD.name}",
+                    kwargs={"pk": order.pk},
+                ),
+                {"upd_pdf": SimpleUploadedFile("upd.pdf", small_pdf())},
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+        order.refresh_from_db()
+        self.assertEqual(order.upd_scan_status, Order.ScanStatus.CLEAN)
+        self.assertEqual(self.server.scans, 1)
+        self.assertTrue(
+            FileScanVerdict.objects.filter(
+                sha256=order.upd_sha256, signature_version=self.server.version
+            ).exists()
+        )
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Background scan reuses the verdict streamed during the upload"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_oversize_upd_rejected_before_body_is_read(self) -> None:
+        self._logger_header("TEST: oversize upload stopped early")
+        body = encode_multipart(
+            BOUNDARY, {"upd_pdf": SimpleUploadedFile("upd.pdf", bytes(1024 * 1024))}
+        )
+        stream = _CountingStream(body)
+        request_meta = {
+            "CONTENT_TYPE": MULTIPART_CONTENT,
+            "CONTENT_LENGTH": len(body),
+        }
+        handler = ScanningUploadHandler(max_size=128 * 1024)
+
+        with self.assertRaises(UploadRejectedError) as raised:
+            MultiPartParser(request_meta, stream, [handler]).parse()
+
+        self.assertEqual(raised.exception.field_name, "upd_pdf")
+        self.assertLess(stream.bytes_read, len(body) // 2)
+
+        order = OrderFactory.create()
+        self.client.force_authenticate(user=self.user)
+
+        with patch.object(OrderUpdUploadAPIView, "upload_max_size", 1024):
+            response = self.client.patch(
+                reverse(
+                    f"order_orders:{OrderRoutes.UPLOAD_UPD.name}",
+                    kwargs={"pk": order.pk},
+                ),
+                {"upd_pdf": SimpleUploadedFile("upd.pdf", small_pdf() * 4)},
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("upd_pdf", response.data["errors"])
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Upload refused after the limit, not after the whole body"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_infected_documentation_rejected_in_admin(self) -> None:
+        self._logger_header("TEST: infected documentation refused in admin")
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.user)
+        url = reverse("admin:common_documentation_add")
+        upload = SimpleUploadedFile("passport.pdf", b"%PDF-1.7 " + EICAR_SIGNATURE)
+        data = {
+            "title": "Паспорт",
+            "tag": Documentation.ALLOWED_TAGS[0],
+            "file": upload,
+        }
+
+        self.assertEqual(client.post(url, data).status_code, status.HTTP_403_FORBIDDEN)
+
+        client.get(url)
+        data["csrfmiddlewaretoken"] = client.cookies["csrftoken"].value
+        upload.seek(0)
+        response = client.post(url, data)
+
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertFalse(Documentation.objects.exists())
+        self.assertEqual(self.server.scans, 1)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ CSRF still checked and infected file never saved"
+            f"{self.COLOR['END']}"
+        )
@@ -0,0 +1,59 @@
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.test import override_settings
+
+from core.services.warmup import close_database_connections, warm_up
+from core.tests.utils import TestLoggerMixin
+
+
+@pytest.mark.django_db
+class TestWarmUp(TestLoggerMixin):
+    def test_warm_up_without_database(self, django_assert_num_queries: Any) -> None:
+        self._logger_header("TEST - warm-up in the gunicorn master")
+
+        with django_assert_num_queries(0):
+            durations = warm_up()
+
+        assert list(durations) == ["urls", "models", "phone numbers"]
+        assert all(seconds >= 0 for seconds in durations.values())
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ URLconf, models and phone metadata loaded | No SQL"
+            f"{self.COLOR['END']}"
+        )
+
+    @override_settings(DEBUG=True)
+    def test_schema_warmed_up_with_debug(self) -> None:
+        self._logger_header("TEST - OpenAPI schema warmed up with DEBUG")
+
+        assert "schema" in warm_up()
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Schema generated when the schema views are mounted"
+            f"{self.COLOR['END']}"
+        )
+
+    @patch("core.services.warmup.connections")
+    def test_connections_closed_before_fork(self, connections: MagicMock) -> None:
+        self._logger_header("TEST - database connections closed before fork")
+        pooled = MagicMock(alias="default", _connection_pools={"default": object()})
+        unpooled = MagicMock(alias="replica", _connection_pools={})
+        connections.all.return_value = [pooled, unpooled]
+
+        close_database_connections()
+
+        connections.all.assert_called_once_with(initialized_only=True)
+        pooled.close.assert_called_once_with()
+        pooled.close_pool.assert_called_once_with()
+        unpooled.close.assert_called_once_with()
+        unpooled.close_pool.assert_not_called()
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Connections and existing pools closed, no pool created"
+            f"{self.COLOR['END']}"
+        )
@@ -48,6 +48,8 @@ class ApiRuntimeProto(Protocol):
     def assertTrue(self, expr: Any, msg: str | None = None) -> None: ...
     def assertFalse(self, expr: Any, msg: str | None = None) -> None: ...
     def assertIn(self, member: Any, container: Any, msg: str | None = None) -> None: ...
+    def assertIsNotNone(self, obj: Any, msg: str | None = None) -> None: ...
+    def assertLessEqual(self, a: Any, b: Any, msg: str | None = None) -> None: ...
     def fail(self, msg: Any = ...) -> NoReturn: ...
     def assertCountEqual(self, a: Any, b: Any, msg: str | None = ...) -> None: ...
 
@@ -20,5 +20,11 @@ esac
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
+if [ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]; then
+    echo "Resetting metrics in ${PROMETHEUS_MULTIPROC_DIR}..."
+    rm -rf "${PROMETHEUS_MULTIPROC_DIR}"
+    mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
+fi
+
 echo "Starting application..."
 exec "$@"
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+gunicorn settings, read from the working directory when gunicorn starts.
+
+The application is loaded once in the master (``preload_app``) and warmed up
+there, so workers forked from it start with Django set up, the URLconf built and
+lazily loaded data in place, instead of each paying for it on its first requests.
+Command-line options and ``GUNICORN_CMD_ARGS`` override these values.
+"""
+
+import math
+import os
+import time
+
+from gunicorn.arbiter import Arbiter
+from gunicorn.workers.base import Worker
+
+from app_settings import project_settings
+
+STARTED = time.perf_counter()
+
+
+def available_cpus() -> int:
+    """
+    CPUs this process may run on, limited by the container's cgroup CPU quota.
+    """
+    cpus = len(os.sched_getaffinity(0))
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as file:
+            quota, period = file.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+
+    return cpus
+
+
+CPUS = available_cpus()
+
+wsgi_app = "backend.asgi:application"
+worker_class = "uvicorn_worker.UvicornWorker"
+bind = "0.0.0.0:8000"
+
+# Every worker has a pool of up to DB_POOL_MAX_SIZE connections, so no more workers
+# are started than DB_MAX_CONNECTIONS allows, which keeps them all under Postgres'
+# max_connections.
+MAX_WORKERS = max(
+    1, project_settings.DB_MAX_CONNECTIONS // project_settings.DB_POOL_MAX_SIZE
+)
+
+# 2 x CPUs + 1, as the gunicorn documentation suggests; WEB_CONCURRENCY overrides it,
+# up to MAX_WORKERS.
+workers = min(int(os.environ.get("WEB_CONCURRENCY", 2 * CPUS + 1)), MAX_WORKERS)
+timeout = 120
+
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server: Arbiter) -> None:
+    from core.services.warmup import close_database_connections, warm_up
+
+    loaded = time.perf_counter() - STARTED
+    durations = warm_up()
+    server.log.info(
+        "Application loaded in %.2f s, warmed up in %.2f s (%s)",
+        loaded,
+        sum(durations.values()),
+        ", ".join(f"{name} {seconds:.2f} s" for name, seconds in durations.items()),
+    )
+
+    # Workers must open their own connections rather than share the master's.
+    close_database_connections()
+
+
+def when_ready(server: Arbiter) -> None:
+    server.log.info(
+        "Ready in %.2f s with %s %s workers",
+        time.perf_counter() - STARTED,
+        server.num_workers,
+        server.cfg.worker_class_str,
+    )
+
+
+def pre_fork(server: Arbiter, worker: Worker) -> None:
+    worker.forked_at = time.perf_counter()
+
+
+def post_fork(server: Arbiter, worker: Worker) -> None:
+    from core.services.warmup import close_database_connections
+
+    close_database_connections()
+
+
+def post_worker_init(worker: Worker) -> None:
+    worker.log.info(
+        "Worker %s booted in %.3f s",
+        worker.pid,
+        time.perf_counter() - worker.forked_at,
+    )
+
+
+def child_exit(server: Arbiter, worker: Worker) -> None:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        # Drops the live gauges of the exited worker; counters are kept.
+        multiprocess.mark_process_dead(worker.pid)
@@ -76,6 +76,9 @@ class TestCarrierAPIList(CarrierBaseTest, BaseAPIMixin):
         payload = self.payload_generator()
         self._test_all_mandatory_fields(payload)
 
+    def test_query_budget(self) -> None:
+        self._query_budget_logic()
+
     def test_str_method(self) -> None:
         str_method_output = f"TK: {self.obj.name}"
         self._str_method_logic(str_method_output)
@@ -160,6 +163,13 @@ class TestCarrierResources(
 
         self._get_resources_logic(expected_trucks=3, expected_drivers=2)
 
+    def test_query_budget(self) -> None:
+        def seed() -> None:
+            TruckFactory.create(carrier=self.obj)
+            DriverFactory.create(carrier=self.obj)
+
+        self._assert_query_budget(self.url, seed)
+
     def test_get_with_only_carrier_permission_returns_403(self) -> None:
         user = User.objects.create_user(
             username="carrier_only",
@@ -277,3 +287,8 @@ class TestCarrierTruckList(
     def test_get_list(self) -> None:
         TruckFactory.create_batch(3, carrier=self.obj)
         self._get_pk_list_logic(expected_contacts=3)
+
+    def test_query_budget(self) -> None:
+        self._assert_query_budget(
+            self.url, lambda: TruckFactory.create(carrier=self.obj)
+        )
@@ -47,6 +47,9 @@ class TestDriverAPIList(DriverBaseTest, BaseAPIMixin):
     def test_get_list(self) -> None:
         self._get_list_logic()
 
+    def test_query_budget(self) -> None:
+        self._query_budget_logic()
+
     def test_creating_item_logic(self) -> None:
         payload = self.payload_generator()
         self._create_logic(payload)
@@ -284,6 +284,9 @@ class TestTruckAPIList(TruckBaseTest, BaseAPIMixin):
 
         self._test_field_validation(cases)
 
+    def test_query_budget(self) -> None:
+        self._query_budget_logic()
+
     def test_str_method(self) -> None:
         truck = self.obj
         expected = f"{truck.license_plate} ({truck.truck_type})"
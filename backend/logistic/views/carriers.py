@@ -13,6 +13,7 @@ from core.openapi.base_views import (
     BaseListAPIView,
     BaseListCreateAPIView,
     BaseRetrieveUpdateDestroyAPIView,
+    QueryBudget,
 )
 from logistic.api.permissions import CarrierResourcesPermission
 from logistic.models import Carrier, Driver, Truck
@@ -61,6 +62,7 @@ class CarrierListCreateAPIView(BaseListCreateAPIView):
     write_serializer_class = CarrierSerializer
 
     serializer_class = CarrierSerializer
+    query_budget = QueryBudget(max_queries=5)
 
     queryset = Carrier.objects.active()
 
@@ -106,6 +108,7 @@ class CarrierResourcesAPIView(BaseGenericAPIView):
 
     serializer_class = CarrierResourcesSerializer
     queryset = Carrier.objects.all()
+    query_budget = QueryBudget(max_queries=8)
 
     permission_classes = [
         IsAuthenticated,
@@ -115,7 +118,9 @@ class CarrierResourcesAPIView(BaseGenericAPIView):
     def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
         carrier = get_object_or_404(Carrier, pk=kwargs["pk"], is_active=True)
 
-        trucks = Truck.objects.filter(carrier=carrier)
+        trucks = Truck.objects.select_related("truck_type", "capacity").filter(
+            carrier=carrier
+        )
         drivers = Driver.objects.filter(carrier=carrier)
 
         serializer = self.get_serializer(
@@ -143,6 +148,7 @@ class CarrierResourcesListAPIView(BaseListAPIView):
 
     resource_name = ""
     schema_tags = []
+    query_budget = QueryBudget(max_queries=8)
 
     def get_queryset(self) -> QuerySet:
         pk = self.kwargs.get("pk")
@@ -154,9 +160,16 @@ class CarrierResourcesListAPIView(BaseListAPIView):
         )
 
         if "trucks" in self.request.path.lower():
-            return Truck.objects.filter(
-                carrier=carrier,
-            ).order_by("id")
+            return (
+                Truck.objects.select_related(
+                    "truck_type",
+                    "capacity",
+                )
+                .filter(
+                    carrier=carrier,
+                )
+                .order_by("id")
+            )
 
         return Driver.objects.filter(
             carrier=carrier,
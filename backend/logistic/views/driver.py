@@ -1,6 +1,7 @@
 from core.openapi.base_views import (
     BaseListCreateAPIView,
     BaseRetrieveUpdateDestroyAPIView,
+    QueryBudget,
 )
 from logistic.models import Driver
 from logistic.serializers.driver_serializers import DriverSerializer
@@ -26,6 +27,7 @@ class DriverListCreateAPIView(BaseListCreateAPIView):
 
     queryset = Driver.objects.all()
     serializer_class = DriverSerializer
+    query_budget = QueryBudget(max_queries=5)
 
 
 class DriverRetrieveUpdateDestroyAPIView(BaseRetrieveUpdateDestroyAPIView):
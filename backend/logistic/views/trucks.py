@@ -8,6 +8,7 @@ from rest_framework.serializers import BaseSerializer
 from core.openapi.base_views import (
     BaseListCreateAPIView,
     BaseRetrieveUpdateDestroyAPIView,
+    QueryBudget,
 )
 from logistic.models import Truck, TruckCapacity, TruckType
 from logistic.serializers.truck_serializers import (
@@ -36,6 +37,7 @@ class TruckListCreateAPIView(BaseListCreateAPIView):
     write_serializer_class = TruckWriteSerializer
     resource_name = "Truck"
     schema_tags = ["Truck"]
+    query_budget = QueryBudget(max_queries=5)
 
     queryset = Truck.objects.select_related("truck_type", "capacity", "carrier")
 
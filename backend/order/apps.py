@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class OrderConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "order"
+
+    def ready(self) -> None:
+        from core.services.blob_storage import register_blob_sweep_hooks
+
+        register_blob_sweep_hooks(self.get_model("Order"))
@@ -0,0 +1,73 @@
+import time
+import tracemalloc
+from collections.abc import Callable
+from io import BytesIO
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from pypdf import PdfReader
+
+from order.tests.pdf_corpus import PDF_CORPUS
+from order.validators.pdf_structure import inspect_pdf_structure
+
+
+def _full_parse(content: bytes) -> None:
+    reader = PdfReader(BytesIO(content), strict=True)
+    if not reader.is_encrypted:
+        len(reader.pages)
+
+
+def _fast_path(content: bytes) -> None:
+    inspect_pdf_structure(BytesIO(content), len(content))
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the fast structural УПД check with the full pypdf parse on a "
+        "generated corpus of small, large and malformed PDFs."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def _measure(
+        self, check: Callable[[bytes], None], content: bytes, repeat: int
+    ) -> tuple[float, int, str]:
+        outcome = "ok"
+        started = time.perf_counter()
+
+        for _ in range(repeat):
+            try:
+                check(content)
+            except Exception as exc:
+                outcome = type(exc).__name__
+
+        elapsed = (time.perf_counter() - started) / repeat
+
+        tracemalloc.start()
+        try:
+            check(content)
+        except Exception:
+            pass
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return elapsed, peak, outcome
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        self.stdout.write(
+            f"{'file':<20}{'size':>10}  {'fast ms':>9}{'fast KiB':>10}  "
+            f"{'full ms':>9}{'full KiB':>10}  outcome (fast / full)"
+        )
+
+        for name, (build, _expected) in PDF_CORPUS.items():
+            content = build()
+            fast = self._measure(_fast_path, content, options["repeat"])
+            full = self._measure(_full_parse, content, options["repeat"])
+
+            self.stdout.write(
+                f"{name:<20}{len(content):>10}  "
+                f"{fast[0] * 1000:>9.2f}{fast[1] / 1024:>10.0f}  "
+                f"{full[0] * 1000:>9.2f}{full[1] / 1024:>10.0f}  "
+                f"{fast[2]} / {full[2]}"
+            )
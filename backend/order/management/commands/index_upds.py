@@ -0,0 +1,39 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db.models import F
+
+from order.models import Order, OrderUpdText
+from order.services.upd_text import index_order_upd
+
+
+class Command(BaseCommand):
+    help = (
+        "Index the text of clean УПД files that are not indexed yet (for example "
+        "because a worker restarted before the background task ran)."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Parse and index every clean УПД again.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        orders = Order.objects.filter(upd_scan_status=Order.ScanStatus.CLEAN)
+
+        if options["all"]:
+            OrderUpdText.objects.all().delete()
+        else:
+            orders = orders.exclude(upd_text__sha256=F("upd_sha256"))
+
+        indexed = 0
+        for order_pk, file_name in orders.values_list("pk", "upd_pdf").iterator():
+            # Orders without a УПД have nothing to index.
+            if not file_name:
+                continue
+            index_order_upd(order_pk, file_name)
+            indexed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"УПД indexed: {indexed}."))
@@ -0,0 +1,34 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from order.models import Order
+from order.services.upd_scan import scan_order_upd
+
+
+class Command(BaseCommand):
+    help = (
+        "Scan УПД files still waiting for the antivirus check or whose check failed "
+        "(for example because clamd was unavailable or a worker restarted)."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        orders = Order.objects.filter(
+            upd_scan_status__in=[Order.ScanStatus.PENDING, Order.ScanStatus.ERROR]
+        ).values_list("pk", "upd_pdf")
+
+        for order_pk, file_name in orders.iterator():
+            # Orders without a УПД have nothing to scan.
+            if not file_name:
+                continue
+            scan_order_upd(order_pk, file_name)
+
+        counts = {
+            label: Order.objects.filter(upd_scan_status=value).count()
+            for value, label in Order.ScanStatus.choices
+        }
+        self.stdout.write(
+            self.style.SUCCESS(
+                ", ".join(f"{label}: {count}" for label, count in counts.items())
+            )
+        )
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:54
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def mark_existing_upds_clean(apps, schema_editor):
+    # Files uploaded so far were scanned synchronously before they were saved.
+    Order = apps.get_model('order', 'Order')
+    Order.objects.exclude(upd_pdf__isnull=True).exclude(upd_pdf='').update(
+        upd_scan_status='clean'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0012_alter_order_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='upd_scan_status',
+            field=models.CharField(blank=True, choices=[('pending', 'Проверяется'), ('clean', 'Проверен'), ('infected', 'Заражён'), ('error', 'Ошибка проверки')], default='', editable=False, max_length=10, verbose_name='Антивирусная проверка УПД'),
+        ),
+        migrations.AlterField(
+            model_name='order',
+            name='upd_pdf',
+            field=models.FileField(blank=True, help_text='Загрузите копию УПД (только PDF файлы)', null=True, upload_to='quarantine/upd/%Y/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])], verbose_name='УПД в формате PDF'),
+        ),
+        migrations.RunPython(mark_existing_upds_clean, migrations.RunPython.noop),
+    ]
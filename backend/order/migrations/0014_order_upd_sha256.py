@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0013_order_upd_scan_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='upd_sha256',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64, verbose_name='SHA-256 УПД'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:36
+
+import core.services.blob_storage
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0014_order_upd_sha256'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='upd_pdf',
+            field=models.FileField(blank=True, help_text='Загрузите копию УПД (только PDF файлы)', max_length=255, null=True, storage=core.services.blob_storage.get_blob_storage, upload_to='quarantine/upd/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])], verbose_name='УПД в формате PDF'),
+        ),
+    ]
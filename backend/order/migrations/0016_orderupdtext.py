@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-19 01:43
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+GIN_INDEX = "order_updtext_search_gin"
+
+
+def create_search_index(apps, schema_editor):
+    # Full-text search only exists on PostgreSQL; other backends use LIKE.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX {GIN_INDEX} ON order_orderupdtext USING gin (search_vector)"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {GIN_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('order', '0015_upd_pdf_blob_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderUpdText',
+            fields=[
+                ('order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='upd_text', serialize=False, to='order.order')),
+                ('sha256', models.CharField(max_length=64, verbose_name='SHA-256 УПД')),
+                ('number', models.CharField(blank=True, db_index=True, default='', max_length=64, verbose_name='Номер УПД')),
+                ('date', models.DateField(blank=True, db_index=True, null=True, verbose_name='Дата УПД')),
+                ('inn', models.CharField(blank=True, db_index=True, default='', max_length=12, verbose_name='ИНН продавца')),
+                ('text', models.TextField(blank=True, default='', verbose_name='Текст УПД')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('indexed_at', models.DateTimeField(auto_now=True, verbose_name='Дата индексации')),
+            ],
+            options={
+                'verbose_name': 'Текст УПД',
+                'verbose_name_plural': 'Тексты УПД',
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
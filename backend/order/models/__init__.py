@@ -5,6 +5,7 @@ from .order import Order
 from .order_delivery import OrderDelivery
 from .order_item import OrderItem
 from .pack_type import PackType
+from .upd_text import OrderUpdText
 
 __all__ = [
     "Client",
@@ -14,4 +15,5 @@ __all__ = [
     "OrderItem",
     "PackType",
     "OrderDelivery",
+    "OrderUpdText",
 ]
@@ -1,8 +1,14 @@
+from typing import Any
+
 from django.conf import settings
 from django.core.validators import FileExtensionValidator
 from django.db import models
+from django_cleanup import cleanup
+
+from core.services.blob_storage import get_blob_storage
 
 
+@cleanup.ignore
 class Order(models.Model):
 
     class Status(models.TextChoices):
@@ -11,6 +17,12 @@ class Order(models.Model):
         IN_PROGRESS = "in_progress", "В процессе"
         COMPLETED = "completed", "Завершен"
 
+    class ScanStatus(models.TextChoices):
+        PENDING = "pending", "Проверяется"
+        CLEAN = "clean", "Проверен"
+        INFECTED = "infected", "Заражён"
+        ERROR = "error", "Ошибка проверки"
+
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Дата обновления")
 
@@ -81,14 +93,33 @@ class Order(models.Model):
         through="order.OrderItem",
     )
 
+    # New uploads stay in quarantine until the background antivirus scan moves
+    # them to docs/upd/ (see order.services.upd_scan).
     upd_pdf = models.FileField(
-        upload_to="docs/upd/%Y/",
+        upload_to="quarantine/upd/",
+        storage=get_blob_storage,
+        max_length=255,
         validators=[FileExtensionValidator(allowed_extensions=["pdf"])],
         verbose_name="УПД в формате PDF",
         null=True,
         blank=True,
         help_text="Загрузите копию УПД (только PDF файлы)",
     )
+    upd_sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name="SHA-256 УПД",
+    )
+    upd_scan_status = models.CharField(
+        max_length=10,
+        choices=ScanStatus.choices,
+        blank=True,
+        default="",
+        editable=False,
+        verbose_name="Антивирусная проверка УПД",
+    )
 
     samples = models.BooleanField(
         default=False,
@@ -113,3 +144,33 @@ class Order(models.Model):
         permissions = [
             ("export_order", "Can export orders"),
         ]
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        # A file assigned since the last save is not committed to storage yet.
+        uploaded = bool(self.upd_pdf) and not getattr(self.upd_pdf, "_committed", True)
+
+        if uploaded:
+            from core.models import FileScanVerdict
+            from core.security.scan_cache import file_sha256, record_scan_result
+
+            self.upd_sha256 = file_sha256(self.upd_pdf.file)
+            record_scan_result(
+                self.upd_pdf.file,
+                kind=FileScanVerdict.Kind.UPD_PDF,
+                sha256=self.upd_sha256,
+            )
+            self.upd_scan_status = self.ScanStatus.PENDING
+        elif not self.upd_pdf:
+            self.upd_sha256 = ""
+            self.upd_scan_status = ""
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "upd_pdf" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "upd_sha256", "upd_scan_status"}
+
+        super().save(*args, **kwargs)
+
+        if uploaded:
+            from order.services.upd_scan import schedule_upd_scan
+
+            schedule_upd_scan(self)
@@ -0,0 +1,44 @@
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+
+class OrderUpdText(models.Model):
+    """
+    Text extracted from the УПД of an order, so orders can be searched by the УПД
+    number, date or INN without parsing PDFs (see ``order.services.upd_text``).
+
+    ``sha256`` is the ``Order.upd_sha256`` of the indexed file; rows left over from a
+    replaced or removed УПД are ignored by searches until the new file is indexed.
+    ``search_vector`` is only filled on PostgreSQL.
+    """
+
+    order = models.OneToOneField(
+        "order.Order",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="upd_text",
+    )
+    sha256 = models.CharField(max_length=64, verbose_name="SHA-256 УПД")
+    number = models.CharField(
+        max_length=64, blank=True, default="", db_index=True, verbose_name="Номер УПД"
+    )
+    date = models.DateField(
+        null=True, blank=True, db_index=True, verbose_name="Дата УПД"
+    )
+    inn = models.CharField(
+        max_length=12,
+        blank=True,
+        default="",
+        db_index=True,
+        verbose_name="ИНН продавца",
+    )
+    text = models.TextField(blank=True, default="", verbose_name="Текст УПД")
+    search_vector = SearchVectorField(null=True, editable=False)
+    indexed_at = models.DateTimeField(auto_now=True, verbose_name="Дата индексации")
+
+    class Meta:
+        verbose_name = "Текст УПД"
+        verbose_name_plural = "Тексты УПД"
+
+    def __str__(self) -> str:
+        return self.number or str(self.order_id)
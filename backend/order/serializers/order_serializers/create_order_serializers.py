@@ -199,6 +199,7 @@ class OrderReadSerializer(serializers.ModelSerializer):
             "status",
             "description",
             "upd_pdf",
+            "upd_scan_status",
             "samples",
             "user",
             "contacts",
@@ -13,7 +13,7 @@ class OrderUpdSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Order
-        fields = ["upd_pdf"]
+        fields = ["upd_pdf", "upd_scan_status"]
 
     def validate_upd_pdf(
         self,
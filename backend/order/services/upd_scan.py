@@ -0,0 +1,93 @@
+import logging
+import posixpath
+
+from django.db.models import QuerySet
+
+from core.models import FileScanVerdict
+from core.security.clamav import ClamAVUnavailableError
+from core.security.scan_cache import file_sha256, scan_with_cache
+from core.services.background import run_in_background
+from order.models import Order
+from order.services.upd_text import schedule_upd_index
+
+logger = logging.getLogger(__name__)
+
+UPD_QUARANTINE_DIR = "quarantine/upd/"
+UPD_CLEAN_DIR = "docs/upd/"
+
+
+def schedule_upd_scan(order: Order) -> None:
+    """
+    Scans a freshly uploaded УПД in the background once the upload is committed.
+    """
+    run_in_background(scan_order_upd, order.pk, order.upd_pdf.name)
+
+
+def _same_upload(order_pk: int, file_name: str) -> QuerySet[Order]:
+    return Order.objects.filter(pk=order_pk, upd_pdf=file_name)
+
+
+def scan_order_upd(order_pk: int, file_name: str) -> None:
+    """
+    Scans a quarantined УПД and moves it to ``docs/upd/`` if it is clean, then
+    schedules its text indexing (see ``order.services.upd_text``).
+
+    Does nothing if the order has a different file by now; that upload schedules its
+    own scan. Content already scanned with the current signatures is not scanned
+    again. Infected files stay in quarantine and are never served. If clamd is
+    unavailable the status becomes ``error`` and ``scan_upds`` retries it later.
+    """
+    order = _same_upload(order_pk, file_name).first()
+
+    if order is None or order.upd_scan_status not in (
+        Order.ScanStatus.PENDING,
+        Order.ScanStatus.ERROR,
+    ):
+        return
+
+    try:
+        with order.upd_pdf.open("rb") as file:
+            verdict = scan_with_cache(
+                file,
+                kind=FileScanVerdict.Kind.UPD_PDF,
+                sha256=order.upd_sha256 or file_sha256(file),
+            )
+
+    except (ClamAVUnavailableError, OSError):
+        logger.warning(
+            "Could not scan УПД of order %s (%s)", order_pk, file_name, exc_info=True
+        )
+        _same_upload(order_pk, file_name).update(upd_scan_status=Order.ScanStatus.ERROR)
+        return
+
+    if not verdict.is_clean:
+        logger.warning(
+            "Malware detected in УПД of order %s (%s): %s",
+            order_pk,
+            file_name,
+            verdict.detail,
+        )
+        _same_upload(order_pk, file_name).update(
+            upd_scan_status=Order.ScanStatus.INFECTED
+        )
+        return
+
+    if not file_name.startswith(UPD_QUARANTINE_DIR):
+        if _same_upload(order_pk, file_name).update(
+            upd_scan_status=Order.ScanStatus.CLEAN
+        ):
+            schedule_upd_index(order_pk, file_name)
+        return
+
+    # The quarantined blob may be shared with other uploads; unreferenced blobs are
+    # removed by the storage sweep.
+    with order.upd_pdf.open("rb") as file:
+        clean_name = order.upd_pdf.storage.save(
+            UPD_CLEAN_DIR + posixpath.basename(file_name), file
+        )
+
+    if _same_upload(order_pk, file_name).update(
+        upd_pdf=clean_name,
+        upd_scan_status=Order.ScanStatus.CLEAN,
+    ):
+        schedule_upd_index(order_pk, clean_name)
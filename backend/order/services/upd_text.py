@@ -0,0 +1,214 @@
+import datetime
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db import connections
+from django.db.models import F, Q, QuerySet
+from pypdf import PdfReader
+
+from core.services.background import run_in_background
+from order.models import Order, OrderUpdText
+
+logger = logging.getLogger(__name__)
+
+# A УПД is one or two pages; the limits only guard against unusual uploads.
+UPD_TEXT_MAX_PAGES = 20
+UPD_TEXT_MAX_LENGTH = 200_000
+
+SEARCH_CONFIG = "russian"
+
+_NUMBER_RE = re.compile(
+    r"(?:сч[её]т-фактура|упд)\s*№\s*(?P<number>[^\s,]+)\s*от\s*"
+    r"(?P<day>\d{1,2})[.\s]+(?P<month>\d{1,2}|[а-яё]+)[.\s]+(?P<year>\d{4})",
+    re.IGNORECASE,
+)
+_INN_RE = re.compile(r"ИНН[^\d\n]{0,40}?(\d{12}|\d{10})(?!\d)", re.IGNORECASE)
+_DATE_RE = re.compile(r"^(\d{1,2})\.(\d{1,2})\.(\d{4})$")
+
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        (
+            "января",
+            "февраля",
+            "марта",
+            "апреля",
+            "мая",
+            "июня",
+            "июля",
+            "августа",
+            "сентября",
+            "октября",
+            "ноября",
+            "декабря",
+        ),
+        start=1,
+    )
+}
+
+
+@dataclass(frozen=True)
+class UpdFields:
+    """
+    The searchable fields of a УПД; empty if the PDF has no text layer.
+    """
+
+    number: str = ""
+    date: datetime.date | None = None
+    inn: str = ""
+    text: str = ""
+
+
+def _to_date(day: str, month: str, year: str) -> datetime.date | None:
+    month_number = int(month) if month.isdigit() else _MONTHS.get(month.lower())
+    if month_number is None:
+        return None
+
+    try:
+        return datetime.date(int(year), month_number, int(day))
+    except ValueError:
+        return None
+
+
+def parse_upd_fields(text: str) -> UpdFields:
+    """
+    Finds the document number and date (``Счет-фактура № … от …``) and the seller's
+    INN, the first one on the form, in the text of a УПД.
+    """
+    number = ""
+    date = None
+
+    match = _NUMBER_RE.search(text)
+    if match is not None:
+        number = match.group("number")[:64]
+        date = _to_date(match.group("day"), match.group("month"), match.group("year"))
+
+    inn_match = _INN_RE.search(text)
+
+    return UpdFields(
+        number=number,
+        date=date,
+        inn=inn_match.group(1) if inn_match else "",
+        text=text,
+    )
+
+
+def extract_upd_fields(file: Any) -> UpdFields:
+    """
+    Extracts the text of a УПД with ``pypdf`` and parses its fields. Files that
+    cannot be read (scans without a text layer, damaged PDFs) give empty fields.
+    """
+    file.seek(0)
+    parts: list[str] = []
+    length = 0
+
+    try:
+        reader = PdfReader(file)
+        for page in reader.pages[:UPD_TEXT_MAX_PAGES]:
+            part = page.extract_text() or ""
+            parts.append(part)
+            length += len(part)
+            if length >= UPD_TEXT_MAX_LENGTH:
+                break
+    except Exception:
+        # pypdf raises all kinds of errors on malformed files; one must not stop
+        # the indexing of the others.
+        logger.warning("Could not extract text of УПД %s", file, exc_info=True)
+        return UpdFields()
+
+    return parse_upd_fields("\n".join(parts)[:UPD_TEXT_MAX_LENGTH])
+
+
+def schedule_upd_index(order_pk: int, file_name: str) -> None:
+    """
+    Indexes the text of a УПД in the background once it has passed the antivirus
+    check.
+    """
+    run_in_background(index_order_upd, order_pk, file_name)
+
+
+def index_order_upd(order_pk: int, file_name: str) -> None:
+    """
+    Stores the text and fields of the clean УПД of an order in ``OrderUpdText``.
+
+    Does nothing if the order has a different file by now or the file is already
+    indexed. Content indexed for another order is copied instead of parsed again.
+    ``index_upds`` picks up files whose indexing was lost.
+    """
+    order = Order.objects.filter(
+        pk=order_pk, upd_pdf=file_name, upd_scan_status=Order.ScanStatus.CLEAN
+    ).first()
+    if order is None or not order.upd_sha256:
+        return
+
+    if OrderUpdText.objects.filter(order=order, sha256=order.upd_sha256).exists():
+        return
+
+    indexed = (
+        OrderUpdText.objects.filter(sha256=order.upd_sha256)
+        .values("number", "date", "inn", "text")
+        .first()
+    )
+    if indexed is not None:
+        fields = UpdFields(**indexed)
+    else:
+        try:
+            with order.upd_pdf.open("rb") as file:
+                fields = extract_upd_fields(file)
+        except Exception:
+            logger.warning(
+                "Could not read УПД of order %s (%s)",
+                order_pk,
+                file_name,
+                exc_info=True,
+            )
+            return
+
+    OrderUpdText.objects.update_or_create(
+        order=order,
+        defaults={
+            "sha256": order.upd_sha256,
+            "number": fields.number,
+            "date": fields.date,
+            "inn": fields.inn,
+            "text": fields.text,
+        },
+    )
+
+    if connections[OrderUpdText.objects.db].vendor == "postgresql":
+        OrderUpdText.objects.filter(order=order).update(
+            search_vector=SearchVector("number", "inn", "text", config=SEARCH_CONFIG)
+        )
+
+
+def filter_orders_by_upd(queryset: QuerySet[Order], query: str) -> QuerySet[Order]:
+    """
+    Keeps orders whose current УПД has the given number, INN or date (``ДД.ММ.ГГГГ``),
+    or whose text contains the query: full-text search on PostgreSQL, a
+    case-insensitive substring match elsewhere. Only the index is read.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    matches = Q(upd_text__number__iexact=query) | Q(upd_text__inn=query)
+
+    date_match = _DATE_RE.match(query)
+    if date_match is not None:
+        date = _to_date(*date_match.groups())
+        if date is not None:
+            matches |= Q(upd_text__date=date)
+
+    if connections[queryset.db].vendor == "postgresql":
+        matches |= Q(
+            upd_text__search_vector=SearchQuery(
+                query, config=SEARCH_CONFIG, search_type="websearch"
+            )
+        )
+    else:
+        matches |= Q(upd_text__text__icontains=query)
+
+    return queryset.filter(Q(upd_text__sha256=F("upd_sha256")) & matches)
@@ -0,0 +1,262 @@
+import os
+import zlib
+from io import BytesIO
+from typing import Callable
+
+from pypdf import PdfWriter
+
+
+def _assemble(
+    objects: list[bytes],
+    *,
+    xref_stream: bool = False,
+    trailer_extra: bytes = b"",
+) -> bytes:
+    """
+    Writes objects ``1..n`` (object 1 is the catalog) with a classic xref table or a
+    Flate-compressed xref stream using the PNG Up predictor.
+    """
+    out = BytesIO()
+    out.write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+
+    xref_offset = out.tell()
+    size = len(objects) + 1
+
+    if not xref_stream:
+        out.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for offset in offsets:
+            out.write(b"%010d 00000 n \n" % offset)
+        out.write(b"trailer\n<< /Size %d /Root 1 0 R %s>>\n" % (size, trailer_extra))
+    else:
+        rows = [bytes([0, 0, 0, 0, 0xFF])]
+        rows += [bytes([1]) + offset.to_bytes(3, "big") + b"\0" for offset in offsets]
+        rows.append(bytes([1]) + xref_offset.to_bytes(3, "big") + b"\0")
+
+        encoded = bytearray()
+        previous = bytes(5)
+        for row in rows:
+            encoded += b"\x02" + bytes((a - b) & 0xFF for a, b in zip(row, previous))
+            previous = row
+        data = zlib.compress(bytes(encoded))
+
+        out.write(
+            b"%d 0 obj\n<< /Type /XRef /Size %d /W [1 3 1] /Root 1 0 R "
+            b"/Filter /FlateDecode /DecodeParms << /Predictor 12 /Columns 5 >> "
+            b"/Length %d %s>>\nstream\n" % (size, size + 1, len(data), trailer_extra)
+        )
+        out.write(data + b"\nendstream\nendobj\n")
+
+    out.write(b"startxref\n%d\n%%%%EOF\n" % xref_offset)
+    return out.getvalue()
+
+
+def _document(page_count: int, content_size: int = 0) -> list[bytes]:
+    first_page = 3
+    kids = b" ".join(b"%d 0 R" % (first_page + i * 2) for i in range(page_count))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, page_count),
+    ]
+
+    for i in range(page_count):
+        content = os.urandom(content_size)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Contents %d 0 R >>" % (first_page + i * 2 + 1)
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream"
+        )
+
+    return objects
+
+
+def text_pdf(lines: list[str]) -> bytes:
+    """
+    A one-page PDF whose text layer holds ``lines``, Cyrillic included, through a
+    single-byte font with a ``ToUnicode`` map.
+    """
+    alphabet = sorted(set("".join(lines)))
+    codes = {char: code for code, char in enumerate(alphabet, start=1)}
+
+    cmap = [
+        b"/CIDInit /ProcSet findresource begin 12 dict begin begincmap",
+        b"/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def",
+        b"/CMapName /Adobe-Identity-UCS def /CMapType 2 def",
+        b"1 begincodespacerange <00> <FF> endcodespacerange",
+    ]
+    for start in range(0, len(alphabet), 100):
+        chunk = alphabet[start : start + 100]
+        cmap.append(b"%d beginbfchar" % len(chunk))
+        cmap += [
+            b"<%02X> <%s>" % (codes[char], char.encode("utf-16-be").hex().encode())
+            for char in chunk
+        ]
+        cmap.append(b"endbfchar")
+    cmap.append(b"endcmap CMapName currentdict /CMap defineresource pop end end")
+    cmap_data = b"\n".join(cmap)
+
+    content = [b"BT /F1 10 Tf 40 800 Td"]
+    for line in lines:
+        encoded = bytes(codes[char] for char in line)
+        content.append(b"<%s> Tj 0 -14 Td" % encoded.hex().encode())
+    content.append(b"ET")
+    content_data = b"\n".join(content)
+
+    return _assemble(
+        [
+            b"<< /Type /Catalog /Pages 2 0 R >>",
+            b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+            b"<< /Length %d >>\nstream\n" % len(content_data)
+            + content_data
+            + b"\nendstream",
+            b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+            b"/ToUnicode 6 0 R >>",
+            b"<< /Length %d >>\nstream\n" % len(cmap_data) + cmap_data + b"\nendstream",
+        ]
+    )
+
+
+def small_pdf() -> bytes:
+    buffer = BytesIO()
+    writer = PdfWriter()
+    writer.add_blank_page(width=100, height=100)
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def large_pdf(page_count: int = 400, content_size: int = 24 * 1024) -> bytes:
+    """A scanned-document-sized file (about 10 MB) with many pages."""
+    return _assemble(_document(page_count, content_size))
+
+
+def xref_stream_pdf(page_count: int = 3) -> bytes:
+    return _assemble(_document(page_count, 1024), xref_stream=True)
+
+
+def incremental_update_pdf() -> bytes:
+    original = _assemble(_document(1))
+    prev = int(original.rsplit(b"startxref\n", 1)[1].split(b"\n")[0])
+
+    update = BytesIO()
+    update.write(original)
+    pages_offset = update.tell()
+    update.write(b"2 0 obj\n<< /Type /Pages /Kids [3 0 R 5 0 R] /Count 2 >>\nendobj\n")
+    page_offset = update.tell()
+    update.write(
+        b"5 0 obj\n<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Contents 4 0 R >>\nendobj\n"
+    )
+    xref_offset = update.tell()
+    update.write(
+        b"xref\n2 1\n%010d 00000 n \n5 1\n%010d 00000 n \n"
+        % (pages_offset, page_offset)
+    )
+    update.write(b"trailer\n<< /Size 6 /Root 1 0 R /Prev %d >>\n" % prev)
+    update.write(b"startxref\n%d\n%%%%EOF\n" % xref_offset)
+    return update.getvalue()
+
+
+def encrypted_pdf() -> bytes:
+    buffer = BytesIO()
+    writer = PdfWriter()
+    writer.add_blank_page(width=100, height=100)
+    writer.encrypt("secret")
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def zero_pages_pdf() -> bytes:
+    return _assemble(_document(0))
+
+
+def truncated_pdf() -> bytes:
+    return large_pdf(page_count=20)[:-4096]
+
+
+def bad_startxref_pdf() -> bytes:
+    content = _assemble(_document(1))
+    head, _offset = content.rsplit(b"startxref\n", 1)
+    return head + b"startxref\n%d\n%%%%EOF\n" % (len(content) * 2)
+
+
+def trailing_spaces_pdf() -> bytes:
+    """A valid file with more than ``TAIL_SIZE`` bytes after its ``%%EOF``."""
+    return small_pdf() + b" " * 3000
+
+
+def trailing_nuls_pdf() -> bytes:
+    return small_pdf() + b"\0" * 4096
+
+
+def garbage_pdf(size: int = 512 * 1024) -> bytes:
+    return b"%PDF-1.7\n" + os.urandom(size)
+
+
+def deeply_nested_pdf(depth: int = 3000) -> bytes:
+    return _assemble(
+        _document(1), trailer_extra=b"/Nested " + b"[" * depth + b"]" * depth + b" "
+    )
+
+
+def _malformed_xref_stream_pdf(old: bytes, new: bytes) -> bytes:
+    content = xref_stream_pdf()
+    assert old in content
+    return content.replace(old, new)
+
+
+def reference_decode_parms_pdf() -> bytes:
+    return _malformed_xref_stream_pdf(
+        b"/DecodeParms << /Predictor 12 /Columns 5 >>", b"/DecodeParms 5 0 R"
+    )
+
+
+def scalar_index_pdf() -> bytes:
+    return _malformed_xref_stream_pdf(b"/Type /XRef ", b"/Type /XRef /Index 5 ")
+
+
+def name_in_widths_pdf() -> bytes:
+    return _malformed_xref_stream_pdf(b"/W [1 3 1]", b"/W [1 /A 1]")
+
+
+def fractional_size_pdf() -> bytes:
+    return _malformed_xref_stream_pdf(
+        b"/Type /XRef /Size 10 ", b"/Type /XRef /Size 1.5 "
+    )
+
+
+def name_predictor_pdf() -> bytes:
+    return _malformed_xref_stream_pdf(b"/Predictor 12", b"/Predictor /X")
+
+
+# name -> (builder, expected page count or None if the file must be rejected)
+PDF_CORPUS: dict[str, tuple[Callable[[], bytes], int | None]] = {
+    "small": (small_pdf, 1),
+    "large": (large_pdf, 400),
+    "xref_stream": (xref_stream_pdf, 3),
+    "incremental_update": (incremental_update_pdf, 2),
+    "zero_pages": (zero_pages_pdf, 0),
+    "trailing_spaces": (trailing_spaces_pdf, 1),
+    "trailing_nuls": (trailing_nuls_pdf, 1),
+    "encrypted": (encrypted_pdf, None),
+    "truncated": (truncated_pdf, None),
+    "bad_startxref": (bad_startxref_pdf, None),
+    "garbage": (garbage_pdf, None),
+}
+
+# Crafted values the fast path must defer to the full parse rather than crash on.
+MALFORMED_PDF_CORPUS: dict[str, Callable[[], bytes]] = {
+    "deeply_nested": deeply_nested_pdf,
+    "reference_decode_parms": reference_decode_parms_pdf,
+    "scalar_index": scalar_index_pdf,
+    "name_in_widths": name_in_widths_pdf,
+    "fractional_size": fractional_size_pdf,
+    "name_predictor": name_predictor_pdf,
+}
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from datetime import date, timedelta
 from decimal import Decimal
-from io import BytesIO
+from io import BytesIO, StringIO
 from tempfile import TemporaryDirectory
 from typing import Any, ClassVar
 from unittest import SkipTest
@@ -11,6 +11,7 @@ import pytest
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Permission, User
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.test import override_settings
 from django.urls import reverse
 from pypdf import PdfWriter
@@ -23,6 +24,8 @@ from core.security.clamav import (
     ClamAVUnavailableError,
     MalwareDetectedError,
 )
+from core.security.scan_cache import scan_with_cache
+from core.services.blob_storage import sweep_unreferenced_blobs
 from core.tests.authentication_tests import AuthenticationContractMixin
 from core.tests.base_test_case import BaseAPIMixin
 from core.tests.base_view_test_case import BaseViewTestCase
@@ -37,6 +40,7 @@ from order.serializers.order_serializers.create_order_serializers import (
 )
 from order.tests.factories import (
     ClientFactory,
+    ConstructionObjectFactory,
     CustomerFactory,
     OrderDeliveryDataFactory,
     OrderFactory,
@@ -180,6 +184,9 @@ class TestOrderUpdUploadAPIView(APITestCase, TestLoggerMixin):
         self.order.refresh_from_db()
 
         self.assertFalse(self.order.upd_pdf)
+        self.assertTrue(storage.exists(old_file_name))
+
+        sweep_unreferenced_blobs(grace_seconds=0)
         self.assertFalse(storage.exists(old_file_name))
 
     def test_replace_upd_pdf_deletes_old_file(self) -> None:
@@ -225,54 +232,58 @@ class TestOrderUpdUploadAPIView(APITestCase, TestLoggerMixin):
         new_file_name = self.order.upd_pdf.name
 
         self.assertNotEqual(old_file_name, new_file_name)
+
+        sweep_unreferenced_blobs(grace_seconds=0)
         self.assertFalse(storage.exists(old_file_name))
         self.assertTrue(storage.exists(new_file_name))
 
-    @patch("order.validators.upd_pdf.scan_file_for_malware")
-    def test_upload_pdf_with_malware_returns_400(
+    @patch("core.security.scan_cache.scan_file_for_malware")
+    def test_upload_pdf_with_malware_is_quarantined(
         self,
         mock_scan: MagicMock,
     ) -> None:
+        self._logger_header("TEST UPLOAD PDF with malware stays in quarantine")
         mock_scan.side_effect = MalwareDetectedError("Eicar-Test-Signature FOUND")
 
         file = make_test_pdf()
 
-        response = self.client.patch(
-            self.url,
-            {"upd_pdf": file},
-            format="multipart",
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                self.url,
+                {"upd_pdf": file},
+                format="multipart",
+            )
 
         self.assertEqual(
             response.status_code,
-            status.HTTP_400_BAD_REQUEST,
+            status.HTTP_200_OK,
             response.data,
         )
-
-        self.assertIn("errors", response.data)
-        self.assertIn("upd_pdf", response.data["errors"])
+        self.assertEqual(response.data["upd_scan_status"], Order.ScanStatus.PENDING)
 
         self.order.refresh_from_db()
 
-        self.assertFalse(self.order.upd_pdf)
+        self.assertEqual(self.order.upd_scan_status, Order.ScanStatus.INFECTED)
+        self.assertTrue(self.order.upd_pdf.name.startswith("quarantine/upd/"))
 
         mock_scan.assert_called_once()
 
-    @patch("order.validators.upd_pdf.scan_file_for_malware")
-    def test_upload_pdf_when_clamav_unavailable_returns_503(
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}✓ Infected file accepted but kept in quarantine{self.COLOR['END']}"
+        )
+
+    @patch("core.security.scan_cache.scan_file_for_malware")
+    def test_upload_pdf_when_clamav_unavailable_marks_error(
         self,
         mock_scan: MagicMock,
     ) -> None:
 
-        self._logger_header("TEST UPLOAD PDF when ClamAV unavailable returns 503")
+        self._logger_header("TEST UPLOAD PDF when ClamAV unavailable marks scan error")
         mock_scan.side_effect = ClamAVUnavailableError("ClamAV недоступен.")
 
         file = make_test_pdf()
 
-        with (
-            self.assertLogs("core.api.exceptions", level="ERROR"),
-            self.assertLogs("django.request", level="ERROR"),
-        ):
+        with self.captureOnCommitCallbacks(execute=True):
             response = self.client.patch(
                 self.url,
                 {"upd_pdf": file},
@@ -281,18 +292,97 @@ class TestOrderUpdUploadAPIView(APITestCase, TestLoggerMixin):
 
         self.assertEqual(
             response.status_code,
-            status.HTTP_503_SERVICE_UNAVAILABLE,
+            status.HTTP_200_OK,
             response.data,
         )
 
         self.order.refresh_from_db()
 
-        self.assertFalse(self.order.upd_pdf)
+        self.assertEqual(self.order.upd_scan_status, Order.ScanStatus.ERROR)
 
-        mock_scan.assert_called_once()
+        mock_scan.side_effect = None
+        call_command("scan_upds", stdout=StringIO())
+
+        self.order.refresh_from_db()
+
+        self.assertEqual(self.order.upd_scan_status, Order.ScanStatus.CLEAN)
+        self.assertTrue(self.order.upd_pdf.name.startswith("docs/upd/"))
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}✓ "
+            "Antivirus outage does not block the upload and is retried"
+            f"{self.COLOR['END']}"
+        )
+
+    @patch("order.services.upd_scan.scan_with_cache", wraps=scan_with_cache)
+    def test_reupload_of_same_pdf_skips_checks(self, mock_scan: MagicMock) -> None:
+        self._logger_header("TEST UPLOAD same PDF twice skips validation and scan")
+        content = make_test_pdf().read()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                self.url,
+                {"upd_pdf": SimpleUploadedFile("upd.pdf", content)},
+                format="multipart",
+            )
+
+        with (
+            patch("order.validators.upd_pdf.PdfReader") as mock_reader,
+            patch("core.security.scan_cache.scan_file_for_malware") as mock_clamav,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.patch(
+                self.url,
+                {"upd_pdf": SimpleUploadedFile("again.pdf", content)},
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        mock_reader.assert_not_called()
+        mock_clamav.assert_not_called()
+        self.assertEqual(mock_scan.call_count, 2)
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.upd_scan_status, Order.ScanStatus.CLEAN)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}✓ Known content accepted from the verdict cache{self.COLOR['END']}"
+        )
+
+    def test_view_upd_waits_for_clean_scan(self) -> None:
+        self._logger_header("TEST VIEW UPD only after a clean scan")
+        view_url = reverse(
+            f"order_orders:{OrderRoutes.VIEW_UPD.name}",
+            kwargs={"pk": self.order.pk},
+        )
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.patch(
+                self.url,
+                {"upd_pdf": make_test_pdf()},
+                format="multipart",
+            )
+
+        self.assertEqual(
+            self.client.get(view_url).status_code,
+            status.HTTP_409_CONFLICT,
+        )
+
+        for callback in callbacks:
+            callback()
+
+        self.order.refresh_from_db()
+        response = self.client.get(view_url)
+
+        self.assertEqual(self.order.upd_scan_status, Order.ScanStatus.CLEAN)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        quarantined = self.order.upd_pdf.name.replace("docs/upd/", "quarantine/upd/")
+        sweep_unreferenced_blobs(grace_seconds=0)
+        self.assertFalse(self.order.upd_pdf.storage.exists(quarantined))
 
         print(
-            f"{self.INDENT}{self.COLOR['OK']}✓ Antivirus unavailable handled correctly | HTTP 503{self.COLOR['END']}"
+            f"{self.INDENT}{self.COLOR['OK']}✓ File served only once moved out of quarantine{self.COLOR['END']}"
         )
 
     def test_get_is_not_allowed(self) -> None:
@@ -396,6 +486,19 @@ class TestOrderAPIList(BaseAPIMixin):
         """Test creating an order with no data."""
         self._create_logic(self.payload_generator()[0])
 
+    def test_query_budget(self) -> None:
+        """Test that listing orders does not query per order."""
+
+        def seed() -> None:
+            order = OrderFactory.create(
+                customer_object=ConstructionObjectFactory.create()
+            )
+            OrderItemFactory.create_batch(2, order=order)
+            OrderDeliveryDataFactory.create(order=order)
+            order.contacts.add(ContactFactory.create())
+
+        self._assert_query_budget(reverse(self.url_name), seed)
+
     def test_create_order(self) -> None:
         """Test creating an order with valid data."""
 
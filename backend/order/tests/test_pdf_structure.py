@@ -0,0 +1,189 @@
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+from pypdf import PdfReader
+from rest_framework import serializers
+
+from core.tests.utils import TestLoggerMixin
+from order.tests.pdf_corpus import (
+    MALFORMED_PDF_CORPUS,
+    PDF_CORPUS,
+    large_pdf,
+    small_pdf,
+    trailing_nuls_pdf,
+    trailing_spaces_pdf,
+    xref_stream_pdf,
+)
+from order.tests.test_upd_pdf_validation import make_uploaded_file
+from order.validators.pdf_structure import (
+    MAX_READ_BYTES,
+    MAX_SECONDS,
+    TAIL_SIZE,
+    PdfStructureUndecided,
+    _PdfFile,
+    _read_xref_stream,
+    inspect_pdf_structure,
+)
+from order.validators.upd_pdf import _inspect_with_pypdf, validate_upd_pdf
+
+
+class TestPdfStructure(TestLoggerMixin):
+    def test_corpus_matches_full_parse(self) -> None:
+        self._logger_header("TEST: fast path agrees with the full parse")
+
+        for name, (build, expected_pages) in PDF_CORPUS.items():
+            content = build()
+
+            try:
+                structure = inspect_pdf_structure(BytesIO(content), len(content))
+            except PdfStructureUndecided:
+                # Decided by the full parse the validator falls back to.
+                upload = make_uploaded_file(content)
+                if expected_pages is None:
+                    with pytest.raises(serializers.ValidationError):
+                        _inspect_with_pypdf(upload)
+                else:
+                    assert _inspect_with_pypdf(upload).page_count == expected_pages
+                continue
+
+            if expected_pages is None:
+                assert structure.is_encrypted, name
+                assert PdfReader(BytesIO(content)).is_encrypted, name
+                continue
+
+            assert structure.page_count == expected_pages, name
+            assert len(PdfReader(BytesIO(content), strict=True).pages) == expected_pages
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Page counts and rejections match pypdf for the whole corpus"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_large_pdf_reads_little(self) -> None:
+        self._logger_header("TEST: large PDF inspected within a small read budget")
+        content = large_pdf()
+
+        structure = inspect_pdf_structure(
+            BytesIO(content), len(content), max_bytes=64 * 1024
+        )
+
+        assert structure.page_count == 400
+
+        with pytest.raises(PdfStructureUndecided):
+            inspect_pdf_structure(BytesIO(content), len(content), max_bytes=1024)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ 10 MB file validated from under 64 KiB; smaller budget defers"
+            f"{self.COLOR['END']}"
+        )
+
+    @pytest.mark.django_db
+    def test_undecided_falls_back_to_full_parse(self) -> None:
+        self._logger_header("TEST: undecided files fall back to pypdf")
+
+        with (
+            patch(
+                "order.validators.upd_pdf.inspect_pdf_structure",
+                side_effect=PdfStructureUndecided,
+            ),
+            patch("order.validators.upd_pdf.PdfReader", wraps=PdfReader) as reader,
+        ):
+            assert validate_upd_pdf(make_uploaded_file(small_pdf())) is not None
+
+        reader.assert_called_once()
+
+        with patch("order.validators.upd_pdf.PdfReader") as reader:
+            validate_upd_pdf(make_uploaded_file(large_pdf(page_count=10)))
+
+        reader.assert_not_called()
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Full parse only when the fast path cannot decide"
+            f"{self.COLOR['END']}"
+        )
+
+    @pytest.mark.django_db
+    def test_trailing_data_after_eof_accepted(self) -> None:
+        self._logger_header("TEST: data after %%EOF longer than the tail")
+
+        for build in (trailing_spaces_pdf, trailing_nuls_pdf):
+            content = build()
+            assert len(content) - content.rindex(b"%%EOF") > TAIL_SIZE
+
+            with pytest.raises(PdfStructureUndecided):
+                inspect_pdf_structure(BytesIO(content), len(content))
+
+            assert validate_upd_pdf(make_uploaded_file(content)) is not None
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Marker outside the tail defers to pypdf, which accepts the file"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_malformed_corpus_is_undecided(self) -> None:
+        self._logger_header("TEST: crafted values defer to the full parse")
+
+        for build in MALFORMED_PDF_CORPUS.values():
+            content = build()
+
+            with pytest.raises(PdfStructureUndecided):
+                inspect_pdf_structure(BytesIO(content), len(content))
+
+        with patch(
+            "order.validators.pdf_structure._read_xref_stream", side_effect=KeyError
+        ):
+            content = xref_stream_pdf()
+            with pytest.raises(PdfStructureUndecided):
+                inspect_pdf_structure(BytesIO(content), len(content))
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Nesting, xref stream values and unexpected errors all undecided"
+            f"{self.COLOR['END']}"
+        )
+
+    @pytest.mark.django_db
+    def test_malformed_corpus_rejected_by_validation(self) -> None:
+        self._logger_header("TEST: crafted PDFs decided by the full parse")
+
+        # pypdf repairs some of them; anything but a validation error would be a 500.
+        for build in MALFORMED_PDF_CORPUS.values():
+            try:
+                validate_upd_pdf(make_uploaded_file(build()))
+            except serializers.ValidationError:
+                pass
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Every crafted file accepted by pypdf or rejected, none crashes"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_exhausted_budget_limits_decompression(self) -> None:
+        self._logger_header("TEST: no decompression once the read budget is spent")
+        content = xref_stream_pdf()
+        xref_offset = int(content.rsplit(b"startxref\n", 1)[1].split(b"\n")[0])
+        pdf = _PdfFile(BytesIO(content), len(content), MAX_READ_BYTES, MAX_SECONDS)
+        read_at = pdf.read_at
+
+        def exhausting_read(offset: int, length: int) -> bytes:
+            # Every read spends whatever is left of the budget.
+            pdf.remaining = min(length, len(content) - offset)
+            return read_at(offset, length)
+
+        with (
+            patch.object(pdf, "read_at", side_effect=exhausting_read),
+            pytest.raises(PdfStructureUndecided, match="exceeds the read budget"),
+        ):
+            _read_xref_stream(pdf, xref_offset)
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Xref stream inflated by at most one byte with no budget left"
+            f"{self.COLOR['END']}"
+        )
@@ -0,0 +1,188 @@
+from datetime import date
+from io import StringIO
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.tests.utils import TestLoggerMixin
+from order.models import Order, OrderUpdText
+from order.routes import OrderRoutes
+from order.services.upd_text import parse_upd_fields
+from order.tests.factories import OrderFactory
+from order.tests.pdf_corpus import small_pdf, text_pdf
+
+
+def upd_lines(number: str, seller_inn: str = "7701234567") -> list[str]:
+    return [
+        "Универсальный передаточный документ",
+        f"Счет-фактура № {number} от 15 марта 2024 г.",
+        "Продавец: ООО Миксити",
+        f"ИНН/КПП продавца: {seller_inn}/770101001",
+        "ИНН/КПП покупателя: 5001234567/500101001",
+        "Товар: Смесь сухая штукатурная",
+    ]
+
+
+@pytest.mark.django_db
+class TestUpdTextIndex(APITestCase, TestLoggerMixin):
+    def setUp(self) -> None:
+        super().setUp()
+
+        self.user = get_user_model().objects.create_superuser(
+            username="test_upd_text_admin",
+            email="test_upd_text_admin@example.com",
+            password="test_password",
+        )
+        self.client.force_authenticate(user=self.user)
+
+        temp_media = TemporaryDirectory()
+        self.addCleanup(temp_media.cleanup)
+        override_media = override_settings(MEDIA_ROOT=temp_media.name)
+        override_media.enable()
+        self.addCleanup(override_media.disable)
+
+        self.list_url = reverse(f"order_orders:{OrderRoutes.LIST_CREATE.name}")
+
+    def _upload(self, order: Order, content: bytes) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse(
+                    f"order_orders:{OrderRoutes.UPLOAD_UPD.name}",
+                    kwargs={"pk": order.pk},
+                ),
+                {"upd_pdf": SimpleUploadedFile("upd.pdf", content)},
+                format="multipart",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+    def _search(self, query: str) -> set[int]:
+        response = self.client.get(self.list_url, {"upd_search": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {order["id"] for order in response.data}
+
+    def test_parse_upd_fields(self) -> None:
+        self._logger_header("TEST: УПД fields parsed from text")
+        fields = parse_upd_fields("\n".join(upd_lines("А-17")))
+
+        self.assertEqual(fields.number, "А-17")
+        self.assertEqual(fields.date, date(2024, 3, 15))
+        self.assertEqual(fields.inn, "7701234567")
+
+        fields = parse_upd_fields("УПД №42 от 01.02.2025\nИНН 500123456789")
+        self.assertEqual(fields.number, "42")
+        self.assertEqual(fields.date, date(2025, 2, 1))
+        self.assertEqual(fields.inn, "500123456789")
+
+        self.assertEqual(parse_upd_fields("").number, "")
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Number, date and seller INN found in both date formats"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_search_orders_by_upd(self) -> None:
+        self._logger_header("TEST: order list searched by УПД")
+        order = OrderFactory.create()
+        other = OrderFactory.create()
+        self._upload(order, text_pdf(upd_lines("1234/5")))
+        self._upload(other, text_pdf(upd_lines("999", seller_inn="7800000001")))
+
+        index = OrderUpdText.objects.get(order=order)
+        self.assertEqual(index.number, "1234/5")
+        self.assertEqual(index.date, date(2024, 3, 15))
+        self.assertEqual(index.inn, "7701234567")
+
+        with patch("order.services.upd_text.PdfReader") as mock_reader:
+            self.assertEqual(self._search("1234/5"), {order.pk})
+            self.assertEqual(self._search("7800000001"), {other.pk})
+            self.assertEqual(self._search("5001234567"), {order.pk, other.pk})
+            self.assertEqual(self._search("15.03.2024"), {order.pk, other.pk})
+            self.assertEqual(self._search("Миксити"), {order.pk, other.pk})
+            self.assertEqual(self._search("нет такого"), set())
+
+        mock_reader.assert_not_called()
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Number, INN, date and text searched from the index only"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_replaced_upd_and_shared_content(self) -> None:
+        self._logger_header("TEST: stale index ignored, shared content not reparsed")
+        order = OrderFactory.create()
+        content = text_pdf(upd_lines("77"))
+        self._upload(order, content)
+
+        copy = OrderFactory.create()
+        with patch("order.services.upd_text.PdfReader") as mock_reader:
+            self._upload(copy, content)
+
+        mock_reader.assert_not_called()
+        self.assertEqual(OrderUpdText.objects.get(order=copy).number, "77")
+
+        self._upload(order, small_pdf())
+
+        self.assertEqual(self._search("77"), {copy.pk})
+        self.assertEqual(OrderUpdText.objects.get(order=order).number, "")
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Only the current УПД of an order is searched"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_index_upds_command(self) -> None:
+        self._logger_header("TEST: index_upds indexes leftovers")
+        order = OrderFactory.create()
+        self._upload(order, text_pdf(upd_lines("55")))
+        OrderUpdText.objects.all().delete()
+
+        self.assertEqual(self._search("55"), set())
+
+        out = StringIO()
+        call_command("index_upds", stdout=out)
+
+        self.assertIn("УПД indexed: 1.", out.getvalue())
+        self.assertEqual(self._search("55"), {order.pk})
+
+        out = StringIO()
+        call_command("index_upds", stdout=out)
+        self.assertIn("УПД indexed: 0.", out.getvalue())
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Missing index rows rebuilt once"
+            f"{self.COLOR['END']}"
+        )
+
+    def test_unreadable_upd_does_not_stop_index_upds(self) -> None:
+        self._logger_header("TEST: index_upds skips malformed УПД")
+        orders = [OrderFactory.create(), OrderFactory.create()]
+        for order in orders:
+            self._upload(order, text_pdf(upd_lines(str(order.pk))))
+        OrderUpdText.objects.all().delete()
+
+        with patch("order.services.upd_text.PdfReader", side_effect=RecursionError):
+            call_command("index_upds", stdout=StringIO())
+
+        self.assertEqual(
+            set(OrderUpdText.objects.filter(text="").values_list("order", flat=True)),
+            {order.pk for order in orders},
+        )
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Unexpected pypdf errors give empty fields, every order indexed"
+            f"{self.COLOR['END']}"
+        )
@@ -0,0 +1,522 @@
+import re
+import time
+import zlib
+from dataclasses import dataclass
+from typing import IO, Any, NamedTuple
+
+# The fast path gives up (and the caller falls back to a full parse) once it has
+# read this many bytes or spent this much time on a single file.
+MAX_READ_BYTES = 512 * 1024
+MAX_SECONDS = 0.05
+
+TAIL_SIZE = 2048
+OBJECT_WINDOW = 4096
+MAX_OBJECT_WINDOW = 64 * 1024
+MAX_XREF_SECTIONS = 8
+MAX_NESTING = 32
+
+_WHITESPACE = b" \t\r\n\f\0"
+_DELIMITERS = b"()<>[]{}/%"
+_NUMBER_START = b"+-.0123456789"
+
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)\s+%%EOF")
+_OBJECT_HEADER_RE = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj")
+_SUBSECTION_RE = re.compile(rb"\s*(\d+)\s+(\d+)[ \t]*(?:\r\n|\r|\n)")
+_REF_TAIL_RE = re.compile(rb"\s+(\d+)\s+R(?=[\s/<>\[\]()%]|$)")
+_XREF_ENTRY_RE = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_STREAM_RE = re.compile(rb"\s*stream(?:\r\n|\n)")
+
+
+class PdfStructureUndecided(Exception):
+    """The fast path cannot tell whether the file is valid; a full parse is needed."""
+
+
+@dataclass(frozen=True)
+class PdfStructure:
+    """
+    What the fast path learned about a PDF.
+
+    Attributes:
+        page_count: The ``/Count`` of the root page tree node.
+        is_encrypted: Whether the trailer references an ``/Encrypt`` dictionary.
+    """
+
+    page_count: int
+    is_encrypted: bool
+
+
+class _Ref(NamedTuple):
+    number: int
+    generation: int
+
+
+class _Name(str):
+    pass
+
+
+class _Truncated(Exception):
+    pass
+
+
+def _skip_whitespace(data: bytes, pos: int) -> int:
+    while pos < len(data):
+        if data[pos] in _WHITESPACE:
+            pos += 1
+        elif data[pos] == ord("%"):
+            while pos < len(data) and data[pos] not in b"\r\n":
+                pos += 1
+        else:
+            return pos
+    return pos
+
+
+def _regular_end(data: bytes, pos: int) -> int:
+    while pos < len(data) and data[pos] not in _WHITESPACE + _DELIMITERS:
+        pos += 1
+    return pos
+
+
+def _skip_literal_string(data: bytes, pos: int) -> int:
+    depth = 0
+    while pos < len(data):
+        char = data[pos]
+        if char == ord("\\"):
+            pos += 2
+            continue
+        if char == ord("("):
+            depth += 1
+        elif char == ord(")"):
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    raise _Truncated
+
+
+def _parse_number(data: bytes, pos: int) -> tuple[Any, int]:
+    end = _regular_end(data, pos)
+    token = data[pos:end]
+    if end == len(data):
+        raise _Truncated
+
+    try:
+        number: Any = int(token)
+    except ValueError:
+        try:
+            return float(token), end
+        except ValueError as exc:
+            raise PdfStructureUndecided(f"bad number {token!r}") from exc
+
+    # "12 0 R" is an indirect reference.
+    match = _REF_TAIL_RE.match(data, end)
+    if match:
+        if match.end() == len(data):
+            raise _Truncated
+        return _Ref(number, int(match.group(1))), match.end()
+
+    return number, end
+
+
+def _parse_object(data: bytes, pos: int, depth: int = 0) -> tuple[Any, int]:
+    """
+    Parses one direct PDF object starting at ``pos``; streams are not followed.
+    """
+    if depth > MAX_NESTING:
+        raise PdfStructureUndecided("objects nested too deeply")
+
+    pos = _skip_whitespace(data, pos)
+    if pos >= len(data):
+        raise _Truncated
+
+    if data.startswith(b"<<", pos):
+        result: dict[str, Any] = {}
+        pos += 2
+        while True:
+            pos = _skip_whitespace(data, pos)
+            if data.startswith(b">>", pos):
+                return result, pos + 2
+            key, pos = _parse_object(data, pos, depth + 1)
+            if not isinstance(key, _Name):
+                raise PdfStructureUndecided("dictionary key is not a name")
+            result[key], pos = _parse_object(data, pos, depth + 1)
+
+    char = data[pos]
+
+    if char == ord("["):
+        items = []
+        pos += 1
+        while True:
+            pos = _skip_whitespace(data, pos)
+            if pos >= len(data):
+                raise _Truncated
+            if data[pos] == ord("]"):
+                return items, pos + 1
+            item, pos = _parse_object(data, pos, depth + 1)
+            items.append(item)
+
+    if char == ord("/"):
+        end = _regular_end(data, pos + 1)
+        if end == len(data):
+            raise _Truncated
+        return _Name(data[pos:end].decode("latin-1")), end
+
+    if char == ord("("):
+        end = _skip_literal_string(data, pos)
+        return data[pos + 1 : end - 1], end
+
+    if char == ord("<"):
+        end = data.find(b">", pos)
+        if end < 0:
+            raise _Truncated
+        return data[pos + 1 : end], end + 1
+
+    if char in _NUMBER_START:
+        return _parse_number(data, pos)
+
+    end = _regular_end(data, pos)
+    if end == len(data):
+        raise _Truncated
+    if end == pos:
+        raise PdfStructureUndecided(f"unexpected byte {data[pos:pos + 1]!r}")
+
+    keyword = data[pos:end]
+    values = {b"true": True, b"false": False, b"null": None}
+    if keyword not in values:
+        raise PdfStructureUndecided(f"unexpected keyword {keyword!r}")
+    return values[keyword], end
+
+
+def _non_negative_int(value: Any, name: str) -> int:
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise PdfStructureUndecided(f"bad {name} in xref stream")
+    return value
+
+
+def _png_unpredict(data: bytes, columns: int) -> bytes:
+    row_size = columns + 1
+    if len(data) % row_size:
+        raise PdfStructureUndecided("xref stream rows do not match /Columns")
+
+    previous = bytearray(columns)
+    result = bytearray()
+
+    for start in range(0, len(data), row_size):
+        kind = data[start]
+        row = bytearray(data[start + 1 : start + row_size])
+
+        for i in range(columns):
+            left = row[i - 1] if i else 0
+            up = previous[i]
+            up_left = previous[i - 1] if i else 0
+
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif kind == 3:
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif kind == 4:
+                estimate = left + up - up_left
+                distances = (
+                    abs(estimate - left),
+                    abs(estimate - up),
+                    abs(estimate - up_left),
+                )
+                row[i] = (
+                    row[i] + (left, up, up_left)[distances.index(min(distances))]
+                ) & 0xFF
+            elif kind != 0:
+                raise PdfStructureUndecided(f"unknown PNG predictor {kind}")
+
+        result += row
+        previous = row
+
+    return bytes(result)
+
+
+class _PdfFile:
+    """
+    Reads a PDF through hard byte and time budgets.
+    """
+
+    def __init__(
+        self, file: IO[bytes], size: int, max_bytes: int, max_seconds: float
+    ) -> None:
+        self.file = file
+        self.size = size
+        self.remaining = max_bytes
+        self.deadline = time.monotonic() + max_seconds
+        # Newest first; each maps an object number to ("offset", offset),
+        # ("compressed", object stream number) or ("free", 0) via ``get()``.
+        self.sections: list[Any] = []
+
+    def read_at(self, offset: int, length: int) -> bytes:
+        if offset < 0 or offset >= self.size:
+            raise PdfStructureUndecided(f"offset {offset} outside the file")
+
+        length = min(length, self.size - offset)
+        self.remaining -= length
+
+        if self.remaining < 0:
+            raise PdfStructureUndecided("read budget exceeded")
+        if time.monotonic() > self.deadline:
+            raise PdfStructureUndecided("time budget exceeded")
+
+        self.file.seek(offset)
+        return self.file.read(length)
+
+    def parse_at(self, offset: int) -> tuple[Any, bytes, int]:
+        """
+        Parses the object at ``offset``, growing the window while it is cut off.
+        Returns the object, the window and the position after it.
+        """
+        window = OBJECT_WINDOW
+        while True:
+            data = self.read_at(offset, window)
+            try:
+                value, end = _parse_object(data, 0)
+                return value, data, end
+            except _Truncated:
+                if len(data) < window or window >= MAX_OBJECT_WINDOW:
+                    raise PdfStructureUndecided("object does not fit the window")
+                window *= 4
+
+    def indirect_object(
+        self, offset: int, number: int | None = None
+    ) -> tuple[Any, bytes, int]:
+        header = _OBJECT_HEADER_RE.match(self.read_at(offset, 64))
+        if header is None or (number is not None and int(header.group(1)) != number):
+            raise PdfStructureUndecided(f"no object {number} at offset {offset}")
+
+        start = offset + header.end()
+        value, data, end = self.parse_at(start)
+        return value, data, start + end
+
+    def resolve(self, ref: _Ref) -> Any:
+        for section in self.sections:
+            entry = section.get(ref.number)
+            if entry is None:
+                continue
+
+            kind, value = entry
+            if kind == "free":
+                raise PdfStructureUndecided(f"object {ref.number} is free")
+            if kind == "compressed":
+                raise PdfStructureUndecided(
+                    f"object {ref.number} is in an object stream"
+                )
+
+            return self.indirect_object(value, ref.number)[0]
+
+        raise PdfStructureUndecided(f"object {ref.number} not in xref")
+
+
+class _ClassicXref:
+    """
+    A classic ``xref`` section; entries are only read for the objects looked up.
+    """
+
+    def __init__(self, pdf: _PdfFile, subsections: list[tuple[int, int, int]]) -> None:
+        self.pdf = pdf
+        self.subsections = subsections
+
+    def get(self, number: int) -> tuple[str, int] | None:
+        for first, count, entries_offset in self.subsections:
+            if first <= number < first + count:
+                entry = _XREF_ENTRY_RE.match(
+                    self.pdf.read_at(entries_offset + (number - first) * 20, 18)
+                )
+                if entry is None:
+                    raise PdfStructureUndecided("malformed xref entry")
+                if entry.group(3) == b"f":
+                    return "free", 0
+                return "offset", int(entry.group(1))
+        return None
+
+
+def _read_classic_xref(pdf: _PdfFile, offset: int) -> dict[str, Any]:
+    pos = offset + 4
+    subsections = []
+
+    while True:
+        data = pdf.read_at(pos, 64)
+        skip = _skip_whitespace(data, 0)
+        if data.startswith(b"trailer", skip):
+            pos += skip + len(b"trailer")
+            break
+
+        header = _SUBSECTION_RE.match(data)
+        if header is None:
+            raise PdfStructureUndecided("malformed xref subsection")
+
+        first, count = int(header.group(1)), int(header.group(2))
+        subsections.append((first, count, pos + header.end()))
+        pos += header.end() + count * 20
+
+    pdf.sections.append(_ClassicXref(pdf, subsections))
+    trailer, _data, _end = pdf.parse_at(pos)
+    if not isinstance(trailer, dict):
+        raise PdfStructureUndecided("trailer is not a dictionary")
+    return trailer
+
+
+def _read_xref_stream(pdf: _PdfFile, offset: int) -> dict[str, Any]:
+    info, data, end = pdf.indirect_object(offset)
+    if not isinstance(info, dict) or info.get("/Type") != "/XRef":
+        raise PdfStructureUndecided("startxref does not point to an xref")
+
+    length = info.get("/Length")
+    stream = _STREAM_RE.match(pdf.read_at(end, 16))
+    if not isinstance(length, int) or stream is None:
+        raise PdfStructureUndecided("unsupported xref stream length")
+
+    raw = pdf.read_at(end + stream.end(), length)
+    filters = info.get("/Filter")
+    if filters in ("/FlateDecode", ["/FlateDecode"]):
+        decompressor = zlib.decompressobj()
+        try:
+            # A limit of 0 would mean no limit at all.
+            raw = decompressor.decompress(raw, max(pdf.remaining, 1))
+        except zlib.error as exc:
+            raise PdfStructureUndecided("corrupt xref stream") from exc
+        if decompressor.unconsumed_tail:
+            raise PdfStructureUndecided("xref stream exceeds the read budget")
+        pdf.remaining -= len(raw)
+    elif filters is not None:
+        raise PdfStructureUndecided(f"unsupported xref stream filter {filters}")
+
+    params = info.get("/DecodeParms") or {}
+    if isinstance(params, list) and len(params) == 1:
+        params = params[0] or {}
+    if not isinstance(params, dict):
+        raise PdfStructureUndecided("bad /DecodeParms in xref stream")
+
+    widths = info.get("/W")
+    if not isinstance(widths, list) or len(widths) != 3:
+        raise PdfStructureUndecided("bad /W in xref stream")
+    widths = [_non_negative_int(width, "/W") for width in widths]
+    row_size = sum(widths)
+    if not row_size:
+        raise PdfStructureUndecided("bad /W in xref stream")
+
+    predictor = _non_negative_int(params.get("/Predictor", 1), "/Predictor")
+    if predictor >= 10:
+        columns = _non_negative_int(params.get("/Columns", 1), "/Columns")
+        if not columns:
+            raise PdfStructureUndecided("bad /Columns in xref stream")
+        raw = _png_unpredict(raw, columns)
+    elif predictor != 1:
+        raise PdfStructureUndecided(f"unsupported predictor {predictor}")
+
+    index = info.get("/Index", [0, _non_negative_int(info.get("/Size", 0), "/Size")])
+    if not isinstance(index, list) or len(index) % 2:
+        raise PdfStructureUndecided("bad /Index in xref stream")
+    index = [_non_negative_int(value, "/Index") for value in index]
+    entries: dict[int, tuple[str, int]] = {}
+    pos = 0
+
+    for first, count in zip(index[::2], index[1::2]):
+        for number in range(first, first + count):
+            row = raw[pos : pos + row_size]
+            pos += row_size
+            if len(row) < row_size:
+                raise PdfStructureUndecided("xref stream shorter than /Index")
+
+            fields = []
+            start = 0
+            for width in widths:
+                fields.append(int.from_bytes(row[start : start + width], "big"))
+                start += width
+
+            kind = fields[0] if widths[0] else 1
+            entries[number] = (
+                {0: "free", 1: "offset", 2: "compressed"}.get(kind, "free"),
+                fields[1],
+            )
+
+    pdf.sections.append(entries)
+    return info
+
+
+def _inspect(pdf: _PdfFile, size: int) -> PdfStructure:
+    tail_offset = max(size - TAIL_SIZE, 0)
+    tail = pdf.read_at(tail_offset, TAIL_SIZE)
+    matches = list(_STARTXREF_RE.finditer(tail))
+    # Readers accept trailing data after %%EOF and look further back for it.
+    if not matches:
+        raise PdfStructureUndecided("startxref or %%EOF not in the tail")
+
+    startxref = int(matches[-1].group(1))
+    if startxref >= size:
+        raise PdfStructureUndecided("startxref points outside the file")
+
+    offset: int | None = startxref
+
+    trailer: dict[str, Any] | None = None
+    seen: set[int] = set()
+
+    while offset is not None:
+        if offset in seen or len(seen) >= MAX_XREF_SECTIONS:
+            raise PdfStructureUndecided("too many xref sections")
+        seen.add(offset)
+
+        start = offset + _skip_whitespace(pdf.read_at(offset, 32), 0)
+        if pdf.read_at(start, 4) == b"xref":
+            section = _read_classic_xref(pdf, start)
+            if "/XRefStm" in section:
+                raise PdfStructureUndecided("hybrid xref")
+        else:
+            section = _read_xref_stream(pdf, start)
+
+        trailer = trailer or section
+        prev = section.get("/Prev")
+        offset = prev if isinstance(prev, int) else None
+
+    assert trailer is not None
+
+    if "/Encrypt" in trailer:
+        return PdfStructure(page_count=0, is_encrypted=True)
+
+    root_ref = trailer.get("/Root")
+    if not isinstance(root_ref, _Ref):
+        raise PdfStructureUndecided("trailer has no /Root reference")
+
+    root = pdf.resolve(root_ref)
+    pages_ref = root.get("/Pages") if isinstance(root, dict) else None
+    if not isinstance(pages_ref, _Ref):
+        raise PdfStructureUndecided("catalog has no /Pages reference")
+
+    pages = pdf.resolve(pages_ref)
+    count = pages.get("/Count") if isinstance(pages, dict) else None
+    if not isinstance(count, int) or isinstance(count, bool) or count < 0:
+        raise PdfStructureUndecided("page tree has no direct /Count")
+
+    return PdfStructure(page_count=count, is_encrypted=False)
+
+
+def inspect_pdf_structure(
+    file: IO[bytes],
+    size: int,
+    *,
+    max_bytes: int = MAX_READ_BYTES,
+    max_seconds: float = MAX_SECONDS,
+) -> PdfStructure:
+    """
+    Reads the trailer, the cross-reference sections and the root page tree node of a
+    PDF without parsing the rest of the document.
+
+    Raises ``PdfStructureUndecided`` for anything the fast path does not handle (no
+    ``startxref``/``%%EOF`` in the last ``TAIL_SIZE`` bytes, object streams,
+    incremental updates beyond ``MAX_XREF_SECTIONS``, indirect counts, exceeded
+    budgets, malformed values), in which case the caller should do a full parse. The
+    fast path never rejects a file on its own.
+    """
+    pdf = _PdfFile(file, size, max_bytes, max_seconds)
+
+    try:
+        return _inspect(pdf, size)
+    except PdfStructureUndecided:
+        raise
+    except Exception as exc:
+        # Input malformed in a way the checks above do not cover; pypdf decides.
+        raise PdfStructureUndecided(f"{type(exc).__name__}: {exc}") from exc
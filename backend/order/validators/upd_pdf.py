@@ -3,19 +3,48 @@ from pypdf import PdfReader
 from pypdf.errors import PdfReadError
 from rest_framework import serializers
 
-from core.api.exceptions import AntivirusUnavailableError
-from core.security.clamav import (
-    ClamAVUnavailableError,
-    MalwareDetectedError,
-    scan_file_for_malware,
+from core.models import FileScanVerdict
+from core.security.scan_cache import file_sha256, is_known_valid
+from order.validators.pdf_structure import (
+    PdfStructure,
+    PdfStructureUndecided,
+    inspect_pdf_structure,
 )
 
 MAX_UPD_PDF_SIZE = 10 * 1024 * 1024
 
 
+def _inspect_with_pypdf(file: UploadedFile) -> PdfStructure:
+    file.seek(0)
+
+    try:
+        reader = PdfReader(file, strict=True)
+
+        if reader.is_encrypted:
+            return PdfStructure(page_count=0, is_encrypted=True)
+
+        return PdfStructure(page_count=len(reader.pages), is_encrypted=False)
+    except (
+        PdfReadError,
+        EOFError,
+        ValueError,
+        TypeError,
+    ) as exc:
+        raise serializers.ValidationError("Некорректный или повреждённый PDF.") from exc
+
+
 def validate_upd_pdf(
     file: UploadedFile | None,
 ) -> UploadedFile | None:
+    """
+    Checks the size and structure of an uploaded УПД. The antivirus scan runs in the
+    background after the order is saved (see ``order.services.upd_scan``).
+
+    The structure is read from the trailer, cross-reference table and page tree
+    root only; the full ``PdfReader`` parse is a fallback for files the fast path
+    cannot decide. Files identical to an УПД that was already accepted skip the
+    PDF parsing altogether.
+    """
     if file is None:
         return None
 
@@ -25,45 +54,28 @@ def validate_upd_pdf(
     if file.size > MAX_UPD_PDF_SIZE:
         raise serializers.ValidationError("Размер PDF не должен превышать 10 МБ.")
 
+    if is_known_valid(FileScanVerdict.Kind.UPD_PDF, file_sha256(file)):
+        return file
+
     try:
         file.seek(0)
 
         if file.read(5) != b"%PDF-":
             raise serializers.ValidationError("Файл не является PDF.")
 
-        file.seek(0)
-
         try:
-            reader = PdfReader(file, strict=True)
-        except (
-            PdfReadError,
-            EOFError,
-            ValueError,
-            TypeError,
-        ) as exc:
-            raise serializers.ValidationError(
-                "Некорректный или повреждённый PDF."
-            ) from exc
+            structure = inspect_pdf_structure(file, file.size)
+        except PdfStructureUndecided:
+            structure = _inspect_with_pypdf(file)
 
-        if reader.is_encrypted:
+        if structure.is_encrypted:
             raise serializers.ValidationError(
                 "Зашифрованные PDF-файлы не поддерживаются."
             )
 
-        if len(reader.pages) == 0:
+        if structure.page_count == 0:
             raise serializers.ValidationError("PDF не содержит страниц.")
 
-        try:
-            scan_file_for_malware(file)
-
-        except MalwareDetectedError as exc:
-            raise serializers.ValidationError(
-                "Файл не прошёл антивирусную проверку."
-            ) from exc
-
-        except ClamAVUnavailableError as exc:
-            raise AntivirusUnavailableError() from exc
-
     finally:
         file.seek(0)
 
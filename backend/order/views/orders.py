@@ -1,8 +1,8 @@
-from pathlib import Path
 from typing import Any
 
-from django.db.models import Q, QuerySet
-from django.http import FileResponse
+from asgiref.sync import sync_to_async
+from django.db.models import Prefetch, Q, QuerySet
+from django.http.response import HttpResponseBase
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter
 from rest_framework import generics, status
@@ -12,15 +12,20 @@ from rest_framework.request import Request
 from rest_framework.response import Response
 
 from catalog.models import Product
+from core.api.exceptions import FileNotScannedError
+from core.api.mixins import AsyncAPIViewMixin, ScanningUploadMixin
 from core.openapi import ERRORS_DETAIL, ERRORS_DETAIL_WRITE
 from core.openapi.base_views import (
     BaseGenericAPIView,
     BaseListAPIView,
     BaseListCreateAPIView,
     BaseRetrieveUpdateDestroyAPIView,
+    QueryBudget,
 )
+from core.services.file_responses import serve_file
+from core.services.metrics import observe_export
 from order.api.permissions import OrderExportPermission, OrderFormAccessPermission
-from order.models import Client, Customer, Order, PackType
+from order.models import Client, Customer, Order, OrderItem, PackType
 from order.serializers.order_serializers.create_order_serializers import (
     OrderReadSerializer,
     OrderResourcesSerializer,
@@ -28,6 +33,8 @@ from order.serializers.order_serializers.create_order_serializers import (
     OrderWriteSerializer,
 )
 from order.serializers.order_serializers.order_upd import OrderUpdSerializer
+from order.services.upd_text import filter_orders_by_upd
+from order.validators.upd_pdf import MAX_UPD_PDF_SIZE
 from stock.models import Warehouse
 
 
@@ -83,7 +90,7 @@ class OrderResourcesAPIView(BaseGenericAPIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class OrderListCreateAPIView(BaseListCreateAPIView):
+class OrderListCreateAPIView(ScanningUploadMixin, BaseListCreateAPIView):
     """
     Handles the creation and retrieval of Order instances.
     Provides a way to create new orders and retrieve a list of existing orders based on
@@ -112,6 +119,8 @@ class OrderListCreateAPIView(BaseListCreateAPIView):
     write_serializer_class = OrderWriteSerializer
     errors_read = ERRORS_DETAIL
     errors_write = ERRORS_DETAIL_WRITE
+    upload_max_size = MAX_UPD_PDF_SIZE
+    query_budget = QueryBudget(max_queries=8)
     query_parameters = [
         OpenApiParameter("date_from", OpenApiTypes.DATE, OpenApiParameter.QUERY),
         OpenApiParameter("date_to", OpenApiTypes.DATE, OpenApiParameter.QUERY),
@@ -121,14 +130,30 @@ class OrderListCreateAPIView(BaseListCreateAPIView):
         OpenApiParameter("no_upd", OpenApiTypes.BOOL, OpenApiParameter.QUERY),
         OpenApiParameter("product_id", OpenApiTypes.INT, OpenApiParameter.QUERY),
         OpenApiParameter("samples", OpenApiTypes.BOOL, OpenApiParameter.QUERY),
+        OpenApiParameter(
+            "upd_search",
+            OpenApiTypes.STR,
+            OpenApiParameter.QUERY,
+            description="Номер, дата (ДД.ММ.ГГГГ), ИНН или текст УПД",
+        ),
     ]
 
     def get_queryset(self) -> QuerySet[Order]:
+        order_items = OrderItem.objects.select_related(
+            "product__unit_config__unit",
+            "product__default_pack",
+            "pack_type",
+        )
         queryset = Order.objects.select_related(
             "client",
             "customer",
+            "customer_object",
             "warehouse",
-        ).prefetch_related("order_products")
+            "delivery",
+        ).prefetch_related(
+            Prefetch("order_items", queryset=order_items),
+            "contacts",
+        )
 
         date_from = self.request.query_params.get("date_from")
         date_to = self.request.query_params.get("date_to")
@@ -137,6 +162,7 @@ class OrderListCreateAPIView(BaseListCreateAPIView):
         warehouse_id = self.request.query_params.get("warehouse_id")
         no_upd = self.request.query_params.get("no_upd")
         product_id = self.request.query_params.get("product_id")
+        upd_search = self.request.query_params.get("upd_search")
 
         if date_from:
             queryset = queryset.filter(delivery_date__gte=date_from)
@@ -162,6 +188,9 @@ class OrderListCreateAPIView(BaseListCreateAPIView):
         if product_id:
             queryset = queryset.filter(order_products__id=product_id)
 
+        if upd_search:
+            queryset = filter_orders_by_upd(queryset, upd_search)
+
         return queryset.distinct().order_by(
             "-delivery_date",
             "-created_at",
@@ -173,7 +202,9 @@ class OrderListCreateAPIView(BaseListCreateAPIView):
         return self.read_serializer_class
 
 
-class OrderRetrieveUpdateDestroyAPIView(BaseRetrieveUpdateDestroyAPIView):
+class OrderRetrieveUpdateDestroyAPIView(
+    ScanningUploadMixin, BaseRetrieveUpdateDestroyAPIView
+):
     """
     Handles retrieval, updating, and deletion of Order objects using HTTP methods.
 
@@ -201,6 +232,7 @@ class OrderRetrieveUpdateDestroyAPIView(BaseRetrieveUpdateDestroyAPIView):
     write_serializer_class = OrderWriteSerializer
     errors_read = ERRORS_DETAIL
     errors_write = ERRORS_DETAIL_WRITE
+    upload_max_size = MAX_UPD_PDF_SIZE
 
     queryset = Order.objects.all().prefetch_related("delivery")
 
@@ -284,32 +316,51 @@ class OrdersDownloadAPIView(BaseListAPIView):
 
         return queryset.order_by("-delivery_date", "-created_at")
 
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        with observe_export("orders"):
+            return super().list(request, *args, **kwargs)
+
 
-class OrderUpdUploadAPIView(generics.UpdateAPIView):
+class OrderUpdUploadAPIView(
+    AsyncAPIViewMixin, ScanningUploadMixin, generics.UpdateAPIView
+):
     queryset = Order.objects.all()
     serializer_class = OrderUpdSerializer
+    upload_max_size = MAX_UPD_PDF_SIZE
 
     http_method_names = [
         "patch",
         "options",
     ]
 
+    async def patch(self, request: Request, *args: Any, **kwargs: Any) -> Response:  # type: ignore[override]
+        # Under ASGI the body is already received; parsing it scans the file.
+        return await sync_to_async(self.partial_update)(request, *args, **kwargs)
 
-class OrderUpdViewAPIView(generics.GenericAPIView):
+
+class OrderUpdViewAPIView(AsyncAPIViewMixin, generics.GenericAPIView):
     queryset = Order.objects.all()
     serializer_class = OrderReadSerializer
 
     http_method_names = ["get", "head", "options"]
 
-    def get(self, request: Request, *args: Any, **kwargs: Any) -> FileResponse:
-        order = self.get_object()
+    async def get(
+        self, request: Request, *args: Any, **kwargs: Any
+    ) -> HttpResponseBase:
+        order = await sync_to_async(self.get_object)()
 
         if not order.upd_pdf:
             raise NotFound("УПД не найден.")
 
-        return FileResponse(
-            order.upd_pdf.open("rb"),
+        if order.upd_scan_status == Order.ScanStatus.INFECTED:
+            raise FileNotScannedError("Файл не прошёл антивирусную проверку.")
+
+        if order.upd_scan_status != Order.ScanStatus.CLEAN:
+            raise FileNotScannedError()
+
+        return await sync_to_async(serve_file)(
+            request,
+            order.upd_pdf,
             content_type="application/pdf",
             as_attachment=False,
-            filename=Path(order.upd_pdf.name).name,
         )
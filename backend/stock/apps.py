@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class StockConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "stock"
+
+    def ready(self) -> None:
+        from core.services.image_variants import register_image_variants
+
+        register_image_variants(
+            self.get_model("Warehouse"),
+            image_field="directions",
+            variants_field="directions_variants",
+        )
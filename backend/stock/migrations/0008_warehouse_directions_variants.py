@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 00:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stock', '0007_warehouse_description'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='warehouse',
+            name='directions_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -20,6 +20,8 @@ class Warehouse(ContactDetailsMixin, ActiveMixin):
             be left blank.
         directions (ImageField, optional): An image file representing directions or a map
             to the warehouse location. The image is uploaded to the "maps" directory.
+        directions_variants (dict): Storage names of the resized copies of the directions
+            image, generated in the background.
 
     Meta:
         db_table (str): The name of the database table in which warehouse data is stored.
@@ -27,6 +29,7 @@ class Warehouse(ContactDetailsMixin, ActiveMixin):
 
     name = models.CharField(max_length=255, unique=True)
     directions = models.ImageField(upload_to="maps", null=True, blank=True)
+    directions_variants = models.JSONField(default=dict, blank=True, editable=False)
     description = models.TextField(null=True, blank=True)
 
     class Meta:
@@ -157,6 +157,32 @@ class TestWarehouseUploadMap(BaseAPIMixin):
             {"directions": temp.directions}, self.upload_file_spec
         )
 
+    def test_upload_map_generates_variants(self) -> None:
+        """
+        Test that an uploaded warehouse map gets resized variants after commit.
+        """
+        self._logger_header("TEST: warehouse map variants")
+        temp = self.factory.build()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                self.url, {"directions": temp.directions}, format="multipart"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+        self.obj.refresh_from_db()
+        variants = self.obj.directions_variants
+
+        self.assertEqual(variants["source"], self.obj.directions.name)
+        self.assertTrue(self.obj.directions.storage.exists(variants["screen"]["webp"]))
+
+        print(
+            f"{self.INDENT}{self.COLOR['OK']}"
+            "✓ Warehouse map variants generated"
+            f"{self.COLOR['END']}"
+        )
+
     def test_upload_map_missing_file_400(self) -> None:
         """
         Test that uploading a warehouse map without a file returns a 400 Bad Request.
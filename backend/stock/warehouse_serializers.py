@@ -5,6 +5,7 @@ from rest_framework import serializers, validators
 
 from catalog.models import PurchasePriceHistory
 from catalog.serializers.product_serializers import ProductSerializer
+from core.api.fields import ImageVariantsField
 from core.validators.validators import validate_ru_phone
 from stock.models import Warehouse
 
@@ -30,6 +31,9 @@ class WarehouseListCreateSerializer(serializers.ModelSerializer):
         ],
     )
     directions = serializers.ImageField(required=False, allow_null=True)
+    directionsVariants = ImageVariantsField(
+        source="directions_variants", image_field="directions"
+    )
     phone = PhoneNumberField(
         region="RU",
         label="Номер телефона",
@@ -49,6 +53,7 @@ class WarehouseListCreateSerializer(serializers.ModelSerializer):
             "address",
             "phone",
             "directions",
+            "directionsVariants",
             "description",
             "isActive",
         ]
@@ -63,10 +68,13 @@ class WarehouseListCreateSerializer(serializers.ModelSerializer):
 class WarehouseMapSerializer(serializers.ModelSerializer):
 
     directions = serializers.ImageField(required=True, use_url=True)
+    directionsVariants = ImageVariantsField(
+        source="directions_variants", image_field="directions"
+    )
 
     class Meta:
         model = Warehouse
-        fields = ("directions",)
+        fields = ("directions", "directionsVariants")
 
     def validate(self, attrs: Any) -> Any:
         """
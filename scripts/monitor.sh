@@ -128,6 +128,44 @@ fi
 done
 
 
+# --------------------------------------------------
+# Backend dependencies
+# --------------------------------------------------
+
+# Readiness results are cached by the backend for a few seconds, so this
+# check adds no load on the database or ClamAV.
+READINESS="$(
+    docker compose exec -T backend python -c "
+import json, urllib.request, urllib.error
+req = urllib.request.Request('http://127.0.0.1:8000/api/health/ready/', headers={'X-Forwarded-Proto': 'https'})
+try:
+    body = urllib.request.urlopen(req, timeout=15).read()
+except urllib.error.HTTPError as exc:
+    body = exc.read()
+for name, check in json.loads(body)['checks'].items():
+    print(name, check['status'], check['latency_ms'])
+" 2>/dev/null
+)"
+
+if [ -z "$READINESS" ]; then
+    critical "Backend readiness check is unavailable"
+else
+    while read -r NAME STATUS LATENCY_MS; do
+        case "$STATUS" in
+            ok)
+                ok "Backend dependency '$NAME' is ready (${LATENCY_MS} ms)"
+                ;;
+            disabled)
+                warning "Backend dependency '$NAME' is disabled"
+                ;;
+            *)
+                critical "Backend dependency '$NAME' status=$STATUS (${LATENCY_MS} ms)"
+                ;;
+        esac
+    done <<< "$READINESS"
+fi
+
+
 # --------------------------------------------------
 # Public application
 # --------------------------------------------------